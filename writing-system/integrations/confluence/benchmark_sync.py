@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+동기화 성능 벤치마크
+로컬 모의 서버(mock_confluence_server.py)를 띄우고 sync_confluence.py(v1)와
+oauth_confluence.py(v2)의 동기화를 실행해 처리량과 자원 사용량을 측정합니다.
+실제 Confluence나 인증 정보가 필요 없으며, 같은 옵션이면 같은 데이터로 재현됩니다.
+
+측정 항목 (모드별 cold = 빈 캐시, warm = 일부 페이지만 변경 후 재동기화):
+    pages/sec, 요청 수, 전송 바이트, 429 응답 수, 최대 RSS, 변환(_html_to_text) CPU 시간
+    (각 동기화는 별도 프로세스에서 실행하므로 최대 RSS는 그 동기화 하나의 값이며 모의 서버는 포함하지 않음)
+    페이지 저장소 크기와 페이지 읽기 지연 (--compression으로 압축 방식별 비교)
+
+사용법:
+    python benchmark_sync.py                               # v1 + v2, 200 페이지
+    python benchmark_sync.py --mode v2 --pages 2000 --latency-ms 20
+    python benchmark_sync.py --rate-429 0.05 --json bench.json
+    python benchmark_sync.py --mode v1 --compression none,zlib,lzma,zstd
+"""
+
+import os
+import sys
+import io
+import json
+import time
+import argparse
+import tempfile
+import subprocess
+import contextlib
+from pathlib import Path
+from typing import Optional, List, Dict
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from mock_confluence_server import MockConfluence, CLOUD_ID, SPACE_KEY
+import page_store
+
+# Windows 콘솔 UTF-8 출력 설정
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
+
+MODES = ("v1", "v2")
+
+
+def peak_rss_mb() -> Optional[float]:
+    """현재 프로세스의 최대 RSS (MB, 지원하지 않는 플랫폼은 None)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux는 KB, macOS는 바이트 단위
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+class ConversionTimer:
+    """클래스의 _html_to_text를 감싸 변환에 쓴 CPU 시간 누적 (현재 스레드 기준)"""
+
+    def __init__(self, cls):
+        self.cls = cls
+        self.original = cls._html_to_text
+        self.cpu_seconds = 0.0
+        self.calls = 0
+
+    def __enter__(self):
+        timer = self
+        original = self.original
+
+        def timed(instance, html):
+            start = time.thread_time()
+            try:
+                return original(instance, html)
+            finally:
+                timer.cpu_seconds += time.thread_time() - start
+                timer.calls += 1
+
+        self.cls._html_to_text = timed
+        return self
+
+    def __exit__(self, *exc):
+        self.cls._html_to_text = self.original
+
+
+def _prepare_v1(base_url: str, cache_dir: Path):
+    import sync_confluence
+
+    os.environ.setdefault('CONFLUENCE_EMAIL', 'bench@example.com')
+    os.environ.setdefault('CONFLUENCE_API_TOKEN', 'bench-token')
+    sync_confluence.CACHE_DIR = cache_dir
+    sync_confluence.INDEX_FILE = cache_dir / "page_index.json"
+
+    client = sync_confluence.ConfluenceSync()
+    client.base_url = base_url
+    client.space_key = SPACE_KEY
+    return sync_confluence.ConfluenceSync, lambda: client.sync_all_pages()
+
+
+def _prepare_v2(base_url: str, cache_dir: Path):
+    import oauth_confluence
+
+    os.environ.setdefault('CONFLUENCE_CLIENT_ID', 'bench-client')
+    os.environ.setdefault('CONFLUENCE_CLIENT_SECRET', 'bench-secret')
+    work_dir = cache_dir.parent
+    oauth_confluence.CACHE_DIR = cache_dir
+    oauth_confluence.INDEX_FILE = cache_dir / "page_index.json"
+    oauth_confluence.API_URL = base_url
+    oauth_confluence.CONFIG_PATH = work_dir / "oauth_config.json"
+    oauth_confluence.TOKEN_PATH = work_dir / "oauth_token.json"
+    with open(oauth_confluence.CONFIG_PATH, 'w') as f:
+        json.dump({"cloud_id": CLOUD_ID, "site_url": base_url}, f)
+    with open(oauth_confluence.TOKEN_PATH, 'w') as f:
+        json.dump({"access_token": "bench-token", "refresh_token": "bench-refresh"}, f)
+
+    client = oauth_confluence.ConfluenceOAuth()
+    return oauth_confluence.ConfluenceOAuth, lambda: client.sync_pages(SPACE_KEY)
+
+
+def run_sync(mode: str, base_url: str, cache_dir: Path) -> dict:
+    """
+    동기화 한 번을 현재 프로세스에서 실행 (--sync-child 자식 프로세스용)
+    RUSAGE_SELF는 프로세스 전체 누적 최대값이므로 동기화마다 새 프로세스에서 호출해야 합니다.
+    """
+    prepare = _prepare_v1 if mode == "v1" else _prepare_v2
+    cls, run = prepare(base_url, cache_dir)
+    error = None
+    with ConversionTimer(cls) as timer, contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        try:
+            run()
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        elapsed = time.perf_counter() - start
+    return {
+        "seconds": round(elapsed, 3),
+        "pages_converted": timer.calls,
+        "convert_cpu_seconds": round(timer.cpu_seconds, 3),
+        "peak_rss_mb": peak_rss_mb(),
+        "error": error,
+    }
+
+
+def _measure(mock: MockConfluence, mode: str, base_url: str, cache_dir: Path) -> dict:
+    """동기화 한 번을 별도 프로세스에서 실행하고 모의 서버 통계와 합침"""
+    mock.reset_stats()
+    command = [sys.executable, str(Path(__file__).resolve()), "--sync-child", mode,
+               "--base-url", base_url, "--cache-dir", str(cache_dir)]
+    completed = subprocess.run(command, capture_output=True, text=True, encoding='utf-8',
+                               cwd=Path(__file__).parent)
+    if completed.returncode != 0:
+        child = {"seconds": 0.0, "pages_converted": 0, "convert_cpu_seconds": 0.0, "peak_rss_mb": None,
+                 "error": completed.stderr.strip()[-500:]}
+    else:
+        child = json.loads(completed.stdout.strip().splitlines()[-1])
+
+    server = mock.stats()
+    elapsed = child['seconds']
+    return {
+        "seconds": elapsed,
+        "pages_converted": child['pages_converted'],
+        "pages_per_sec": round(len(mock.pages) / elapsed, 1) if elapsed > 0 else None,
+        "requests": server['requests'],
+        "requests_by_endpoint": server['requests_by_endpoint'],
+        "bytes_transferred": server['bytes_sent'],
+        "throttled_429": server['throttled'],
+        "convert_cpu_seconds": child['convert_cpu_seconds'],
+        "peak_rss_mb": child['peak_rss_mb'],
+        "error": child['error'],
+    }
+
+
+def measure_store(cache_dir: Path) -> dict:
+    """동기화된 페이지 저장소의 디스크 크기와 페이지당 읽기(압축 해제 포함) 지연"""
+    with open(cache_dir / "page_index.json", 'r', encoding='utf-8') as f:
+        index = json.load(f)
+    store = page_store.PageStore(cache_dir)
+
+    timings = []
+    text_bytes = 0
+    for page in index['pages']:
+        start = time.perf_counter()
+        text = store.read(page['filename'])
+        timings.append(time.perf_counter() - start)
+        text_bytes += len(text.encode('utf-8')) if text else 0
+    timings.sort()
+
+    disk_bytes = store.size(index)
+    return {
+        "disk_bytes": disk_bytes,
+        "text_bytes": text_bytes,
+        "ratio": round(text_bytes / disk_bytes, 2) if disk_bytes else None,
+        "read_p50_us": round(timings[len(timings) // 2] * 1e6, 1) if timings else 0.0,
+        "read_p95_us": round(timings[int(0.95 * (len(timings) - 1))] * 1e6, 1) if timings else 0.0,
+    }
+
+
+def run_single(mode: str, compression: str, args) -> dict:
+    """한 모드/압축 방식 실행 (cold → 일부 변경 → warm, 각 동기화는 별도 프로세스)"""
+    # 자식 프로세스가 환경 변수로 압축 방식을 이어받음
+    os.environ[page_store.ENV_COMPRESSION] = compression
+    mock = MockConfluence(args.pages, args.body_kb, args.latency_ms, args.rate_429, args.seed)
+    base_url = mock.start()
+    try:
+        with tempfile.TemporaryDirectory(prefix=f"bench_{mode}_") as tmp:
+            cache_dir = Path(tmp) / "cache"
+            cache_dir.mkdir()
+
+            cold = _measure(mock, mode, base_url, cache_dir)
+            mock.touch(max(1, int(len(mock.pages) * args.touch_ratio)))
+            warm = _measure(mock, mode, base_url, cache_dir)
+            store = measure_store(cache_dir)
+    except Exception as e:
+        return {"mode": mode, "compression": compression, "error": f"{type(e).__name__}: {e}"}
+    finally:
+        mock.stop()
+
+    return {"mode": mode, "compression": page_store.resolve_compression(compression),
+            "cold": cold, "warm": warm, "store": store}
+
+
+def print_report(results: List[Dict], args):
+    print("\n" + "=" * 78)
+    print(f"Sync benchmark: {args.pages} pages x {args.body_kb} KB, "
+          f"latency {args.latency_ms} ms, 429 rate {args.rate_429}")
+    print("=" * 78)
+    print(f"{'mode':6} {'run':5} {'sec':>8} {'pages/s':>9} {'requests':>9} {'MB sent':>8} "
+          f"{'429':>5} {'conv CPU':>9} {'RSS MB':>7}")
+
+    for result in results:
+        if 'error' in result:
+            print(f"{result['mode']:6} [ERROR] ({result['compression']}) {result['error']}")
+            continue
+        for run_name in ("cold", "warm"):
+            r = result[run_name]
+            rss = f"{r['peak_rss_mb']:.1f}" if r['peak_rss_mb'] is not None else "-"
+            print(f"{result['mode']:6} {run_name:5} {r['seconds']:8.2f} {r['pages_per_sec'] or 0:9.1f} "
+                  f"{r['requests']:9d} {r['bytes_transferred'] / 1e6:8.2f} {r['throttled_429']:5d} "
+                  f"{r['convert_cpu_seconds']:9.3f} {rss:>7}  {result['compression']}")
+            if r['error']:
+                print(f"       └─ [ERROR] {r['error']}")
+
+    print(f"\n{'mode':6} {'store':6} {'disk MB':>8} {'text MB':>8} {'ratio':>6} {'read p50 us':>12} "
+          f"{'read p95 us':>12} {'cold sec':>9} {'warm sec':>9}")
+    for result in results:
+        if 'error' in result:
+            continue
+        st = result['store']
+        print(f"{result['mode']:6} {result['compression']:6} {st['disk_bytes'] / 1e6:8.2f} "
+              f"{st['text_bytes'] / 1e6:8.2f} {st['ratio'] or 0:6.2f} {st['read_p50_us']:12.1f} "
+              f"{st['read_p95_us']:12.1f} {result['cold']['seconds']:9.2f} {result['warm']['seconds']:9.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Confluence 동기화 벤치마크 (로컬 모의 서버)')
+    parser.add_argument('--mode', choices=MODES + ("both",), default="both", help='측정 대상 (기본: both)')
+    parser.add_argument('--pages', type=int, default=200, help='페이지 수 (기본: 200)')
+    parser.add_argument('--body-kb', type=float, default=8, help='페이지 본문 크기 KB (기본: 8)')
+    parser.add_argument('--latency-ms', type=float, default=0, help='요청당 지연 ms (기본: 0)')
+    parser.add_argument('--rate-429', type=float, default=0.0, help='429 응답 비율 0~1 (기본: 0)')
+    parser.add_argument('--touch-ratio', type=float, default=0.05, help='warm 실행 전 변경할 페이지 비율 (기본: 0.05)')
+    parser.add_argument('--seed', type=int, default=0, help='난수 시드 (기본: 0)')
+    parser.add_argument('--compression', type=str, default="none",
+                        help='비교할 페이지 저장소 압축 방식, 쉼표로 구분 (none,zlib,lzma,zstd / 기본: none)')
+    parser.add_argument('--json', type=str, help='결과를 JSON 파일로 저장')
+    parser.add_argument('--sync-child', choices=MODES, help=argparse.SUPPRESS)
+    parser.add_argument('--base-url', type=str, help=argparse.SUPPRESS)
+    parser.add_argument('--cache-dir', type=str, help=argparse.SUPPRESS)
+
+    args = parser.parse_args()
+
+    if args.sync_child:
+        print(json.dumps(run_sync(args.sync_child, args.base_url, Path(args.cache_dir)), ensure_ascii=False))
+        return
+
+    modes = MODES if args.mode == "both" else (args.mode,)
+    compressions = [name.strip() for name in args.compression.split(",") if name.strip()]
+    results = [run_single(mode, compression, args) for mode in modes for compression in compressions]
+    print_report(results, args)
+
+    if args.json:
+        report = {"params": {k: v for k, v in vars(args).items()
+                             if k not in ("json", "sync_child", "base_url", "cache_dir")},
+                  "results": results}
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n[OK] Saved: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
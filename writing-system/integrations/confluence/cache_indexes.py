@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+동기화 후 캐시 인덱스 갱신
+sync_confluence.py / oauth_confluence.py가 page_index.json을 저장하기 직전에 호출합니다.
+각 인덱스는 이번 동기화에서 변경된 페이지만 다시 계산합니다.
+"""
+
+import json
+from pathlib import Path
+from typing import Dict, List, Tuple, Optional
+
+import semantic_index
+import dedup
+import facets
+import title_index
+import link_graph
+
+INDEX_FILENAME = "page_index.json"
+
+
+def _previous_catalog(cache_dir: Path) -> Tuple[int, Optional[list]]:
+    """저장된 카탈로그의 (generation, pages) - 없거나 읽을 수 없으면 (0, None)"""
+    index_file = Path(cache_dir) / INDEX_FILENAME
+    if not index_file.exists():
+        return 0, None
+    try:
+        with open(index_file, 'r', encoding='utf-8') as f:
+            previous = json.load(f)
+        return int(previous.get('generation', 0)), previous.get('pages')
+    except (OSError, ValueError):
+        return 0, None
+
+
+def update_cache_indexes(cache_dir: Path, index: dict, changed_texts: Dict[str, str],
+                         changed_links: Optional[Dict[str, List[str]]] = None) -> List[Tuple[str, object]]:
+    """
+    모든 캐시 인덱스 갱신
+    changed_texts: 이번에 변환된 페이지의 제목 + 본문 텍스트
+    changed_links: 이번에 변환된 페이지의 링크 대상 (link_graph.extract_page_links 결과)
+    index['pages'] 항목에 canonical_id 등 인덱스 결과가 기록되므로
+    반드시 page_index.json 저장 전에 호출해야 합니다.
+    index['generation']은 저장된 카탈로그와 페이지 내용/메타데이터가 다를 때만 1 증가합니다
+    (local_search.py 검색 결과 캐시 키).
+    반환: [(인덱스 이름, 통계 dict 또는 예외)] (numpy가 없거나 비활성화된 인덱스는 제외,
+          패싯/제목 인덱스는 numpy 없이도 항상 생성)
+    """
+    generation, previous_pages = _previous_catalog(cache_dir)
+    pages = index['pages']
+    builders = [
+        ("facets", lambda: facets.FacetIndex(cache_dir).build(pages)),
+        ("titles", lambda: title_index.TitleIndex(cache_dir).build(pages)),
+    ]
+    if semantic_index.is_available():
+        builders += [
+            ("semantic", lambda: semantic_index.update_semantic_index(cache_dir, pages, changed_texts)),
+            ("dedup", lambda: dedup.DuplicateIndex(cache_dir).update(pages, changed_texts)),
+            ("links", lambda: link_graph.LinkGraph(cache_dir).update(pages, changed_links, index.get('space_key'))),
+        ]
+
+    results = []
+    for name, build in builders:
+        try:
+            stats = build()
+        except Exception as e:
+            stats = e
+        if stats is not None:
+            results.append((name, stats))
+
+    # 인덱스 결과(canonical_id 등)까지 반영된 뒤 비교
+    unchanged = generation > 0 and not changed_texts and previous_pages == pages
+    index['generation'] = generation if unchanged else generation + 1
+    return results
+
+
+def format_stats(name: str, stats: dict) -> str:
+    """인덱스 통계 한 줄 요약"""
+    if name == "semantic":
+        return f"semantic ({stats['mode']}): {stats['documents']} docs, {stats['updated']} re-indexed"
+    if name == "dedup":
+        return f"dedup: {stats['clusters']} clusters, {stats['duplicates']} duplicates, {stats['updated']} re-hashed"
+    if name == "facets":
+        return (f"facets: {stats['documents']} docs, {stats['label']} labels, {stats['author']} authors, "
+                f"{stats['ancestor']} ancestors")
+    if name == "titles":
+        return f"titles: {stats['titles']} titles, {stats['keys']} prefix keys"
+    if name == "links":
+        summary = f"links: {stats['edges']} edges over {stats['nodes']} pages, pagerank {stats['iterations']} iterations"
+        if stats.get('recovered'):
+            summary += f", {stats['recovered']} pages re-extracted"
+        return summary
+    return f"{name}: {stats}"
@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+캐시 무결성 검사 / 부분 복구 (--verify)
+page_index.json과 페이지 파일을 대조해 문제가 있는 페이지만 찾아 고칩니다 (전체 재동기화 불필요).
+
+검사 (스레드 병렬):
+    missing    카탈로그에 있지만 파일이 없음
+    hash       저장 시 기록한 sha1과 파일 내용이 다름 (잘린 쓰기, 외부 수정)
+    corrupt    압축을 풀 수 없음 (sha1이 없는 이전 캐시)
+    truncated  헤더/본문 구분선이 없거나 끝이 잘림 (sha1이 없는 이전 캐시, 통과하면 sha1 기록)
+    orphan     카탈로그에 없는 페이지 파일 (제목 변경 후 남은 파일, 중단된 쓰기의 .tmp) → 삭제
+
+복구:
+    보관된 원본(raw/)이 있으면 네트워크 없이 재변환하고, 원본도 없거나 손상된 페이지만 API로 다시 받습니다.
+    삭제된 페이지(404)는 카탈로그에서 빼고, 복구하지 못한 페이지는 파일을 지워 다음 --sync에서 다시 받습니다.
+
+재변환/검사 실행 (rebuild_cache / verify_cache):
+    sync_confluence.py와 oauth_confluence.py가 같은 흐름을 쓰고, 각 CLI는 변환기(html_to_text,
+    render_markdown)와 출력 문구(messages)만 넘깁니다.
+
+사용법:
+    python sync_confluence.py --verify
+    python oauth_confluence.py --verify
+"""
+
+import os
+import json
+import time
+import hashlib
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional, List, Callable, Tuple, Dict
+
+import cache_indexes
+import link_graph
+import page_history
+import page_store
+import raw_store
+import table_store
+
+PAGE_SUFFIXES = tuple(".md" + suffix for suffix in page_store.SUFFIXES.values())
+
+PROBLEMS = {
+    "missing": "파일 없음",
+    "unreadable": "파일을 읽을 수 없음",
+    "hash": "내용 해시 불일치",
+    "corrupt": "압축 해제 실패",
+    "truncated": "내용이 잘림",
+}
+
+
+def _is_page_file(name: str) -> bool:
+    if name.endswith(".tmp"):
+        name = name[:-len(".tmp")]
+    return name.endswith(PAGE_SUFFIXES)
+
+
+def _looks_complete(text: str) -> bool:
+    """sha1이 없는 항목용: 렌더링 형식(제목 헤더, 구분선, 마지막 줄바꿈)이 온전한지"""
+    return text.startswith("# ") and "\n---\n" in text and text.endswith("\n")
+
+
+def _check_entry(store: page_store.PageStore, entry: dict) -> Tuple[str, Optional[str], Optional[str]]:
+    """(page_id, 문제 종류 또는 None, 새로 기록할 sha1 또는 None)"""
+    page_id = entry['id']
+    try:
+        data = (store.cache_dir / entry['filename']).read_bytes()
+    except FileNotFoundError:
+        return page_id, "missing", None
+    except OSError:
+        return page_id, "unreadable", None
+
+    digest = hashlib.sha1(data).hexdigest()
+    if entry.get('sha1'):
+        return page_id, None if digest == entry['sha1'] else "hash", None
+
+    try:
+        text = store.decode(data, page_store.codec_of(entry['filename']))
+    except Exception:
+        return page_id, "corrupt", None
+    if not _looks_complete(text):
+        return page_id, "truncated", None
+    return page_id, None, digest
+
+
+def find_orphans(cache_dir: Path, index: dict) -> List[str]:
+    """카탈로그가 참조하지 않는 페이지 파일 이름 (.tmp 포함)"""
+    referenced = {page['filename'] for page in index['pages']}
+    with os.scandir(cache_dir) as entries:
+        return sorted(entry.name for entry in entries
+                      if entry.is_file() and _is_page_file(entry.name) and entry.name not in referenced)
+
+
+def check_cache(cache_dir: Path, index: dict, workers: Optional[int] = None) -> dict:
+    """
+    카탈로그/페이지 파일 일관성 검사
+    중복 항목(같은 ID)은 index['pages']에서 첫 항목만 남기고, sha1이 없던 정상 페이지는 항목에 sha1을 기록합니다.
+    시간 예산으로 미룬 새 페이지(deferred 항목)는 아직 파일이 없는 것이 정상이므로 검사하지 않습니다.
+    반환: {"pages", "ok", "broken": {page_id: 문제 종류}, "hashed", "duplicates", "orphans", "seconds"}
+    """
+    start = time.perf_counter()
+    cache_dir = Path(cache_dir)
+    seen = set()
+    pages = []
+    for page in index['pages']:
+        if page['id'] not in seen:
+            seen.add(page['id'])
+            pages.append(page)
+    duplicates = len(index['pages']) - len(pages)
+    index['pages'] = pages
+
+    store = page_store.PageStore(cache_dir)
+    broken = {}
+    hashed = 0
+    by_id = {page['id']: page for page in pages}
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        checked = [page for page in pages if not page.get('deferred')]
+        for page_id, problem, digest in pool.map(lambda page: _check_entry(store, page), checked):
+            if problem:
+                broken[page_id] = problem
+            elif digest:
+                by_id[page_id]['sha1'] = digest
+                hashed += 1
+
+    return {
+        "pages": len(checked),
+        "ok": len(checked) - len(broken),
+        "broken": broken,
+        "hashed": hashed,
+        "duplicates": duplicates,
+        "orphans": find_orphans(cache_dir, index),
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def remove_orphans(cache_dir: Path, names: List[str]) -> int:
+    """find_orphans 결과 파일 삭제, 삭제 수 반환"""
+    for name in names:
+        (Path(cache_dir) / name).unlink(missing_ok=True)
+    return len(names)
+
+
+def repair_pages(cache_dir: Path, index: dict, page_ids: List[str], worker: Callable,
+                 fetch: Optional[Callable[[dict], Optional[Tuple[str, dict]]]] = None) -> dict:
+    """
+    손상/누락 페이지만 다시 생성
+    worker: raw_store.rebuild_pages와 같은 재변환 함수 ((cache_dir 문자열, space_key, 항목) → 결과 튜플)
+    fetch:  항목 → (body.storage HTML, 항목에 반영할 필드) 또는 None(삭제된 페이지)
+            원본(raw/)이 없거나 재변환에 실패한 페이지에만 호출합니다.
+    Jira 이슈 등 다른 출처 항목은 건너뜁니다 (jira_sync.py --sync --full).
+    반환: {"rebuilt", "fetched", "deleted", "skipped", "failed": {page_id: 오류}, "texts", "links"}
+    """
+    raw = raw_store.RawStore(cache_dir)
+    space_key = index.get('space_key', '')
+    by_id = {page['id']: page for page in index['pages']}
+    rebuilt, fetched, deleted, skipped = [], [], [], []
+    failed, texts, links = {}, {}, {}
+
+    for page_id in page_ids:
+        entry = by_id[page_id]
+        if entry.get('source', 'confluence') != 'confluence':
+            skipped.append(page_id)
+            continue
+
+        result = worker((str(cache_dir), space_key, entry)) if raw.exists(page_id) else None
+        from_raw = result is not None and result[1] is not None
+        if not from_raw:
+            if fetch is None:
+                failed[page_id] = result[2] if result else "no stored body"
+                continue
+            try:
+                response = fetch(entry)
+            except Exception as e:
+                failed[page_id] = str(e)
+                continue
+            if response is None:
+                deleted.append(page_id)
+                continue
+            body, fields = response
+            entry.update(fields)
+            raw.save(page_id, body)
+            result = worker((str(cache_dir), space_key, entry))
+
+        _, text, result_links, fields = result
+        if text is None:
+            failed[page_id] = result_links
+            continue
+        raw_store.apply_fields({"pages": [entry]}, {page_id: fields})
+        texts[page_id] = text
+        links[page_id] = result_links
+        (rebuilt if from_raw else fetched).append(page_id)
+
+    # 복구하지 못한 손상 파일은 지워 두면 다음 --sync가 다시 받음 (버전이 같아도 파일이 없으면 다시 받음)
+    for page_id in failed:
+        (Path(cache_dir) / by_id[page_id]['filename']).unlink(missing_ok=True)
+    if deleted:
+        index['pages'] = [page for page in index['pages'] if page['id'] not in deleted]
+
+    return {
+        "rebuilt": rebuilt,
+        "fetched": fetched,
+        "deleted": deleted,
+        "skipped": skipped,
+        "failed": failed,
+        "texts": texts,
+        "links": links,
+    }
+
+
+def rebuild_page(html_to_text: Callable[[str], str], render_markdown: Callable[[dict, str], str], task) -> tuple:
+    """
+    재변환 작업 함수: 보관된 원본으로 마크다운/표 재생성 (raw_store.rebuild_pages worker 형식)
+    변환기는 page_worker로 묶어 넘깁니다 (프로세스 간 전달을 위해 모듈 수준 함수여야 함).
+    """
+    cache_dir, space_key, entry = task
+    try:
+        body = raw_store.RawStore(Path(cache_dir)).load(entry['id'])
+        body_text = html_to_text(body)
+        sha1 = page_store.write_page(Path(cache_dir), entry['filename'], render_markdown(entry, body_text))
+        tables = table_store.TableStore(Path(cache_dir)).save(entry['id'], table_store.extract_tables(body))
+        return (entry['id'], f"{entry['title']}\n{body_text}", link_graph.extract_page_links(body, space_key),
+                {"tables": tables, "sha1": sha1})
+    except Exception as e:
+        return entry['id'], None, str(e), None
+
+
+def page_worker(html_to_text: Callable[[str], str], render_markdown: Callable[[dict, str], str]) -> Callable:
+    """CLI 변환기를 묶은 재변환 작업 함수 (pickle 가능)"""
+    return functools.partial(rebuild_page, html_to_text, render_markdown)
+
+
+def _load_index(cache_dir: Path, say: Callable) -> Optional[dict]:
+    index_file = Path(cache_dir) / cache_indexes.INDEX_FILENAME
+    if not index_file.exists():
+        say("no_index")
+        return None
+    try:
+        with open(index_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except ValueError as e:
+        say("unreadable_index", error=e)
+        return None
+
+
+def _save_indexes(cache_dir: Path, index: dict, texts: Dict[str, str], links: Dict[str, List[str]], say: Callable):
+    """검색 인덱스 갱신 후 page_index.json 저장"""
+    for name, stats in cache_indexes.update_cache_indexes(cache_dir, index, texts, links):
+        if isinstance(stats, Exception):
+            say("index_failed", name=name, error=stats)
+        else:
+            say("index_stats", stats=cache_indexes.format_stats(name, stats))
+    page_store.save_index(Path(cache_dir) / cache_indexes.INDEX_FILENAME, index)
+
+
+def rebuild_cache(cache_dir: Path, worker: Callable, messages: Dict[str, str],
+                  workers: Optional[int] = None) -> Optional[dict]:
+    """
+    보관된 원본(raw/)으로 마크다운과 인덱스를 다시 생성 (--rebuild, 인증/네트워크 불필요)
+    worker: page_worker 결과, messages: 이벤트 이름 → 출력 문구 (str.format 필드 사용)
+    workers: 변환 프로세스 수 (기본: CPU 코어 수)
+    """
+    def say(key, **fields):
+        print(messages[key].format(cache_dir=cache_dir, **fields))
+
+    index = _load_index(cache_dir, say)
+    if index is None:
+        return None
+
+    say("rebuild_start", pages=len(index['pages']))
+    result = raw_store.rebuild_pages(cache_dir, index, worker, workers)
+    say("rebuild_converted", converted=result['converted'], workers=result['workers'], seconds=result['seconds'])
+    if result['missing']:
+        say("rebuild_missing", missing=result['missing'])
+    for page_id, error in result['errors'].items():
+        say("page_error", page_id=page_id, error=error)
+
+    raw_store.apply_fields(index, result['fields'])
+    _save_indexes(cache_dir, index, result['texts'], result['links'], say)
+
+    say("rebuild_done")
+    return result
+
+
+def verify_cache(cache_dir: Path, worker: Callable, fetch: Optional[Callable[[dict], Optional[Tuple[str, dict]]]],
+                 messages: Dict[str, str], workers: Optional[int] = None) -> Optional[dict]:
+    """
+    캐시 무결성 검사 후 손상/누락 페이지만 복구 (--verify)
+    보관된 원본으로 먼저 재변환하고, 원본도 없거나 손상된 페이지만 fetch로 다시 받습니다
+    (fetch는 실제로 다시 받을 페이지가 있을 때만 호출되므로 인증도 그때만 필요).
+    worker: page_worker 결과, fetch: repair_pages 참고, messages: rebuild_cache 참고
+    workers: 검사 스레드 수 (기본: ThreadPoolExecutor 기본값)
+    반환: {"check", "repair", "removed"}
+    """
+    def say(key, **fields):
+        print(messages[key].format(cache_dir=cache_dir, **fields))
+
+    index = _load_index(cache_dir, say)
+    if index is None:
+        return None
+
+    say("verify_start", pages=len(index['pages']))
+    check = check_cache(cache_dir, index, workers)
+    say("verify_checked", pages=check['pages'], seconds=check['seconds'], ok=check['ok'],
+        broken=len(check['broken']), duplicates=check['duplicates'], orphans=len(check['orphans']))
+    for page_id, problem in check['broken'].items():
+        say("broken_page", page_id=page_id, problem=problem, description=PROBLEMS[problem])
+    if check['hashed']:
+        say("hashed", hashed=check['hashed'])
+    removed = remove_orphans(cache_dir, check['orphans'])
+
+    repair = repair_pages(cache_dir, index, list(check['broken']), worker, fetch)
+    if check['broken']:
+        say("repaired", rebuilt=len(repair['rebuilt']), fetched=len(repair['fetched']),
+            deleted=len(repair['deleted']))
+    for page_id in repair['skipped']:
+        say("repair_skipped", page_id=page_id)
+    for page_id, error in repair['failed'].items():
+        say("repair_failed", page_id=page_id, error=str(error).splitlines()[0])
+
+    if repair['texts'] or repair['deleted'] or check['hashed'] or check['duplicates']:
+        _save_indexes(cache_dir, index, repair['texts'], repair['links'], say)
+
+    keep_ids = [page['id'] for page in index['pages']]
+    removed += raw_store.RawStore(cache_dir).prune(keep_ids)
+    removed += table_store.TableStore(cache_dir).prune(keep_ids)
+    removed += page_history.PageHistory(cache_dir).prune(keep_ids)
+    if removed:
+        say("removed", removed=removed)
+
+    problems = len(repair['failed']) + len(repair['skipped'])
+    if problems:
+        say("verify_incomplete", problems=problems)
+    else:
+        say("verify_done")
+    return {"check": check, "repair": repair, "removed": removed}
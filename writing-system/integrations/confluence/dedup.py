@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+유사 중복 페이지 탐지 (MinHash + LSH)
+주간 보고 템플릿이나 복사된 기획서처럼 내용이 거의 같은 페이지를 묶고
+각 묶음의 대표(canonical) 페이지를 정합니다.
+
+모든 페이지 쌍을 비교하지 않고, LSH 밴드 버킷이 겹치는 후보 쌍만 검증하므로
+비용이 페이지 수에 거의 선형으로 늘어납니다.
+
+저장 구조:
+    cache/minhash/
+    ├── meta.json          # 페이지 ID 순서와 텍스트 해시 (증분 갱신용)
+    ├── signatures.npy     # (페이지 수 x NUM_PERM) uint32 MinHash 서명
+    └── bands.npy          # (페이지 수 x NUM_BANDS) uint64 LSH 밴드 해시
+    cache/duplicates.json  # 중복 묶음과 canonical 매핑
+"""
+
+import os
+import re
+import json
+import zlib
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, List, Dict
+
+try:
+    import numpy as np
+except ImportError:  # numpy가 없으면 중복 탐지를 건너뜀
+    np = None
+
+from semantic_index import read_page_text, text_hash
+
+INDEX_DIRNAME = "minhash"
+META_FILE = "meta.json"
+SIGNATURES_FILE = "signatures.npy"
+BANDS_FILE = "bands.npy"
+DUPLICATES_FILE = "duplicates.json"
+
+NUM_PERM = 128
+NUM_BANDS = 16          # 16 밴드 x 8 행 → 유사도 약 0.7부터 후보로 잡힘
+SHINGLE_SIZE = 3
+SIMILARITY_THRESHOLD = 0.8
+SEED = 20250912
+MAX_BUCKET_PAIRS = 64
+
+_MERSENNE_PRIME = (1 << 31) - 1
+_WORD_PATTERN = re.compile(r'[0-9a-z가-힣]+')
+
+
+def _permutations():
+    rng = np.random.RandomState(SEED)
+    a = rng.randint(1, _MERSENNE_PRIME, size=NUM_PERM).astype(np.uint64)
+    b = rng.randint(0, _MERSENNE_PRIME, size=NUM_PERM).astype(np.uint64)
+    return a, b
+
+
+def shingles(text: str) -> set:
+    """단어 SHINGLE_SIZE-gram 집합 (짧은 문서는 단어 집합)"""
+    words = _WORD_PATTERN.findall(text.lower())
+    if len(words) < SHINGLE_SIZE:
+        return set(words)
+    return {' '.join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)}
+
+
+def minhash_signature(text: str, perms=None):
+    """텍스트의 MinHash 서명 (NUM_PERM,) uint32"""
+    a, b = perms or _permutations()
+    signature = np.full(NUM_PERM, _MERSENNE_PRIME, dtype=np.uint64)
+    hashes = np.fromiter((zlib.crc32(s.encode('utf-8')) for s in shingles(text)), dtype=np.uint64)
+    hashes %= _MERSENNE_PRIME
+
+    # 큰 문서도 메모리를 일정하게 쓰도록 나눠서 계산
+    for start in range(0, len(hashes), 4096):
+        chunk = hashes[start:start + 4096]
+        values = (np.outer(chunk, a) + b) % _MERSENNE_PRIME
+        np.minimum(signature, values.min(axis=0), out=signature)
+    return signature.astype(np.uint32)
+
+
+def band_hashes(signatures):
+    """서명을 NUM_BANDS개 밴드로 나눠 밴드별 64비트 해시 계산 (페이지 수 x NUM_BANDS)"""
+    rows = NUM_PERM // NUM_BANDS
+    bands = signatures.reshape(len(signatures), NUM_BANDS, rows).astype(np.uint64)
+    # FNV 스타일 결합 (uint64 오버플로는 의도된 동작)
+    result = np.full(bands.shape[:2], 1469598103934665603, dtype=np.uint64)
+    with np.errstate(over='ignore'):
+        for r in range(rows):
+            result = (result ^ bands[:, :, r]) * np.uint64(1099511628211)
+    return result
+
+
+class DuplicateIndex:
+    """MinHash 서명 + LSH 밴드 인덱스 (cache/minhash/)"""
+
+    def __init__(self, cache_dir: Path, threshold: float = SIMILARITY_THRESHOLD):
+        if np is None:
+            raise ImportError("중복 탐지에는 numpy가 필요합니다: pip install numpy")
+        self.cache_dir = Path(cache_dir)
+        self.index_dir = self.cache_dir / INDEX_DIRNAME
+        self.threshold = threshold
+
+    def _load(self):
+        meta_path = self.index_dir / META_FILE
+        if not meta_path.exists():
+            return [], {}, np.zeros((0, NUM_PERM), dtype=np.uint32)
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        signatures = np.load(self.index_dir / SIGNATURES_FILE)
+        return meta['ids'], meta['hashes'], signatures
+
+    def update(self, pages: List[Dict], texts: Optional[Dict[str, str]] = None) -> dict:
+        """
+        변경된 페이지만 서명을 다시 계산하고 중복 묶음 갱신
+        반환: {"clusters", "duplicates", "updated"}
+        """
+        texts = texts or {}
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+
+        old_ids, old_hashes, old_signatures = self._load()
+        old_pos = {page_id: i for i, page_id in enumerate(old_ids)}
+        perms = _permutations()
+
+        ids, hashes, rows = [], {}, []
+        updated = 0
+        for page in pages:
+            page_id = page['id']
+            text = texts.get(page_id)
+            if text is None and page_id in old_pos:
+                ids.append(page_id)
+                hashes[page_id] = old_hashes[page_id]
+                rows.append(old_signatures[old_pos[page_id]])
+                continue
+            if text is None:
+                text = read_page_text(self.cache_dir, page)
+                if text is None:
+                    continue
+
+            digest = text_hash(text)
+            ids.append(page_id)
+            hashes[page_id] = digest
+            if old_hashes.get(page_id) == digest:
+                rows.append(old_signatures[old_pos[page_id]])
+            else:
+                rows.append(minhash_signature(text, perms))
+                updated += 1
+
+        signatures = np.stack(rows) if rows else np.zeros((0, NUM_PERM), dtype=np.uint32)
+        bands = band_hashes(signatures)
+
+        np.save(self.index_dir / SIGNATURES_FILE, signatures)
+        np.save(self.index_dir / BANDS_FILE, bands)
+        with open(self.index_dir / META_FILE, 'w', encoding='utf-8') as f:
+            json.dump({"ids": ids, "hashes": hashes}, f)
+
+        clusters = self._cluster(ids, signatures, bands)
+        stats = self._write_duplicates(pages, [[ids[i] for i in members] for members in clusters])
+        stats["updated"] = updated
+        return stats
+
+    def _cluster(self, ids: List[str], signatures, bands) -> List[List[int]]:
+        """LSH 버킷이 겹치는 후보 쌍만 검증해 union-find로 묶음"""
+        parent = list(range(len(ids)))
+
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        # 단어가 하나도 없는 페이지(빈 폴더 페이지 등)는 묶지 않음
+        empty = set(np.flatnonzero((signatures == _MERSENNE_PRIME).all(axis=1)).tolist())
+
+        checked = set()
+
+        def link(first, other) -> bool:
+            """두 페이지가 이미 같은 묶음이거나 서명 유사도가 임계값 이상이면 합치고 True"""
+            if find(first) == find(other):
+                return True
+            pair = (first, other)
+            if pair in checked:
+                return False
+            checked.add(pair)
+            if float(np.mean(signatures[first] == signatures[other])) < self.threshold:
+                return False
+            parent[find(other)] = find(first)
+            return True
+
+        for band in range(NUM_BANDS):
+            buckets = {}
+            for i, key in enumerate(bands[:, band].tolist()):
+                if i not in empty:
+                    buckets.setdefault(key, []).append(i)
+            for members in buckets.values():
+                if len(members) < 2:
+                    continue
+                if len(members) <= MAX_BUCKET_PAIRS:
+                    for j, other in enumerate(members[1:], 1):
+                        for first in members[:j]:
+                            link(first, other)
+                    continue
+                # 버킷이 아주 크면 모든 쌍 대신 버킷 안 묶음 대표들과만 비교 (비용은 버킷 크기에 비례).
+                # 어느 대표와도 비슷하지 않은 페이지는 새 대표가 되므로, 첫 페이지와 다른 페이지끼리 비슷한 경우도 묶입니다.
+                # 대표는 최근에 일치한 순서로 MAX_BUCKET_PAIRS개까지 유지 (LRU)
+                leaders = OrderedDict()
+                for other in members:
+                    matched = next((leader for leader in reversed(leaders) if link(leader, other)), None)
+                    if matched is not None:
+                        leaders.move_to_end(matched)
+                        continue
+                    leaders[other] = None
+                    if len(leaders) > MAX_BUCKET_PAIRS:
+                        leaders.popitem(last=False)
+
+        groups = {}
+        for i in range(len(ids)):
+            groups.setdefault(find(i), []).append(i)
+        return [members for members in groups.values() if len(members) > 1]
+
+    def _write_duplicates(self, pages: List[Dict], clusters: List[List[str]]) -> dict:
+        by_id = {page['id']: page for page in pages}
+
+        canonical = {}
+        cluster_list = []
+        for member_ids in clusters:
+            chosen = choose_canonical([by_id[page_id] for page_id in member_ids])
+            for page_id in member_ids:
+                if page_id != chosen:
+                    canonical[page_id] = chosen
+            cluster_list.append({
+                "canonical": chosen,
+                "members": sorted(member_ids, key=lambda x: (len(x), x)),
+            })
+
+        data = {
+            "built_at": datetime.now().isoformat(),
+            "threshold": self.threshold,
+            "clusters": cluster_list,
+            "canonical": canonical,
+        }
+        path = self.cache_dir / DUPLICATES_FILE
+        tmp_path = path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+
+        # 카탈로그 항목에 canonical_id 기록 (대표 페이지는 제거)
+        for page in pages:
+            if page['id'] in canonical:
+                page['canonical_id'] = canonical[page['id']]
+            else:
+                page.pop('canonical_id', None)
+
+        return {"clusters": len(cluster_list), "duplicates": len(canonical)}
+
+
+def choose_canonical(pages: List[Dict]) -> str:
+    """묶음 대표 페이지: 가장 최근에 수정된 페이지 (날짜가 없으면 가장 오래된 ID)"""
+    dated = [page for page in pages if page.get('updated_date')]
+    if dated:
+        return max(dated, key=lambda page: (page['updated_date'], -_id_order(page['id'])))['id']
+    return min(pages, key=lambda page: _id_order(page['id']))['id']
+
+
+def _id_order(page_id: str) -> int:
+    return int(page_id) if page_id.isdigit() else 0
+
+
+def load_canonical_map(cache_dir: Path) -> Dict[str, str]:
+    """duplicates.json의 {중복 페이지 ID: canonical 페이지 ID} 매핑"""
+    path = Path(cache_dir) / DUPLICATES_FILE
+    if not path.exists():
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f).get('canonical', {})
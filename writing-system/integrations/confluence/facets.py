@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+카탈로그 패싯 인덱스 (라벨 / 작성자 / 상위 페이지 / 최종 수정일)
+page_index.json을 매번 훑지 않고 "김태현이 이번 달 수정한 design 라벨 페이지" 같은 조건을
+비트맵 교집합으로 바로 계산합니다. 동기화마다 cache_indexes.py에서 다시 만듭니다.
+
+구조:
+    문서 번호 = page_index.json "pages" 순서
+    값 패싯   = {패싯: {값: 비트맵}}  (비트맵은 문서 번호 비트가 켜진 정수, base64로 저장)
+    날짜 패싯 = updated_date 오름차순 배열 + 문서 번호 배열 (bisect로 범위 → 비트맵)
+
+패싯:
+    label       페이지 라벨
+    author      작성자 또는 최종 수정자 (Jira 이슈는 보고자/담당자)
+    updated_by  최종 수정자
+    ancestor    상위 페이지 ID (모든 조상, 제목으로도 조회 가능)
+    source      confluence / jira
+
+캐시 구조:
+    cache/facets/facets.json
+
+사용법:
+    python facets.py --values label                              # 라벨별 문서 수
+    python facets.py --label design --updated-by 김태현 --since 2025-09
+    python facets.py --ancestor "전투 시스템" --since 30d
+"""
+
+import os
+import sys
+import json
+import base64
+import argparse
+from bisect import bisect_left, bisect_right
+from datetime import datetime, date, timedelta
+from pathlib import Path
+from typing import Optional, List, Dict, Iterable
+
+# Windows 콘솔 UTF-8 출력 설정
+if sys.platform == 'win32':
+    import io
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
+
+CACHE_DIR = Path(__file__).parent / "cache"
+INDEX_DIRNAME = "facets"
+FACETS_FILE = "facets.json"
+
+FACETS = ("label", "author", "updated_by", "ancestor", "source")
+_UNKNOWN = ("", "Unknown", None)
+
+
+def ancestor_chain(page_id: str, parents: Dict[str, Optional[str]]) -> List[str]:
+    """parentId 매핑으로 조상 ID 목록 (최상위 → 부모 순, API v2 목록용)"""
+    chain = []
+    seen = {page_id}
+    parent = parents.get(page_id)
+    while parent and parent not in seen:
+        chain.append(parent)
+        seen.add(parent)
+        parent = parents.get(parent)
+    return chain[::-1]
+
+
+def resolve_date(value: Optional[str]) -> Optional[str]:
+    """날짜 조건 정규화: 'YYYY-MM[-DD]'는 그대로, '30d'는 30일 전 날짜"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.endswith("d") and value[:-1].isdigit():
+        return (date.today() - timedelta(days=int(value[:-1]))).isoformat()
+    return value
+
+
+def _facet_values(page: dict) -> Dict[str, Iterable[str]]:
+    authors = {page.get('created_by'), page.get('updated_by'), page.get('assignee')}
+    return {
+        "label": page.get('labels', []),
+        "author": [name for name in authors if name not in _UNKNOWN],
+        "updated_by": [page['updated_by']] if page.get('updated_by') not in _UNKNOWN else [],
+        "ancestor": page.get('ancestors', []),
+        "source": [page.get('source', 'confluence')],
+    }
+
+
+def _encode(bitmap: int, size: int) -> str:
+    return base64.b64encode(bitmap.to_bytes((size + 7) // 8, 'little')).decode('ascii')
+
+
+def _decode(data: str) -> int:
+    return int.from_bytes(base64.b64decode(data), 'little')
+
+
+def bitmap_positions(bitmap: int) -> List[int]:
+    """켜진 비트의 문서 번호 (오름차순)"""
+    positions = []
+    while bitmap:
+        low = bitmap & -bitmap
+        positions.append(low.bit_length() - 1)
+        bitmap ^= low
+    return positions
+
+
+class FacetIndex:
+    """패싯 비트맵 인덱스 (cache/facets/)"""
+
+    def __init__(self, cache_dir: Path):
+        self.cache_dir = Path(cache_dir)
+        self.index_dir = self.cache_dir / INDEX_DIRNAME
+        self._data = None
+        self._bitmaps = {}
+
+    # ------------------------------------------------------------------
+    # 생성
+    # ------------------------------------------------------------------
+
+    def build(self, pages: List[Dict]) -> dict:
+        """카탈로그 전체로 다시 생성 (메타데이터만 사용하므로 수천 페이지도 수십 ms)"""
+        bitmaps = {facet: {} for facet in FACETS}
+        dated = []
+        for position, page in enumerate(pages):
+            bit = 1 << position
+            for facet, values in _facet_values(page).items():
+                postings = bitmaps[facet]
+                for value in values:
+                    postings[value] = postings.get(value, 0) | bit
+            if page.get('updated_date') not in _UNKNOWN:
+                dated.append((page['updated_date'], position))
+        dated.sort()
+
+        ids = [page['id'] for page in pages]
+        ancestor_ids = set(bitmaps["ancestor"])
+        data = {
+            "built_at": datetime.now().isoformat(),
+            "ids": ids,
+            "titles": {page['id']: page['title'] for page in pages if page['id'] in ancestor_ids},
+            "facets": {facet: {value: _encode(bitmap, len(ids)) for value, bitmap in values.items()}
+                       for facet, values in bitmaps.items()},
+            "updated": {"dates": [value for value, _ in dated], "docs": [position for _, position in dated]},
+        }
+
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        path = self.index_dir / FACETS_FILE
+        tmp_path = path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp_path, path)
+        self._data = data
+        self._bitmaps = {}
+
+        return {"documents": len(ids), **{facet: len(values) for facet, values in bitmaps.items()}}
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+
+    @property
+    def data(self) -> Optional[dict]:
+        if self._data is None:
+            path = self.index_dir / FACETS_FILE
+            if not path.exists():
+                return None
+            with open(path, 'r', encoding='utf-8') as f:
+                self._data = json.load(f)
+        return self._data
+
+    @property
+    def ids(self) -> List[str]:
+        return self.data['ids'] if self.data else []
+
+    def _bitmap(self, facet: str, value: str) -> int:
+        key = (facet, value)
+        if key not in self._bitmaps:
+            self._bitmaps[key] = _decode(self.data['facets'][facet][value])
+        return self._bitmaps[key]
+
+    def values(self, facet: str) -> List[tuple]:
+        """[(값, 문서 수)] 문서 수 내림차순"""
+        if not self.data:
+            return []
+        counts = [(value, bin(self._bitmap(facet, value)).count('1')) for value in self.data['facets'].get(facet, {})]
+        return sorted(counts, key=lambda item: (-item[1], item[0]))
+
+    def match(self, facet: str, value: str) -> int:
+        """
+        값 하나에 해당하는 문서 비트맵
+        대소문자 무시 완전 일치가 있으면 그 값만, 없으면 부분 일치하는 값 전체의 합집합
+        ("김태현" → "Taehyun Kim (김태현)"). ancestor는 상위 페이지 제목으로도 찾습니다.
+        """
+        if not self.data:
+            return 0
+        postings = self.data['facets'].get(facet, {})
+        needle = value.lower()
+
+        def label(candidate: str) -> str:
+            if facet == "ancestor":
+                return self.data['titles'].get(candidate, candidate)
+            return candidate
+
+        exact = [candidate for candidate in postings if candidate.lower() == needle or label(candidate).lower() == needle]
+        matched = exact or [candidate for candidate in postings if needle in label(candidate).lower()]
+        bitmap = 0
+        for candidate in matched:
+            bitmap |= self._bitmap(facet, candidate)
+        return bitmap
+
+    def date_range(self, since: Optional[str] = None, until: Optional[str] = None) -> int:
+        """updated_date가 [since, until] 안인 문서 비트맵 (문자열 비교, until은 그 날짜 전체 포함)"""
+        if not self.data:
+            return 0
+        dates, docs = self.data['updated']['dates'], self.data['updated']['docs']
+        start = bisect_left(dates, since) if since else 0
+        end = bisect_right(dates, until + "\uffff") if until else len(dates)
+        bitmap = 0
+        for position in docs[start:end]:
+            bitmap |= 1 << position
+        return bitmap
+
+    def query(self, filters: Optional[Dict[str, Iterable[str]]] = None,
+              since: Optional[str] = None, until: Optional[str] = None) -> int:
+        """
+        패싯 조건 교집합 비트맵
+        filters: {패싯: [값, ...]} - 같은 패싯 안의 값은 OR, 패싯 사이는 AND
+        """
+        if not self.data:
+            return 0
+        result = (1 << len(self.ids)) - 1
+        for facet, values in (filters or {}).items():
+            values = list(values)
+            if not values:
+                continue
+            if facet not in FACETS:
+                raise ValueError(f"알 수 없는 패싯입니다: {facet} (지원: {', '.join(FACETS)})")
+            union = 0
+            for value in values:
+                union |= self.match(facet, value)
+            result &= union
+            if not result:
+                return 0
+        if since or until:
+            result &= self.date_range(resolve_date(since), resolve_date(until))
+        return result
+
+    def matching_ids(self, filters: Optional[Dict[str, Iterable[str]]] = None,
+                     since: Optional[str] = None, until: Optional[str] = None) -> List[str]:
+        """조건에 맞는 페이지 ID (카탈로그 순서)"""
+        ids = self.ids
+        return [ids[position] for position in bitmap_positions(self.query(filters, since, until))]
+
+
+def add_filter_arguments(parser: argparse.ArgumentParser):
+    """패싯 조건 CLI 인자 (facets.py / local_search.py 공용)"""
+    parser.add_argument('--label', action='append', default=[], help='라벨 (여러 번 지정 시 OR)')
+    parser.add_argument('--author', action='append', default=[], help='작성자 또는 수정자 (부분 일치)')
+    parser.add_argument('--updated-by', action='append', default=[], help='최종 수정자 (부분 일치)')
+    parser.add_argument('--ancestor', action='append', default=[], help='상위 페이지 ID 또는 제목')
+    parser.add_argument('--source', action='append', default=[], help='confluence 또는 jira')
+    parser.add_argument('--since', type=str, help='최종 수정일 하한 (YYYY-MM[-DD] 또는 30d)')
+    parser.add_argument('--until', type=str, help='최종 수정일 상한 (YYYY-MM[-DD], 그 날짜 포함)')
+
+
+def filters_from_args(args) -> Dict[str, List[str]]:
+    return {facet: getattr(args, facet) for facet in FACETS if getattr(args, facet, None)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='카탈로그 패싯 조회')
+    parser.add_argument('--values', type=str, choices=FACETS, help='패싯 값별 문서 수')
+    add_filter_arguments(parser)
+    parser.add_argument('--limit', type=int, default=50, help='최대 출력 수 (기본: 50)')
+    parser.add_argument('--cache-dir', type=str, default=str(CACHE_DIR), help='캐시 폴더 (기본: ./cache)')
+
+    args = parser.parse_args()
+    index = FacetIndex(Path(args.cache_dir))
+    if not index.data:
+        print("❌ 패싯 인덱스가 없습니다. --sync를 먼저 실행하세요.")
+        return
+
+    if args.values:
+        titles = index.data['titles']
+        for value, count in index.values(args.values)[:args.limit]:
+            shown = f"{titles[value]} ({value})" if args.values == "ancestor" and value in titles else value
+            print(f"  {count:5d}  {shown}")
+        return
+
+    filters = filters_from_args(args)
+    if not filters and not args.since and not args.until:
+        parser.print_help()
+        return
+
+    catalog_file = Path(args.cache_dir) / "page_index.json"
+    with open(catalog_file, 'r', encoding='utf-8') as f:
+        pages = {page['id']: page for page in json.load(f)['pages']}
+    ids = index.matching_ids(filters, args.since, args.until)
+    matched = sorted((pages[page_id] for page_id in ids if page_id in pages),
+                     key=lambda page: page.get('updated_date', ''), reverse=True)
+    print(f"\n🔎 {len(matched)}개 문서\n")
+    for page in matched[:args.limit]:
+        print(f"  - {page['title']} ({page.get('updated_by') or page.get('assignee') or '-'}, "
+              f"{(page.get('updated_date') or '')[:10]})")
+
+
+if __name__ == "__main__":
+    main()
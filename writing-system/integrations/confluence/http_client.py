@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+sync_confluence.py / oauth_confluence.py 공용 HTTP 요청 헬퍼
+429(Rate limit)와 일시적인 5xx 응답은 Retry-After에 맞춰 재시도하고,
+SyncMetrics가 주어지면 요청 수/지연/바이트/재시도를 기록합니다.
+
+ResponseCache를 넘기고 cacheable=True로 요청하면 URL별 ETag/Last-Modified를 저장해
+조건부 요청(If-None-Match / If-Modified-Since)을 보내고, 304 응답은 캐시된 본문으로 대체합니다.
+캐시는 호출부가 고른 요청(페이지 본문, 본문 없는 목록)에만 쓰여 같은 본문을 두 번 저장하지 않습니다.
+오프라인 모드에서는 네트워크 없이 캐시에서만 응답합니다.
+
+캐시 구조:
+    cache/http/<sha1(URL+파라미터)>.json     # URL, 검증자(ETag/Last-Modified), 헤더
+    cache/http/<sha1(URL+파라미터)>.body.gz  # 응답 본문 (gzip)
+"""
+
+import os
+import gzip
+import json
+import time
+import hashlib
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+RETRY_STATUS = (429, 502, 503, 504)
+MAX_RETRIES = 4
+BACKOFF_SECONDS = 0.5
+MAX_BACKOFF_SECONDS = 30.0
+
+HTTP_CACHE_DIRNAME = "http"
+_STORED_HEADERS = ("Content-Type", "ETag", "Last-Modified")
+
+
+class OfflineCacheMiss(Exception):
+    """오프라인 모드에서 캐시에 없는 URL을 요청함"""
+
+
+class ResponseCache:
+    """URL 단위 디스크 응답 캐시 (조건부 요청 + 오프라인 모드)"""
+
+    def __init__(self, cache_dir: Path, offline: bool = False):
+        self.dir = Path(cache_dir) / HTTP_CACHE_DIRNAME
+        self.offline = offline
+        self.hits = 0            # 304 또는 오프라인 응답
+        self.misses = 0          # 캐시 없이 전체 응답을 받음
+        self.stored = 0
+
+    @staticmethod
+    def key(url: str, params: Optional[dict] = None) -> str:
+        canonical = url + "?" + "&".join(f"{k}={v}" for k, v in sorted((params or {}).items()))
+        return hashlib.sha1(canonical.encode('utf-8')).hexdigest()
+
+    def lookup(self, url: str, params: Optional[dict] = None) -> Optional[dict]:
+        meta_path = self.dir / f"{self.key(url, params)}.json"
+        if not meta_path.exists():
+            return None
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        # 본문 없이 메타데이터만 남은 항목은 캐시 미스 (304를 받아도 돌려줄 본문이 없음)
+        if not (self.dir / f"{entry['key']}.body.gz").exists():
+            self.drop(entry)
+            return None
+        return entry
+
+    @staticmethod
+    def validators(entry: Optional[dict]) -> dict:
+        """조건부 요청 헤더"""
+        headers = {}
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def response(self, entry: dict) -> Optional[requests.Response]:
+        """캐시 항목으로 200 응답 객체 생성 (본문 파일이 없거나 깨졌으면 항목을 지우고 None)"""
+        try:
+            with gzip.open(self.dir / f"{entry['key']}.body.gz", 'rb') as f:
+                content = f.read()
+        except (OSError, EOFError):
+            self.drop(entry)
+            return None
+        response = requests.Response()
+        response.status_code = 200
+        response._content = content
+        response.headers = CaseInsensitiveDict(entry.get('headers', {}))
+        response.url = entry['url']
+        response.encoding = 'utf-8'
+        response.from_cache = True
+        self.hits += 1
+        return response
+
+    def drop(self, entry: dict):
+        """항목 삭제 (다음 요청은 검증자 없이 전체 응답을 받음)"""
+        (self.dir / f"{entry['key']}.json").unlink(missing_ok=True)
+        (self.dir / f"{entry['key']}.body.gz").unlink(missing_ok=True)
+
+    def store(self, url: str, params: Optional[dict], response: requests.Response):
+        key = self.key(url, params)
+        self.dir.mkdir(parents=True, exist_ok=True)
+
+        body_path = self.dir / f"{key}.body.gz"
+        tmp_body = body_path.with_name(body_path.name + '.tmp')
+        with gzip.open(tmp_body, 'wb', compresslevel=6) as f:
+            f.write(response.content)
+        os.replace(tmp_body, body_path)
+
+        entry = {
+            "key": key,
+            "url": url,
+            "params": params or {},
+            "etag": response.headers.get('ETag'),
+            "last_modified": response.headers.get('Last-Modified'),
+            "headers": {name: response.headers[name] for name in _STORED_HEADERS if name in response.headers},
+            "stored_at": datetime.now().isoformat(),
+        }
+        meta_path = self.dir / f"{key}.json"
+        tmp_meta = meta_path.with_suffix('.tmp')
+        with open(tmp_meta, 'w', encoding='utf-8') as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp_meta, meta_path)
+        self.stored += 1
+
+    def stats(self) -> dict:
+        return {"offline": self.offline, "hits": self.hits, "misses": self.misses, "stored": self.stored}
+
+
+def _retry_delay(response: Optional[requests.Response], attempt: int) -> float:
+    if response is not None:
+        retry_after = response.headers.get('Retry-After')
+        if retry_after:
+            try:
+                return min(float(retry_after), MAX_BACKOFF_SECONDS)
+            except ValueError:
+                pass
+    return min(BACKOFF_SECONDS * (2 ** attempt), MAX_BACKOFF_SECONDS)
+
+
+def get(url: str, headers: dict, params: Optional[dict] = None, metrics=None,
+        max_retries: int = MAX_RETRIES, timeout: float = 60,
+        cache: Optional[ResponseCache] = None, cacheable: bool = False) -> requests.Response:
+    """
+    GET 요청 (재시도 포함)
+    재시도 후에도 실패한 응답은 그대로 반환하므로 호출부의 상태 코드 처리는 기존과 같습니다.
+    연결 오류는 재시도 후 마지막 예외를 다시 발생시킵니다.
+    cache가 있고 cacheable이면 조건부 요청을 보내고 304는 캐시된 200 응답으로 돌려줍니다.
+    오프라인 캐시에서는 cacheable과 관계없이 캐시에 없는 요청이 OfflineCacheMiss로 실패합니다.
+    """
+    if cache and cache.offline:
+        entry = cache.lookup(url, params)
+        response = cache.response(entry) if entry else None
+        if response is None:
+            raise OfflineCacheMiss(f"캐시에 없는 요청입니다 (오프라인 모드): {url}")
+        return response
+    if not cacheable:
+        cache = None
+    entry = cache.lookup(url, params) if cache else None
+    if entry:
+        headers = {**headers, **cache.validators(entry)}
+
+    attempt = 0
+    while True:
+        start = time.perf_counter()
+        try:
+            response = requests.get(url, headers=headers, params=params, timeout=timeout)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+            if metrics:
+                metrics.record_request(url, time.perf_counter() - start, None, 0)
+            if attempt >= max_retries:
+                raise
+            response = None
+        else:
+            if metrics:
+                metrics.record_request(url, time.perf_counter() - start, response.status_code, len(response.content))
+            if response.status_code not in RETRY_STATUS or attempt >= max_retries:
+                break
+
+        if metrics:
+            metrics.record_retry(url)
+        time.sleep(_retry_delay(response, attempt))
+        attempt += 1
+
+    if cache:
+        if response.status_code == 304 and entry:
+            cached = cache.response(entry)
+            if cached is not None:
+                return cached
+            # 본문이 깨져 읽지 못하면 캐시 미스로 보고 검증자 없이 다시 요청
+            return get(url, {k: v for k, v in headers.items() if k not in ('If-None-Match', 'If-Modified-Since')},
+                       params, metrics, max_retries, timeout, cache, cacheable)
+        if response.status_code == 200:
+            cache.misses += 1
+            cache.store(url, params, response)
+    return response
@@ -0,0 +1,406 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Jira 이슈 로컬 미러
+프로젝트 이슈를 Confluence 캐시와 같은 카탈로그(page_index.json)와 검색 인덱스에 넣어
+Slack 챗봇/로컬 검색이 질의마다 Jira API를 호출하지 않고 답할 수 있게 합니다.
+인증(get_auth_headers)과 HTTP 계층(http_client: 재시도 + 지표)은 sync_confluence.py와 같습니다.
+
+증분 동기화:
+    마지막 동기화 이후 바뀐 이슈만 `updated >= -<경과 분>m` JQL로 받습니다.
+    상대 시간을 쓰므로 Jira 프로필 시간대와 로컬 시간대가 달라도 빠지는 이슈가 없고,
+    몇 분 겹치게 조회해 생긴 중복은 updated 값이 같으면 다시 쓰지 않습니다.
+    삭제된 이슈는 증분 조회로 알 수 없으므로 --full 동기화에서 정리합니다.
+
+카탈로그 항목 (page_index.json "pages"):
+    {"id": "AEGIS-123", "source": "jira", "title": "AEGIS-123: 요약", "filename", "url",
+     "issue_type", "status", "priority", "assignee", "created_by", "created_date", "updated_date", "labels"}
+
+환경 변수:
+    JIRA_EMAIL / JIRA_API_TOKEN      (없으면 CONFLUENCE_EMAIL / CONFLUENCE_API_TOKEN 사용)
+    JIRA_BASE_URL / JIRA_PROJECT_KEY (confluence_config.json "jira"보다 우선)
+
+사용법:
+    python jira_sync.py --sync                     # 변경된 이슈만
+    python jira_sync.py --sync --full              # 전체 다시 받기 (삭제된 이슈 정리)
+    python jira_sync.py --list --status "In Progress" --assignee 김태현
+"""
+
+import os
+import re
+import sys
+import json
+import argparse
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, List, Dict, Iterator
+
+import requests
+
+import cache_indexes
+import http_client
+import page_history
+import page_store
+from sync_confluence import load_config, get_auth_headers, CACHE_DIR, INDEX_FILE
+from sync_metrics import SyncMetrics
+
+# Windows 콘솔 UTF-8 출력 설정
+if sys.platform == 'win32':
+    import io
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
+
+SOURCE = "jira"
+STATE_FILE = CACHE_DIR / "jira_state.json"
+
+DEFAULT_BASE_URL = "https://cloud.jira.krafton.com"
+DEFAULT_PROJECT_KEY = "AEGIS"
+
+# 새 검색 API(nextPageToken)부터 시도하고, 없는 서버는 기존 API(startAt)로
+SEARCH_ENDPOINTS = ("/rest/api/3/search/jql", "/rest/api/3/search", "/rest/api/2/search")
+FIELDS = "summary,status,issuetype,priority,assignee,reporter,labels,description,created,updated"
+PAGE_SIZE = 100
+
+# 증분 조회 여유 (JQL 상대 시간은 분 단위이고 서버/로컬 시계가 조금 다를 수 있음)
+OVERLAP_MINUTES = 5
+
+_ADF_BLOCKS = ("paragraph", "heading", "listItem", "codeBlock", "blockquote", "rule", "tableRow", "panel")
+
+
+def load_jira_config() -> dict:
+    """confluence_config.json "jira" 설정 (환경 변수가 우선)"""
+    config = load_config().get("jira", {})
+    return {
+        "base_url": (os.environ.get("JIRA_BASE_URL") or config.get("base_url") or DEFAULT_BASE_URL).rstrip("/"),
+        "project_key": os.environ.get("JIRA_PROJECT_KEY") or config.get("project_key") or DEFAULT_PROJECT_KEY,
+    }
+
+
+def get_jira_auth_headers() -> dict:
+    """Jira 전용 토큰이 있으면 사용하고, 없으면 같은 Atlassian 계정의 Confluence 토큰 사용"""
+    email = os.environ.get("JIRA_EMAIL")
+    api_token = os.environ.get("JIRA_API_TOKEN")
+    if email and api_token:
+        return get_auth_headers(email, api_token)
+    return get_auth_headers()
+
+
+def adf_to_text(node) -> str:
+    """Jira 설명(ADF 문서 또는 v2 API의 문자열)을 텍스트로 변환"""
+    if not node:
+        return ""
+    if isinstance(node, str):
+        return node.strip()
+
+    parts = []
+
+    def walk(item: dict):
+        kind = item.get("type")
+        attrs = item.get("attrs") or {}
+        if kind == "text":
+            parts.append(item.get("text", ""))
+        elif kind == "hardBreak":
+            parts.append("\n")
+        elif kind in ("mention", "emoji"):
+            parts.append(attrs.get("text") or attrs.get("shortName", ""))
+        elif kind in ("inlineCard", "blockCard"):
+            parts.append(attrs.get("url", ""))
+        elif kind == "heading":
+            parts.append("#" * min(int(attrs.get("level", 2)), 4) + " ")
+        elif kind == "listItem":
+            parts.append("- ")
+        for child in item.get("content") or []:
+            walk(child)
+        if kind in ("tableCell", "tableHeader"):
+            parts.append(" | ")
+        elif kind in _ADF_BLOCKS:
+            parts.append("\n")
+
+    walk(node)
+    text = re.sub(r'[ \t]+\n', '\n', "".join(parts))
+    return re.sub(r'\n{3,}', '\n\n', text).strip()
+
+
+def render_issue(entry: dict, description: str) -> str:
+    """카탈로그 항목과 설명으로 캐시 마크다운 생성 (Confluence 페이지와 같은 헤더 형식)"""
+    labels = ", ".join(entry.get("labels", [])) or "-"
+    return f"""# {entry['title']}
+
+> **Issue Key**: {entry['id']}
+> **URL**: {entry['url']}
+> **Type**: {entry['issue_type']}
+> **Status**: {entry['status']}
+> **Priority**: {entry['priority']}
+> **Assignee**: {entry['assignee'] or '미지정'}
+> **Reporter**: {entry['created_by']}
+> **Labels**: {labels}
+> **Created Date**: {entry['created_date']}
+> **Last Updated**: {entry['updated_date']}
+
+---
+
+{description}
+"""
+
+
+def load_state() -> dict:
+    if STATE_FILE.exists():
+        with open(STATE_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    return {}
+
+
+def load_catalog() -> dict:
+    """page_index.json (Confluence 동기화 전이면 빈 카탈로그)"""
+    if INDEX_FILE.exists():
+        with open(INDEX_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    return {
+        "space_key": load_config().get("confluence", {}).get("space_key", ""),
+        "synced_at": None,
+        "total_pages": 0,
+        "pages": [],
+    }
+
+
+class JiraSync:
+    def __init__(self):
+        config = load_jira_config()
+        self.base_url = config["base_url"]
+        self.project_key = config["project_key"]
+        self.headers = get_jira_auth_headers()
+        self.metrics = None
+        self._endpoint = None  # 응답한 검색 API (이후 요청은 같은 API로)
+
+    def _get(self, url: str, params: Optional[dict] = None):
+        return http_client.get(url, self.headers, params, metrics=self.metrics)
+
+    def search(self, jql: str) -> Iterator[dict]:
+        """JQL 검색 결과 전체를 페이지 단위로 받아 이슈를 하나씩 반환"""
+        params = {"jql": jql, "fields": FIELDS, "maxResults": PAGE_SIZE}
+        last_error = ""
+        for endpoint in ([self._endpoint] if self._endpoint else SEARCH_ENDPOINTS):
+            url = f"{self.base_url}{endpoint}"
+            response = self._get(url, params)
+            if response.status_code == 200:
+                self._endpoint = endpoint
+                break
+            last_error = f"{endpoint}: HTTP {response.status_code} {response.text[:200]}"
+        else:
+            raise RuntimeError(f"Jira 검색 실패 ({last_error})")
+
+        while True:
+            data = response.json()
+            issues = data.get("issues", [])
+            for issue in issues:
+                yield issue
+
+            if self._endpoint == SEARCH_ENDPOINTS[0]:
+                token = data.get("nextPageToken")
+                if not token or data.get("isLast"):
+                    return
+                params["nextPageToken"] = token
+            else:
+                start = data.get("startAt", 0) + len(issues)
+                if not issues or start >= data.get("total", 0):
+                    return
+                params["startAt"] = start
+
+            response = self._get(url, params)
+            if response.status_code != 200:
+                raise RuntimeError(f"Jira 검색 실패 ({self._endpoint}: HTTP {response.status_code})")
+
+    def _entry(self, issue: dict, filename: str) -> dict:
+        fields = issue.get("fields") or {}
+        key = issue["key"]
+        return {
+            "id": key,
+            "source": SOURCE,
+            "title": f"{key}: {fields.get('summary') or ''}".strip(),
+            "filename": filename,
+            "url": f"{self.base_url}/browse/{key}",
+            "issue_type": (fields.get("issuetype") or {}).get("name", "Unknown"),
+            "status": (fields.get("status") or {}).get("name", "Unknown"),
+            "priority": (fields.get("priority") or {}).get("name", "None"),
+            "assignee": (fields.get("assignee") or {}).get("displayName"),
+            "created_by": (fields.get("reporter") or {}).get("displayName", "Unknown"),
+            "created_date": fields.get("created", ""),
+            "updated_date": fields.get("updated", ""),
+            "labels": fields.get("labels") or [],
+        }
+
+    def sync(self, full: bool = False, metrics_prom: Optional[str] = None) -> dict:
+        """
+        프로젝트 이슈를 카탈로그에 반영
+        full: 전체 이슈를 다시 받고, 더 이상 없는 이슈를 카탈로그에서 제거
+        """
+        metrics = SyncMetrics(SOURCE, self.project_key)
+        self.metrics = metrics
+        started_at = datetime.now()
+
+        state = load_state()
+        jql = f'project = "{self.project_key}"'
+        incremental = not full and state.get("last_sync") and state.get("project_key") == self.project_key
+        if incremental:
+            elapsed = started_at - datetime.fromisoformat(state["last_sync"])
+            minutes = int(elapsed.total_seconds() // 60) + OVERLAP_MINUTES
+            jql += f" AND updated >= -{minutes}m"
+        jql += " ORDER BY updated ASC"
+
+        print(f"📥 Jira 이슈 조회 중... ({self.project_key}, {'증분' if incremental else '전체'})")
+        with metrics.phase("list"):
+            issues = list(self.search(jql))
+        print(f"✅ {len(issues)}개 이슈")
+
+        catalog = load_catalog()
+        previous = {p['id']: p for p in catalog['pages'] if p.get('source') == SOURCE}
+        mirrored = {} if full else dict(previous)
+        changed_texts = {}
+        store = page_store.PageStore(CACHE_DIR)
+        history = page_history.PageHistory(CACHE_DIR)
+
+        for issue in issues:
+            key = issue["key"]
+            fields = issue.get("fields") or {}
+            prev_entry = previous.get(key)
+            if (prev_entry and prev_entry.get("updated_date") == fields.get("updated")
+                    and (CACHE_DIR / prev_entry['filename']).exists()):
+                mirrored[key] = prev_entry
+                metrics.count_page("skipped")
+                continue
+
+            try:
+                summary = fields.get("summary") or ""
+                safe_summary = "".join(c for c in summary if c.isalnum() or c in (' ', '-', '_')).strip()[:50]
+                filename = store.filename(f"{key}_{safe_summary}.md")
+
+                with metrics.conversion(key, summary, len(json.dumps(fields.get("description") or ""))):
+                    description = adf_to_text(fields.get("description"))
+
+                entry = self._entry(issue, filename)
+                with metrics.phase("write"):
+                    md_content = render_issue(entry, description)
+                    if prev_entry:
+                        history.record_change(prev_entry, lambda: store.read(prev_entry['filename']),
+                                              entry, md_content)
+                    entry['sha1'] = store.write(filename, md_content)
+                    if prev_entry and prev_entry['filename'] != filename:
+                        (CACHE_DIR / prev_entry['filename']).unlink(missing_ok=True)
+
+                changed_texts[key] = f"{entry['title']}\n{description}"
+                mirrored[key] = entry
+                metrics.count_page("changed")
+            except Exception as e:
+                print(f"    ⚠️ {key} 오류: {e}")
+                metrics.count_page("failed")
+                if prev_entry:
+                    mirrored[key] = prev_entry
+
+        removed = [entry for key, entry in previous.items() if key not in mirrored]
+        for entry in removed:
+            (CACHE_DIR / entry['filename']).unlink(missing_ok=True)
+
+        with metrics.phase("index"):
+            # Confluence 페이지는 그대로 두고 이슈 항목만 교체
+            catalog['pages'] = [p for p in catalog['pages'] if p.get('source') != SOURCE] + list(mirrored.values())
+
+            store_stats = store.finalize(catalog)
+            if store_stats:
+                print(f"🗜️ {page_store.format_stats(store_stats)}")
+
+            changed_links = {key: [] for key in changed_texts}
+            for name, stats in cache_indexes.update_cache_indexes(CACHE_DIR, catalog, changed_texts, changed_links):
+                if isinstance(stats, Exception):
+                    print(f"⚠️ {name} 인덱스 갱신 실패: {stats}")
+                else:
+                    print(f"🧭 {cache_indexes.format_stats(name, stats)}")
+
+            CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            page_store.save_index(INDEX_FILE, catalog)
+            with open(STATE_FILE, 'w', encoding='utf-8') as f:
+                json.dump({
+                    "base_url": self.base_url,
+                    "project_key": self.project_key,
+                    "last_sync": started_at.isoformat(),
+                    "issues": len(mirrored),
+                }, f, ensure_ascii=False, indent=2)
+
+        metrics.extra["jira"] = {"issues": len(mirrored), "removed": len(removed), "incremental": bool(incremental)}
+        metrics.finish()
+        metrics.write_report(CACHE_DIR)
+        if metrics_prom:
+            metrics.write_prometheus(Path(metrics_prom))
+
+        print(f"\n✅ Jira 동기화 완료! 이슈 {len(mirrored)}개 (변경 {len(changed_texts)}개, 삭제 {len(removed)}개)")
+        print(f"⏱️ {metrics.duration:.1f}s, 요청 {metrics.to_dict()['requests_total']}회")
+        return catalog
+
+
+def find_issues(cache_dir: Path = CACHE_DIR, status: Optional[str] = None, assignee: Optional[str] = None,
+                issue_type: Optional[str] = None, text: Optional[str] = None) -> List[Dict]:
+    """
+    미러된 이슈를 카탈로그만으로 조회 (네트워크 없음)
+    모든 조건은 대소문자 무시 부분 일치이며, 최근 수정 순으로 반환합니다.
+    """
+    index_file = Path(cache_dir) / INDEX_FILE.name
+    if not index_file.exists():
+        return []
+    with open(index_file, 'r', encoding='utf-8') as f:
+        pages = json.load(f)['pages']
+
+    def matches(value: Optional[str], needle: Optional[str]) -> bool:
+        return not needle or needle.lower() in (value or "").lower()
+
+    issues = [
+        p for p in pages
+        if p.get('source') == SOURCE
+        and matches(p.get('status'), status)
+        and matches(p.get('assignee'), assignee)
+        and matches(p.get('issue_type'), issue_type)
+        and matches(p['title'], text)
+    ]
+    return sorted(issues, key=lambda p: p.get('updated_date', ''), reverse=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Jira 이슈 로컬 미러')
+    parser.add_argument('--sync', action='store_true', help='변경된 이슈 동기화 (updated >= 마지막 동기화)')
+    parser.add_argument('--full', action='store_true', help='--sync 시 전체 이슈를 다시 받고 삭제된 이슈 정리')
+    parser.add_argument('--metrics-prom', type=str, help='--sync 실행 지표를 Prometheus text format으로 저장할 경로')
+    parser.add_argument('--list', action='store_true', help='미러된 이슈 조회 (네트워크 없음)')
+    parser.add_argument('--status', type=str, help='--list 상태 필터 (부분 일치)')
+    parser.add_argument('--assignee', type=str, help='--list 담당자 필터 (부분 일치)')
+    parser.add_argument('--type', type=str, dest='issue_type', help='--list 유형 필터 (부분 일치)')
+    parser.add_argument('--text', type=str, help='--list 키/요약 필터 (부분 일치)')
+    parser.add_argument('--limit', type=int, default=30, help='--list 최대 출력 수 (기본: 30)')
+
+    args = parser.parse_args()
+
+    if args.list:
+        issues = find_issues(CACHE_DIR, args.status, args.assignee, args.issue_type, args.text)
+        state = load_state()
+        print(f"\n📋 Jira 이슈 {len(issues)}개 (마지막 동기화: {state.get('last_sync', '없음')})\n")
+        for issue in issues[:args.limit]:
+            print(f"  {issue['title']}")
+            print(f"     [{issue['status']}] {issue['issue_type']} · {issue['assignee'] or '미지정'} · {issue['updated_date'][:10]}")
+        return
+
+    if not args.sync:
+        parser.print_help()
+        return
+
+    try:
+        sync = JiraSync()
+    except ValueError as e:
+        print(f"❌ {e}")
+        print("   Jira 전용 토큰은 JIRA_EMAIL / JIRA_API_TOKEN 으로도 설정할 수 있습니다.")
+        return
+
+    try:
+        sync.sync(full=args.full, metrics_prom=args.metrics_prom)
+    except (RuntimeError, requests.exceptions.RequestException) as e:
+        print(f"❌ Jira 동기화 실패: {e}")
+
+
+if __name__ == "__main__":
+    main()
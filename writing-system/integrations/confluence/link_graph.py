@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+페이지 간 링크 그래프와 PageRank 중심성
+Confluence storage format의 <ac:link><ri:page .../></ac:link> 링크와
+/pages/<id> 형태의 <a href> 링크를 추출해 CSR 인접 배열로 저장하고,
+PageRank 점수를 로컬 검색의 랭킹 가중치로 제공합니다.
+
+저장 구조:
+    cache/links/
+    ├── outlinks.json   # 페이지별 링크 대상 (증분 갱신용, "title:<제목>" / "id:<ID>")
+    │                   #   없거나 빠진 페이지는 raw/ 원본 또는 저장된 마크다운에서 다시 추출
+    ├── meta.json       # 그래프 노드(페이지 ID) 순서
+    └── graph.npz       # indptr/indices (int32 CSR) + pagerank (float32)
+"""
+
+import os
+import re
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, List, Dict
+
+import raw_store
+import page_store
+
+try:
+    import numpy as np
+except ImportError:  # numpy가 없으면 링크 그래프를 건너뜀
+    np = None
+
+INDEX_DIRNAME = "links"
+OUTLINKS_FILE = "outlinks.json"
+META_FILE = "meta.json"
+GRAPH_FILE = "graph.npz"
+
+DAMPING = 0.85
+TOLERANCE = 1e-6
+MAX_ITERATIONS = 100
+
+_AC_LINK_PATTERN = re.compile(r'<ac:link\b[^>]*>(.*?)</ac:link>', re.S)
+_RI_PAGE_PATTERN = re.compile(r'<ri:page\b([^>]*?)/?>')
+_RI_ATTR_PATTERN = re.compile(r'ri:(content-title|space-key)="([^"]*)"')
+_HREF_PAGE_PATTERN = re.compile(r'<a\b[^>]*href="[^"]*/pages/(\d+)[^"]*"')
+_RENDERED_LINK_PATTERN = re.compile(r'\[\[([^\[\]\n]+)\]\]')
+
+
+def _unescape(value: str) -> str:
+    return (value.replace('&quot;', '"').replace('&#39;', "'")
+            .replace('&lt;', '<').replace('&gt;', '>').replace('&amp;', '&'))
+
+
+def _page_ref(link_html: str) -> Optional[dict]:
+    match = _RI_PAGE_PATTERN.search(link_html)
+    if not match:
+        return None
+    attrs = dict(_RI_ATTR_PATTERN.findall(match.group(1)))
+    if 'content-title' not in attrs:
+        return None
+    return {"title": _unescape(attrs['content-title']), "space_key": attrs.get('space-key')}
+
+
+def extract_page_links(html: str, space_key: Optional[str] = None) -> List[str]:
+    """
+    storage format HTML에서 같은 스페이스의 페이지 링크 추출
+    반환: ["title:<제목>", "id:<페이지 ID>", ...] (중복 제거, 등장 순서 유지)
+    """
+    if not html:
+        return []
+
+    targets = []
+    for match in _AC_LINK_PATTERN.finditer(html):
+        ref = _page_ref(match.group(1))
+        if ref and (not ref['space_key'] or not space_key or ref['space_key'] == space_key):
+            targets.append(f"title:{ref['title']}")
+    for page_id in _HREF_PAGE_PATTERN.findall(html):
+        targets.append(f"id:{page_id}")
+    return list(dict.fromkeys(targets))
+
+
+def render_page_links(html: str) -> str:
+    """<ac:link> 페이지 링크를 [[제목]] 텍스트로 치환 (태그 제거 시 링크가 사라지지 않도록)"""
+    def replace(match):
+        ref = _page_ref(match.group(1))
+        return f"[[{ref['title']}]]" if ref else match.group(0)
+    return _AC_LINK_PATTERN.sub(replace, html)
+
+
+def pagerank(indptr, indices, n: int, initial=None):
+    """
+    CSR 인접 배열(출발 → 도착)에 대한 PageRank (power iteration)
+    initial: 이전 점수로 시작하면 그래프가 조금 바뀐 경우 몇 번의 반복으로 수렴
+    반환: (점수 배열, 반복 횟수)
+    """
+    if n == 0:
+        return np.zeros(0, dtype=np.float64), 0
+
+    out_degree = np.diff(indptr)
+    dangling = out_degree == 0
+    safe_degree = np.where(dangling, 1, out_degree)
+
+    rank = np.full(n, 1.0 / n) if initial is None else np.asarray(initial, dtype=np.float64)
+    rank = rank / rank.sum()
+
+    iterations = 0
+    for iterations in range(1, MAX_ITERATIONS + 1):
+        share = np.repeat(rank / safe_degree, out_degree)
+        incoming = np.bincount(indices, weights=share, minlength=n)
+        new_rank = (1 - DAMPING) / n + DAMPING * (incoming + rank[dangling].sum() / n)
+        delta = np.abs(new_rank - rank).sum()
+        rank = new_rank
+        if delta < TOLERANCE:
+            break
+    return rank, iterations
+
+
+class LinkGraph:
+    """페이지 링크 그래프 + PageRank (cache/links/)"""
+
+    def __init__(self, cache_dir: Path):
+        if np is None:
+            raise ImportError("링크 그래프에는 numpy가 필요합니다: pip install numpy")
+        self.cache_dir = Path(cache_dir)
+        self.index_dir = self.cache_dir / INDEX_DIRNAME
+
+    def _load_json(self, name: str) -> Optional[dict]:
+        path = self.index_dir / name
+        if path.exists():
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        return None
+
+    def _save_json(self, name: str, data: dict):
+        path = self.index_dir / name
+        tmp_path = path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def _recover_links(self, page: dict, raw: raw_store.RawStore, space_key: Optional[str]) -> List[str]:
+        """
+        outlinks.json에 없는 페이지의 링크 대상
+        raw/ 원본이 있으면 그대로 추출하고, 없으면 저장된 마크다운의 [[제목]] 링크를 사용합니다.
+        """
+        if page.get('source', 'confluence') != 'confluence':
+            return []
+        html = raw.load(page['id'])
+        if html is not None:
+            return extract_page_links(html, space_key)
+        content = page_store.read_page(self.cache_dir, page.get('filename', '')) or ''
+        return list(dict.fromkeys(f"title:{title}" for title in _RENDERED_LINK_PATTERN.findall(content)))
+
+    def update(self, pages: List[Dict], changed_links: Optional[Dict[str, List[str]]] = None,
+               space_key: Optional[str] = None) -> dict:
+        """
+        변경된 페이지의 링크만 교체하고 PageRank 재계산
+        이전 PageRank를 초기값으로 사용하므로 일부 페이지만 바뀐 경우 빠르게 수렴합니다.
+        outlinks.json이 없거나 카탈로그 페이지를 다 담고 있지 않으면 (링크 그래프 도입 전 캐시 등)
+        빠진 페이지의 링크를 원본/마크다운에서 다시 추출한 뒤 계산합니다.
+        """
+        changed_links = changed_links or {}
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+
+        outlinks = self._load_json(OUTLINKS_FILE) or {}
+        outlinks.update(changed_links)
+        ids = [page['id'] for page in pages]
+        current = set(ids)
+        for page_id in [page_id for page_id in outlinks if page_id not in current]:
+            del outlinks[page_id]
+
+        raw = raw_store.RawStore(self.cache_dir)
+        recovered = 0
+        for page in pages:
+            if page['id'] not in outlinks:
+                outlinks[page['id']] = self._recover_links(page, raw, space_key)
+                recovered += 1
+
+        meta = self._load_json(META_FILE)
+        graph_path = self.index_dir / GRAPH_FILE
+        if meta and meta['ids'] == ids and not changed_links and not recovered and graph_path.exists():
+            with np.load(graph_path) as graph:
+                return {"nodes": len(ids), "edges": int(len(graph['indices'])), "iterations": 0}
+
+        # 제목 → ID 해석 (같은 스페이스 안에서만)
+        position = {page_id: i for i, page_id in enumerate(ids)}
+        title_to_pos = {page['title']: position[page['id']] for page in pages}
+
+        indptr = np.zeros(len(ids) + 1, dtype=np.int32)
+        targets = []
+        for i, page_id in enumerate(ids):
+            row = set()
+            for target in outlinks.get(page_id, []):
+                kind, _, value = target.partition(':')
+                j = title_to_pos.get(value) if kind == 'title' else position.get(value)
+                if j is not None and j != i:
+                    row.add(j)
+            targets.extend(sorted(row))
+            indptr[i + 1] = len(targets)
+        indices = np.asarray(targets, dtype=np.int32)
+
+        initial = None
+        if meta and graph_path.exists():
+            with np.load(graph_path) as graph:
+                previous = dict(zip(meta['ids'], graph['pagerank'].tolist()))
+            initial = np.array([previous.get(page_id, 1.0 / max(len(ids), 1)) for page_id in ids])
+
+        rank, iterations = pagerank(indptr, indices, len(ids), initial)
+
+        tmp_path = self.index_dir / "graph.tmp.npz"
+        np.savez(tmp_path, indptr=indptr, indices=indices, pagerank=rank.astype(np.float32))
+        os.replace(tmp_path, graph_path)
+        self._save_json(OUTLINKS_FILE, outlinks)
+        self._save_json(META_FILE, {"built_at": datetime.now().isoformat(), "ids": ids})
+
+        return {"nodes": len(ids), "edges": int(len(indices)), "iterations": iterations, "recovered": recovered}
+
+
+def load_centrality(cache_dir: Path) -> Dict[str, float]:
+    """
+    페이지별 중심성 (0~1)
+    PageRank를 log 스케일로 정규화해 허브 페이지 몇 개가 점수를 독식하지 않도록 합니다.
+    """
+    index_dir = Path(cache_dir) / INDEX_DIRNAME
+    meta_path = index_dir / META_FILE
+    if np is None or not meta_path.exists() or not (index_dir / GRAPH_FILE).exists():
+        return {}
+
+    with open(meta_path, 'r', encoding='utf-8') as f:
+        ids = json.load(f)['ids']
+    with np.load(index_dir / GRAPH_FILE) as graph:
+        rank = graph['pagerank'].astype(np.float64)
+    if not len(rank):
+        return {}
+
+    scaled = np.log1p(rank * len(rank))
+    top = scaled.max()
+    if top > 0:
+        scaled /= top
+    return dict(zip(ids, scaled.tolist()))
@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+로컬 캐시 검색
+동기화된 cache/ 폴더만으로 검색합니다. 네트워크 요청을 하지 않습니다.
+
+사용법:
+    python local_search.py "검색어"
+    python local_search.py "검색어" --limit 5
+    python local_search.py "검색어" --label design --updated-by 김태현 --since 2025-09   # 패싯 조건
+    python local_search.py --label design --since 30d                                    # 조건만 (최근 수정 순)
+
+검색 기록:
+    검색어와 결과 페이지 ID를 cache/query_log.jsonl에 남깁니다 (sync_scheduler.py가 자주 찾는 페이지를 먼저 동기화).
+
+결과 캐시:
+    같은 프로세스에서 반복되는 질문(query_server.py, 챗봇)은 LRU 캐시에서 바로 돌려줍니다.
+    키 = 정규화한 검색어 + 검색 옵션 + 카탈로그 generation (페이지가 바뀐 동기화마다 1 증가)
+    → 페이지가 바뀐 동기화 직후에만 무효화됩니다. 적중/실패 수는 cache_stats()로 확인합니다.
+"""
+
+import os
+import sys
+import json
+import argparse
+import threading
+import unicodedata
+from collections import OrderedDict, Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, List, Dict
+
+import facets
+import semantic_index
+import link_graph
+
+# Windows 콘솔 UTF-8 출력 설정
+if sys.platform == 'win32':
+    import io
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
+
+CACHE_DIR = Path(__file__).parent / "cache"
+INDEX_FILENAME = "page_index.json"
+
+# 링크 중심성(PageRank) 가중치: 최종 점수 = 유사도 x (1 + PRIOR_WEIGHT x 중심성)
+PRIOR_WEIGHT = 0.2
+
+# 검색 결과 LRU 캐시 최대 항목 수
+RESULT_CACHE_SIZE = 512
+
+# 검색 기록: 이 크기를 넘으면 최근 절반만 남김
+QUERY_LOG_FILE = "query_log.jsonl"
+QUERY_LOG_MAX_BYTES = 5 * 1024 * 1024
+
+
+class SearchCache:
+    """크기 제한 LRU 캐시 (가장 오래 쓰지 않은 항목부터 제거, 스레드 안전)"""
+
+    def __init__(self, max_entries: int = RESULT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+_result_cache = SearchCache()
+# 파일이 바뀌지 않았으면 page_index.json을 다시 파싱하지 않음: {경로: ((mtime_ns, size), catalog)}
+_catalogs = {}
+_log_lock = threading.Lock()
+
+
+class _Indexes:
+    """캐시 폴더 하나의 검색 인덱스 (처음 쓸 때 로드, 카탈로그 generation이 바뀌면 새로 만듦)"""
+
+    def __init__(self, cache_dir: Path):
+        self.cache_dir = cache_dir
+        self._semantic = None
+        self._facets = None
+        self._centrality = None
+
+    @property
+    def semantic(self) -> "semantic_index.SemanticIndex":
+        if self._semantic is None:
+            self._semantic = semantic_index.SemanticIndex(self.cache_dir)
+        return self._semantic
+
+    @property
+    def facets(self) -> facets.FacetIndex:
+        if self._facets is None:
+            self._facets = facets.FacetIndex(self.cache_dir)
+        return self._facets
+
+    @property
+    def centrality(self) -> Dict[str, float]:
+        if self._centrality is None:
+            self._centrality = link_graph.load_centrality(self.cache_dir)
+        return self._centrality
+
+
+# 캐시 폴더별 검색 인덱스: {경로: (generation, _Indexes)} - 같은 generation이면 meta/어휘/비트맵/중심성을 다시 읽지 않음
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def _indexes_for(cache_dir: Path, generation: int) -> _Indexes:
+    key = str(Path(cache_dir).resolve())
+    with _indexes_lock:
+        cached = _indexes.get(key)
+        if cached is None or cached[0] != generation:
+            cached = (generation, _Indexes(Path(cache_dir)))
+            _indexes[key] = cached
+        return cached[1]
+
+
+def normalize_query(query: str) -> str:
+    """캐시 키용 검색어 정규화 (NFC, 소문자, 연속 공백 하나로)"""
+    return " ".join(unicodedata.normalize('NFC', query or '').lower().split())
+
+
+def cache_stats() -> dict:
+    """검색 결과 캐시 적중/실패 통계"""
+    return _result_cache.stats()
+
+
+def log_query(cache_dir: Path, query: str, page_ids: List[str]):
+    """검색 기록 한 줄 추가 (기록 실패는 검색에 영향을 주지 않음)"""
+    path = Path(cache_dir) / QUERY_LOG_FILE
+    line = json.dumps({"at": datetime.now().isoformat(timespec='seconds'), "query": query, "ids": page_ids},
+                      ensure_ascii=False)
+    with _log_lock:
+        try:
+            with open(path, 'a', encoding='utf-8') as f:
+                f.write(line + "\n")
+            if path.stat().st_size > QUERY_LOG_MAX_BYTES:
+                with open(path, 'r', encoding='utf-8') as f:
+                    lines = f.readlines()
+                tmp_path = path.with_suffix('.tmp')
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    f.writelines(lines[len(lines) // 2:])
+                os.replace(tmp_path, path)
+        except OSError:
+            pass
+
+
+def query_counts(cache_dir: Path = CACHE_DIR, since: Optional[str] = None) -> Dict[str, int]:
+    """검색 기록에서 페이지별 결과 등장 횟수 (since: 이 시각 이후 기록만, ISO 문자열 비교)"""
+    path = Path(cache_dir) / QUERY_LOG_FILE
+    counts = Counter()
+    if not path.exists():
+        return counts
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                item = json.loads(line)
+            except ValueError:
+                continue
+            if since and item.get('at', '') < since:
+                continue
+            counts.update(item.get('ids', []))
+    return counts
+
+
+def load_catalog(cache_dir: Path = CACHE_DIR) -> Optional[dict]:
+    """캐시된 page_index.json 로드 (변경되지 않았으면 이전에 읽은 내용 재사용)"""
+    index_file = Path(cache_dir) / INDEX_FILENAME
+    try:
+        stat = index_file.stat()
+    except FileNotFoundError:
+        return None
+    signature = (stat.st_mtime_ns, stat.st_size)
+    cached = _catalogs.get(index_file)
+    if cached and cached[0] == signature:
+        return cached[1]
+    with open(index_file, 'r', encoding='utf-8') as f:
+        catalog = json.load(f)
+    _catalogs[index_file] = (signature, catalog)
+    return catalog
+
+
+def search(query: str, cache_dir: Path = CACHE_DIR, limit: int = 10,
+           collapse_duplicates: bool = True, use_link_prior: bool = True,
+           filters: Optional[Dict[str, List[str]]] = None,
+           since: Optional[str] = None, until: Optional[str] = None, use_cache: bool = True,
+           log: bool = True, pages=None) -> List[Dict]:
+    """
+    시맨틱 인덱스로 캐시된 페이지 검색
+    collapse_duplicates: 유사 중복 페이지는 canonical 페이지 하나로 합침
+    use_link_prior: 링크를 많이 받는 중심 페이지에 가중치 부여
+    filters/since/until: 패싯 조건 ({"label": [...], "updated_by": [...]}, 최종 수정일 범위)
+                         조건에 맞는 페이지 안에서만 순위를 매기며, query가 비어 있으면 최근 수정 순
+    반환: [{"id", "title", "url", "filename", "source", "score", "duplicates"}] (점수 내림차순)
+          source는 "confluence" 또는 "jira" (jira_sync.py로 미러된 이슈)
+    use_cache: 같은 검색어/옵션/generation 결과는 LRU 캐시에서 반환
+    log: 검색어가 있으면 결과 페이지 ID를 query_log.jsonl에 기록 (캐시 적중 포함)
+    pages: 이미 메모리에 있는 카탈로그 (page_catalog.PageCatalog - get(page_id)와 generation 제공)
+           주면 page_index.json을 dict로 따로 읽어 두지 않습니다
+    """
+    if pages is None:
+        catalog = load_catalog(cache_dir)
+        if not catalog:
+            return []
+        generation = catalog.get('generation', 0)
+        pages = {page['id']: page for page in catalog['pages']}
+    else:
+        if not len(pages):
+            return []
+        generation = pages.generation
+
+    key = None
+    results = None
+    if use_cache:
+        key = (str(Path(cache_dir).resolve()), generation, normalize_query(query), limit,
+               collapse_duplicates, use_link_prior,
+               tuple(sorted((facet, tuple(values)) for facet, values in (filters or {}).items() if values)),
+               facets.resolve_date(since), facets.resolve_date(until))
+        cached = _result_cache.get(key)
+        if cached is not None:
+            results = [dict(result) for result in cached]
+
+    if results is None:
+        results = _search(normalize_query(query), _indexes_for(cache_dir, generation), pages, limit,
+                          collapse_duplicates, use_link_prior, filters, since, until)
+        if key is not None:
+            _result_cache.put(key, [dict(result) for result in results])
+    if log and results and query.strip():
+        log_query(cache_dir, query, [result['id'] for result in results])
+    return results
+
+
+def _search(query: str, indexes: _Indexes, pages, limit: int, collapse_duplicates: bool,
+            use_link_prior: bool, filters: Optional[Dict[str, List[str]]],
+            since: Optional[str], until: Optional[str]) -> List[Dict]:
+    """pages: 페이지 ID → 카탈로그 항목 (dict 또는 page_catalog.PageCatalog)"""
+    allowed = None
+    if filters or since or until:
+        allowed = set(indexes.facets.matching_ids(filters, since, until))
+        if not allowed:
+            return []
+
+    if not query or not query.strip():
+        # 조건만 있는 조회: 최근 수정 순
+        candidates = sorted(((page_id, 0.0) for page_id in (allowed or ())),
+                            key=lambda item: pages.get(item[0], {}).get('updated_date') or '', reverse=True)
+        use_link_prior = False
+    else:
+        # 중복 합치기/재정렬로 순위가 바뀔 수 있으므로 넉넉히 가져옴
+        candidates = indexes.semantic.search(query, limit * 3, allowed)
+
+    if use_link_prior:
+        centrality = indexes.centrality
+        candidates = sorted(
+            ((page_id, score * (1 + PRIOR_WEIGHT * centrality.get(page_id, 0.0))) for page_id, score in candidates),
+            key=lambda item: -item[1],
+        )
+
+    results = []
+    by_canonical = {}
+    for page_id, score in candidates:
+        page = pages.get(page_id)
+        if not page:
+            continue
+        if collapse_duplicates:
+            canonical_id = page.get('canonical_id', page_id)
+            if allowed is not None and canonical_id not in allowed:
+                canonical_id = page_id
+            if canonical_id in by_canonical:
+                by_canonical[canonical_id]['duplicates'] += 1
+                continue
+            page = pages.get(canonical_id, page)
+        result = {
+            "id": page['id'],
+            "title": page['title'],
+            "url": page.get('url', ''),
+            "filename": page.get('filename', ''),
+            "source": page.get('source', 'confluence'),
+            "score": round(score, 4),
+            "duplicates": 0,
+        }
+        by_canonical[page['id']] = result
+        results.append(result)
+    return results[:limit]
+
+
+def print_results(query: str, results: List[Dict]):
+    """검색 결과 출력"""
+    print(f"\n🔍 '{query}' 로컬 검색 결과: {len(results)}개\n")
+    for result in results:
+        duplicates = f", 유사 문서 {result['duplicates']}개" if result.get('duplicates') else ""
+        print(f"  - {result['title']} ({result['score']:.3f}{duplicates})")
+        if result['url']:
+            print(f"    {result['url']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Confluence 로컬 캐시 검색')
+    parser.add_argument('query', type=str, nargs='?', default='', help='검색어 (패싯 조건만으로도 조회 가능)')
+    parser.add_argument('--limit', type=int, default=10, help='최대 결과 수 (기본: 10)')
+    facets.add_filter_arguments(parser)
+
+    args = parser.parse_args()
+    filters = facets.filters_from_args(args)
+    if not args.query and not filters and not args.since and not args.until:
+        parser.error("검색어 또는 패싯 조건(--label, --author, --since 등)을 지정하세요.")
+
+    if args.query and not semantic_index.is_available():
+        print("❌ numpy가 설치되어 있지 않습니다: pip install numpy")
+        return
+
+    if not load_catalog():
+        print("❌ 캐시된 데이터가 없습니다. --sync를 먼저 실행하세요.")
+        return
+
+    print_results(args.query, search(args.query, limit=args.limit, filters=filters,
+                                     since=args.since, until=args.until))
+
+
+if __name__ == "__main__":
+    main()
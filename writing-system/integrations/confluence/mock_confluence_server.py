@@ -0,0 +1,466 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+벤치마크/오프라인 테스트용 로컬 Confluence 모의 서버
+sync_confluence.py(REST API v1)와 oauth_confluence.py(API v2)가 사용하는
+엔드포인트만 흉내 내며, 페이지 수/본문 크기/지연/429 응답 비율을 조절할 수 있습니다.
+200 응답에는 ETag를 붙이고, If-None-Match가 일치하면 304(본문 없음)로 응답합니다.
+
+지원 엔드포인트:
+    GET /wiki/rest/api/content                              (v1 목록, expand=body.storage일 때만 본문 포함)
+    GET /wiki/rest/api/content/<id>                         (v1 상세, 본문 포함 조건은 목록과 같음)
+    GET /ex/confluence/<cloud>/wiki/api/v2/spaces           (v2 스페이스 목록)
+    GET /ex/confluence/<cloud>/wiki/api/v2/spaces/<id>/pages (v2 페이지 목록)
+    GET /ex/confluence/<cloud>/wiki/api/v2/pages/<id>       (v2 본문)
+    GET /ex/confluence/<cloud>/wiki/api/v2/spaces/<id>/content/labels (v2 스페이스 라벨 목록)
+    GET /ex/confluence/<cloud>/wiki/api/v2/labels/<id>/pages (v2 라벨별 페이지 목록)
+    GET /ex/confluence/<cloud>/wiki/rest/api/user/bulk      (계정 ID → 표시 이름, v2 작성자용)
+    GET /rest/api/3/search/jql                              (Jira 이슈 검색, --issues N일 때)
+
+사용법:
+    python mock_confluence_server.py --pages 500 --body-kb 8 --port 8099
+    python mock_confluence_server.py --issues 300   # JIRA_BASE_URL=http://127.0.0.1:8099
+"""
+
+import re
+import json
+import hashlib
+import time
+import random
+import argparse
+import threading
+from datetime import datetime, timedelta, timezone
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+from pathlib import Path
+from typing import List, Dict
+
+TITLES_FILE = Path(__file__).resolve().parents[3] / "all_titles.txt"
+
+SPACE_KEY = "AEGIS"
+SPACE_ID = "98765"
+CLOUD_ID = "mock-cloud"
+FIRST_PAGE_ID = 700000000
+FIRST_LABEL_ID = 800000000
+PROJECT_KEY = "AEGIS"
+
+
+def account_id(name: str) -> str:
+    """표시 이름 → 모의 Atlassian 계정 ID (v2 응답은 이름 대신 계정 ID만 줌)"""
+    return "acc-" + hashlib.md5(name.encode('utf-8')).hexdigest()[:12]
+
+
+def load_titles(count: int) -> List[str]:
+    """all_titles.txt의 실제 제목 분포로 페이지 제목 생성 (부족하면 번호를 붙여 반복)"""
+    titles = []
+    if TITLES_FILE.exists():
+        with open(TITLES_FILE, 'r', encoding='utf-8-sig') as f:
+            titles = [line.strip() for line in f if line.strip()]
+    if not titles:
+        titles = [f"Page {i}" for i in range(count)]
+
+    result = []
+    for i in range(count):
+        title = titles[i % len(titles)]
+        result.append(title if i < len(titles) else f"{title} ({i // len(titles) + 1})")
+    return result
+
+
+def make_storage_body(rng: random.Random, titles: List[str], size_bytes: int) -> str:
+    """Confluence storage format과 비슷한 본문 생성 (제목/문단/목록/표/페이지 링크)"""
+    words = ["봇", "사격", "판단", "전투", "AI", "설계", "데이터", "테이블", "정책", "일정",
+             "Unity", "server", "client", "pipeline", "review", "build", "QA", "Jira"]
+    parts = []
+    size = 0
+    while size < size_bytes:
+        kind = rng.random()
+        if kind < 0.1:
+            chunk = f"<h2>{rng.choice(titles)}</h2>"
+        elif kind < 0.5:
+            sentence = " ".join(rng.choice(words) for _ in range(rng.randint(8, 30)))
+            chunk = f"<p>{sentence} <strong>{rng.choice(words)}</strong>&nbsp;&amp; <em>{rng.choice(words)}</em></p>"
+        elif kind < 0.7:
+            items = "".join(f"<li>{rng.choice(words)} {rng.choice(words)}</li>" for _ in range(rng.randint(2, 6)))
+            chunk = f"<ul>{items}</ul>"
+        elif kind < 0.85:
+            header = "".join(f"<th>{rng.choice(words)}</th>" for _ in range(4))
+            rows = "".join(
+                "<tr>" + "".join(f"<td>{rng.randint(0, 999)}</td>" for _ in range(4)) + "</tr>"
+                for _ in range(rng.randint(2, 8))
+            )
+            chunk = f"<table><tbody><tr>{header}</tr>{rows}</tbody></table>"
+        else:
+            target = rng.choice(titles).replace('&', '&amp;').replace('"', '&quot;')
+            chunk = (f'<p><ac:link><ri:page ri:content-title="{target}" ri:space-key="{SPACE_KEY}" />'
+                     f'<ac:plain-text-link-body><![CDATA[{rng.choice(words)}]]></ac:plain-text-link-body></ac:link></p>')
+        parts.append(chunk)
+        size += len(chunk.encode('utf-8'))
+    return "".join(parts)
+
+
+class MockConfluence:
+    """모의 Confluence 서버 (백그라운드 스레드에서 실행)"""
+
+    def __init__(self, pages: int = 200, body_kb: float = 8, latency_ms: float = 0,
+                 rate_429: float = 0.0, seed: int = 0, host: str = "127.0.0.1", port: int = 0,
+                 issues: int = 0):
+        self.latency = latency_ms / 1000
+        self.rate_429 = rate_429
+        self.host = host
+        self.port = port
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+        titles = load_titles(pages)
+        body_rng = random.Random(seed + 1)
+        meta_rng = random.Random(seed + 2)
+        labels = ["design", "spec", "meeting", "guide", "qa", "archive"]
+        authors = ["김태현", "이래관", "박서준", "Mock User"]
+        base_time = datetime(2025, 9, 1, 9, 0, tzinfo=timezone.utc)
+        self.pages = []
+        for i, title in enumerate(titles):
+            self.pages.append({
+                "id": str(FIRST_PAGE_ID + i),
+                "title": title,
+                "version": 1,
+                "body": make_storage_body(body_rng, titles, int(body_kb * 1024)),
+                # 페이지 트리: 각 페이지의 부모는 앞쪽 페이지 (0번이 루트)
+                "parent": str(FIRST_PAGE_ID + (i - 1) // 4) if i else None,
+                "labels": meta_rng.sample(labels, meta_rng.randint(0, 2)),
+                "author": authors[i % len(authors)],
+                "when": (base_time + timedelta(hours=i * 7)).strftime("%Y-%m-%dT%H:%M:%S.000Z"),
+            })
+        self.by_id = {page['id']: page for page in self.pages}
+
+        # Jira 이슈 (updated는 과거 시각부터 분 단위로 흩어 놓음)
+        statuses = ["To Do", "In Progress", "Done"]
+        types = ["Task", "Bug", "Story"]
+        people = ["김태현", "이래관", "박서준", None]
+        issue_time = datetime.now(timezone.utc) - timedelta(days=30)
+        self.issues = []
+        for i in range(issues):
+            self.issues.append({
+                "key": f"{PROJECT_KEY}-{i + 1}",
+                "summary": titles[i % len(titles)] if titles else f"Issue {i + 1}",
+                "status": statuses[i % len(statuses)],
+                "type": types[i % len(types)],
+                "assignee": people[i % len(people)],
+                "updated": issue_time + timedelta(minutes=i),
+            })
+
+        self.requests = {}
+        self.bytes_sent = 0
+        self.throttled = 0
+        self.not_modified = 0
+        self._server = None
+        self._thread = None
+
+    # ------------------------------------------------------------------
+
+    def start(self) -> str:
+        """서버 시작 후 base URL 반환"""
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                mock._handle(self)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self.base_url
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def touch(self, count: int):
+        """앞쪽 count개 페이지의 버전을 올려 증분 동기화 상황을 만듦"""
+        for page in self.pages[:count]:
+            page['version'] += 1
+            page['body'] += f"<p>revision {page['version']}</p>"
+
+    def touch_labels(self, count: int, label: str = "reviewed"):
+        """앞쪽 count개 페이지에 버전을 올리지 않고 라벨 추가 (실제 Confluence처럼 라벨 변경은 버전과 무관)"""
+        for page in self.pages[:count]:
+            if label not in page['labels']:
+                page['labels'].append(label)
+
+    def touch_issues(self, count: int):
+        """앞쪽 count개 이슈를 지금 수정된 것으로 바꿈 (Jira 증분 동기화 확인용)"""
+        now = datetime.now(timezone.utc)
+        for issue in self.issues[:count]:
+            issue['updated'] = now
+            issue['summary'] += " (수정)"
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "requests": sum(self.requests.values()),
+                "requests_by_endpoint": dict(self.requests),
+                "bytes_sent": self.bytes_sent,
+                "throttled": self.throttled,
+                "not_modified": self.not_modified,
+            }
+
+    def reset_stats(self):
+        with self._lock:
+            self.requests = {}
+            self.bytes_sent = 0
+            self.throttled = 0
+            self.not_modified = 0
+
+    # ------------------------------------------------------------------
+
+    def _handle(self, handler: BaseHTTPRequestHandler):
+        parsed = urlparse(handler.path)
+        query = {key: values[0] for key, values in parse_qs(parsed.query).items()}
+        endpoint, payload = self._route(parsed.path, query)
+
+        if self.latency:
+            time.sleep(self.latency)
+
+        with self._lock:
+            self.requests[endpoint] = self.requests.get(endpoint, 0) + 1
+            throttle = payload is not None and self._rng.random() < self.rate_429
+            if throttle:
+                self.throttled += 1
+
+        if throttle:
+            status, body, extra = 429, b'{"message": "Rate limited"}', {"Retry-After": "0"}
+        elif payload is None:
+            status, body, extra = 404, b'{"message": "Not found"}', {}
+        else:
+            body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+            etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+            if handler.headers.get("If-None-Match") == etag:
+                status, body, extra = 304, b'', {"ETag": etag}
+            else:
+                status, extra = 200, {"ETag": etag}
+
+        with self._lock:
+            self.bytes_sent += len(body)
+            if status == 304:
+                self.not_modified += 1
+
+        handler.send_response(status)
+        handler.send_header("Content-Type", "application/json; charset=utf-8")
+        handler.send_header("Content-Length", str(len(body)))
+        for key, value in extra.items():
+            handler.send_header(key, value)
+        handler.end_headers()
+        handler.wfile.write(body)
+
+    def _route(self, path: str, query: Dict[str, str]):
+        if path == "/wiki/rest/api/content":
+            return "v1/content", self._v1_list(query)
+        match = re.fullmatch(r"/wiki/rest/api/content/(\d+)", path)
+        if match:
+            page = self.by_id.get(match.group(1))
+            return "v1/content/{id}", self._v1_page(page, query) if page else None
+
+        if re.fullmatch(r"/ex/confluence/[^/]+/wiki/rest/api/user/bulk", path):
+            return "v1/user/bulk", self._user_bulk(query)
+
+        match = re.fullmatch(r"/ex/confluence/[^/]+/wiki/api/v2(/.*)", path)
+        if match:
+            sub = match.group(1)
+            if sub == "/spaces":
+                return "v2/spaces", self._v2_spaces(query)
+            match = re.fullmatch(r"/spaces/([^/]+)/pages", sub)
+            if match:
+                return "v2/spaces/{id}/pages", self._v2_pages(query) if match.group(1) == SPACE_ID else None
+            match = re.fullmatch(r"/pages/(\d+)", sub)
+            if match:
+                page = self.by_id.get(match.group(1))
+                return "v2/pages/{id}", self._v2_page(page, query) if page else None
+            match = re.fullmatch(r"/spaces/([^/]+)/content/labels", sub)
+            if match:
+                return ("v2/spaces/{id}/content/labels",
+                        self._v2_space_labels(query) if match.group(1) == SPACE_ID else None)
+            match = re.fullmatch(r"/labels/([^/]+)/pages", sub)
+            if match:
+                names = [name for name, label_id in self._label_ids().items() if label_id == match.group(1)]
+                return "v2/labels/{id}/pages", self._v2_label_pages(names[0], query) if names else None
+        if path == "/rest/api/3/search/jql" and self.issues:
+            return "jira/search", self._jira_search(query)
+        return "other", None
+
+    def _jira_search(self, query: Dict[str, str]) -> dict:
+        """project = X [AND updated >= -Nm] ORDER BY updated ASC 만 해석"""
+        items = sorted(self.issues, key=lambda issue: issue['updated'])
+        match = re.search(r"updated >= -(\d+)m", query.get("jql", ""))
+        if match:
+            since = datetime.now(timezone.utc) - timedelta(minutes=int(match.group(1)))
+            items = [issue for issue in items if issue['updated'] >= since]
+        start = int(query.get("nextPageToken", 0))
+        limit = int(query.get("maxResults", 50))
+        chunk = items[start:start + limit]
+        result = {"issues": [self._jira_issue(issue) for issue in chunk], "isLast": start + limit >= len(items)}
+        if not result["isLast"]:
+            result["nextPageToken"] = str(start + limit)
+        return result
+
+    def _jira_issue(self, issue: dict) -> dict:
+        updated = issue['updated'].strftime("%Y-%m-%dT%H:%M:%S.000+0000")
+        description = {"type": "doc", "version": 1, "content": [
+            {"type": "paragraph", "content": [{"type": "text", "text": f"{issue['summary']} 작업 설명"}]},
+            {"type": "bulletList", "content": [{"type": "listItem", "content": [
+                {"type": "paragraph", "content": [{"type": "text", "text": "완료 조건 확인"}]}]}]},
+        ]}
+        return {
+            "id": str(10000 + int(issue['key'].split("-")[1])),
+            "key": issue['key'],
+            "fields": {
+                "summary": issue['summary'],
+                "status": {"name": issue['status']},
+                "issuetype": {"name": issue['type']},
+                "priority": {"name": "Medium"},
+                "assignee": {"displayName": issue['assignee']} if issue['assignee'] else None,
+                "reporter": {"displayName": "Mock User"},
+                "labels": ["mock"],
+                "description": description,
+                "created": "2025-09-01T09:00:00.000+0000",
+                "updated": updated,
+            },
+        }
+
+    def _ancestors(self, page: dict) -> List[dict]:
+        chain = []
+        parent = page['parent']
+        while parent:
+            chain.append({"id": parent, "title": self.by_id[parent]['title']})
+            parent = self.by_id[parent]['parent']
+        return chain[::-1]
+
+    def _labels(self, page: dict) -> dict:
+        results = [{"prefix": "global", "name": name} for name in page['labels']]
+        return {"results": results, "size": len(results)}
+
+    def _v1_page(self, page: dict, query: Dict[str, str]) -> dict:
+        result = {
+            "id": page['id'],
+            "type": "page",
+            "title": page['title'],
+            "version": {"number": page['version'], "when": page['when']},
+            "history": {
+                "createdBy": {"displayName": "Mock User", "email": "mock@example.com"},
+                "createdDate": "2025-09-01T09:00:00.000Z",
+                "lastUpdated": {"by": {"displayName": page['author']}},
+            },
+            "metadata": {"labels": self._labels(page)},
+            "ancestors": self._ancestors(page),
+            "_links": {"webui": f"/spaces/{SPACE_KEY}/pages/{page['id']}"},
+        }
+        # 본문은 expand에 body.storage가 있을 때만 (실제 API와 같음)
+        if "body.storage" in query.get("expand", "").split(","):
+            result["body"] = {"storage": {"value": page['body'], "representation": "storage"}}
+        return result
+
+    def _v1_list(self, query: Dict[str, str]) -> dict:
+        start = int(query.get("start", 0))
+        limit = int(query.get("limit", 25))
+        results = [self._v1_page(page, query) for page in self.pages[start:start + limit]]
+        return {"results": results, "start": start, "limit": limit, "size": len(results)}
+
+    def _cursor_page(self, items: list, query: Dict[str, str], path: str) -> dict:
+        start = int(query.get("cursor", 0))
+        limit = int(query.get("limit", 25))
+        chunk = items[start:start + limit]
+        links = {}
+        if start + limit < len(items):
+            links["next"] = f"{path}?limit={limit}&cursor={start + limit}"
+        return {"results": chunk, "_links": links}
+
+    def _v2_spaces(self, query: Dict[str, str]) -> dict:
+        spaces = [{"id": SPACE_ID, "key": SPACE_KEY, "name": "AEGIS"}]
+        return self._cursor_page(spaces, query, "/wiki/api/v2/spaces")
+
+    def _user_bulk(self, query: Dict[str, str]) -> dict:
+        names = {account_id(name): name for name in {"Mock User"} | {page['author'] for page in self.pages}}
+        results = [{"accountId": key, "displayName": names[key]}
+                   for key in query.get("accountId", "").split(",") if key in names]
+        return {"results": results, "size": len(results)}
+
+    def _v2_authors(self, page: dict) -> dict:
+        return {"authorId": account_id("Mock User"), "ownerId": account_id("Mock User"),
+                "createdAt": "2025-09-01T09:00:00.000Z"}
+
+    def _v2_version(self, page: dict) -> dict:
+        return {"number": page['version'], "createdAt": page['when'], "authorId": account_id(page['author'])}
+
+    def _v2_pages(self, query: Dict[str, str]) -> dict:
+        items = [
+            dict({"id": page['id'], "title": page['title'], "status": "current", "parentId": page['parent'],
+                  "version": self._v2_version(page)}, **self._v2_authors(page))
+            for page in self.pages
+        ]
+        return self._cursor_page(items, query, f"/wiki/api/v2/spaces/{SPACE_ID}/pages")
+
+    def _label_ids(self) -> Dict[str, str]:
+        """스페이스에서 쓰이는 라벨 이름 → 라벨 ID (이름순)"""
+        names = sorted({name for page in self.pages for name in page['labels']})
+        return {name: str(FIRST_LABEL_ID + int(hashlib.md5(name.encode('utf-8')).hexdigest()[:6], 16))
+                for name in names}
+
+    def _v2_space_labels(self, query: Dict[str, str]) -> dict:
+        items = [{"id": label_id, "name": name, "prefix": "global"} for name, label_id in self._label_ids().items()]
+        return self._cursor_page(items, query, f"/wiki/api/v2/spaces/{SPACE_ID}/content/labels")
+
+    def _v2_label_pages(self, name: str, query: Dict[str, str]) -> dict:
+        items = [{"id": page['id'], "title": page['title'], "status": "current",
+                  "version": {"number": page['version'], "createdAt": page['when']}}
+                 for page in self.pages if name in page['labels']]
+        return self._cursor_page(items, query, f"/wiki/api/v2/labels/{self._label_ids()[name]}/pages")
+
+    def _v2_page(self, page: dict, query: Dict[str, str]) -> dict:
+        result = dict({
+            "id": page['id'],
+            "title": page['title'],
+            "version": self._v2_version(page),
+            "body": {"storage": {"value": page['body'], "representation": "storage"}},
+        }, **self._v2_authors(page))
+        if query.get("include-labels") == "true":
+            result["labels"] = self._labels(page)
+        return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='로컬 Confluence 모의 서버')
+    parser.add_argument('--pages', type=int, default=200, help='페이지 수 (기본: 200)')
+    parser.add_argument('--body-kb', type=float, default=8, help='페이지 본문 크기 KB (기본: 8)')
+    parser.add_argument('--latency-ms', type=float, default=0, help='요청당 지연 ms (기본: 0)')
+    parser.add_argument('--rate-429', type=float, default=0.0, help='429 응답 비율 0~1 (기본: 0)')
+    parser.add_argument('--seed', type=int, default=0, help='난수 시드')
+    parser.add_argument('--port', type=int, default=8099, help='포트 (기본: 8099)')
+    parser.add_argument('--issues', type=int, default=0, help='Jira 이슈 수 (기본: 0, Jira 엔드포인트 비활성)')
+
+    args = parser.parse_args()
+
+    mock = MockConfluence(args.pages, args.body_kb, args.latency_ms, args.rate_429, args.seed, port=args.port,
+                          issues=args.issues)
+    base_url = mock.start()
+    print(f"[*] Mock Confluence running: {base_url}  (cloud id: {CLOUD_ID}, space: {SPACE_KEY})")
+    print("    Press Ctrl+C to stop.")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        mock.stop()
+
+
+if __name__ == "__main__":
+    main()
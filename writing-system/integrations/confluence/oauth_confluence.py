@@ -12,9 +12,24 @@ Confluence OAuth 2.0 연동 스크립트
     
     3. 문서 동기화:
        python oauth_confluence.py --sync
+       python oauth_confluence.py --sync --budget 5m   # 우선순위 높은 페이지부터, 5분 안에 (남은 페이지는 다음 동기화)
+    
+    4. 변환기 수정 후 로컬 재변환 (네트워크 없음):
+       python oauth_confluence.py --rebuild
+    
+    5. 캐시 무결성 검사 (손상/누락 페이지만 복구, 고아 파일 삭제):
+       python oauth_confluence.py --verify
+    
+    6. 페이지 변경 내용 보기 (로컬 버전 이력):
+       python oauth_confluence.py --diff <페이지ID> --since 2025-09-01
+    
+    7. 캐시 스냅샷 (새 PC/CI에서 동기화 없이 시작):
+       python oauth_confluence.py --export-snapshot aegis.tar.gz
+       python oauth_confluence.py --import-snapshot aegis.tar.gz
 """
 
 import os
+import sys
 import json
 import webbrowser
 import requests
@@ -24,6 +39,20 @@ from pathlib import Path
 from datetime import datetime
 import base64
 
+import cache_indexes
+import cache_verify
+import facets
+import http_client
+import link_graph
+import page_history
+import page_store
+import raw_store
+import snapshot
+import sync_scheduler
+import table_store
+from sync_metrics import SyncMetrics
+from profiling import ProfileSession
+
 # 설정
 CONFIG_PATH = Path(__file__).parent / "oauth_config.json"
 TOKEN_PATH = Path(__file__).parent / "oauth_token.json"
@@ -35,6 +64,9 @@ AUTH_URL = "https://auth.atlassian.com/authorize"
 TOKEN_URL = "https://auth.atlassian.com/oauth/token"
 API_URL = "https://api.atlassian.com"
 
+# 페이지 본문 요청 파라미터 (동기화와 --verify가 같은 HTTP 캐시 항목을 씀)
+PAGE_BODY_PARAMS = {"body-format": "storage", "include-labels": "true"}
+
 # 콜백 서버 설정 (플랫폼은 SECONDARY_PORT 또는 PORT를 자동 주입)
 CALLBACK_HOST = os.environ.get("CALLBACK_HOST", "localhost")
 CALLBACK_PORT = int(os.environ.get("PORT", "8080"))
@@ -61,6 +93,97 @@ SCOPES = [
 ]
 
 
+def html_to_text(html):
+    """HTML to Text 변환"""
+    import re
+    
+    if not html:
+        return ""
+    
+    text = link_graph.render_page_links(html)
+    text = re.sub(r'<br\s*/?>', '\n', text)
+    text = re.sub(r'<p[^>]*>', '\n', text)
+    text = re.sub(r'</p>', '\n', text)
+    text = re.sub(r'<h([1-6])[^>]*>(.*?)</h\1>', r'\n## \2\n', text)
+    text = re.sub(r'<li[^>]*>', '- ', text)
+    text = re.sub(r'</li>', '\n', text)
+    text = re.sub(r'<[^>]+>', '', text)
+    
+    text = text.replace('&nbsp;', ' ')
+    text = text.replace('&lt;', '<')
+    text = text.replace('&gt;', '>')
+    text = text.replace('&amp;', '&')
+    
+    text = re.sub(r'\n{3,}', '\n\n', text)
+    
+    return text.strip()
+
+
+def render_markdown(entry, body_text):
+    """page_index 항목과 변환된 본문으로 캐시 마크다운 생성"""
+    return f"""# {entry['title']}
+
+> **Page ID**: {entry['id']}
+> **Last Updated**: {entry.get('updated_date') or 'Unknown'}
+
+---
+
+{body_text}
+"""
+
+
+# --rebuild/--verify 출력 문구 (cache_verify.rebuild_cache / verify_cache)
+CACHE_MESSAGES = {
+    "no_index": "[ERROR] No cached index. Please run --sync first.",
+    "unreadable_index": "[ERROR] page_index.json is unreadable ({error}). Run --sync --full.",
+    "rebuild_start": "\n[*] Rebuilding {pages} pages from stored storage bodies...",
+    "rebuild_converted": "[*] {converted} converted ({workers} processes, {seconds:.1f}s)",
+    "rebuild_missing": "[WARN] {missing} pages have no stored body (run --sync --full once)",
+    "page_error": "[WARN] {page_id}: {error}",
+    "index_failed": "[WARN] {name} index update failed: {error}",
+    "index_stats": "[*] {stats}",
+    "rebuild_done": "\n[OK] Rebuild complete! Cache location: {cache_dir}",
+    "verify_start": "\n[*] Verifying {pages} cached pages...",
+    "verify_checked": ("[*] {pages} checked ({seconds:.2f}s): {ok} ok, {broken} broken/missing, "
+                       "{duplicates} duplicate entries, {orphans} orphan files"),
+    "broken_page": "[WARN] {page_id}: {problem}",
+    "hashed": "[*] Recorded sha1 for {hashed} pages without a hash",
+    "repaired": "[*] Repaired: {rebuilt} rebuilt from stored bodies, {fetched} re-fetched, {deleted} deleted upstream",
+    "repair_skipped": "[WARN] {page_id}: Jira issues are repaired by jira_sync.py --sync --full",
+    "repair_failed": "[WARN] {page_id}: repair failed ({error}); the next --sync will fetch it",
+    "removed": "[*] Removed {removed} files not referenced by the catalog",
+    "verify_incomplete": "\n[WARN] Verify complete: {problems} pages could not be repaired. Cache location: {cache_dir}",
+    "verify_done": "\n[OK] Verify complete! Cache location: {cache_dir}",
+}
+
+
+def rebuild_cache(workers=None):
+    """
+    보관된 원본(cache/raw/)으로 마크다운과 인덱스를 다시 생성 (인증/네트워크 불필요)
+    workers: 변환 프로세스 수 (기본: CPU 코어 수)
+    """
+    return cache_verify.rebuild_cache(CACHE_DIR, cache_verify.page_worker(html_to_text, render_markdown),
+                                      CACHE_MESSAGES, workers)
+
+
+def verify_cache(workers=None, offline=False, http_cache=True):
+    """
+    캐시 무결성 검사 후 손상/누락 페이지만 복구 (cache_verify.py)
+    보관된 원본으로 먼저 재변환하고, 원본도 없거나 손상된 페이지만 API v2로 다시 받습니다
+    (인증은 실제로 다시 받을 페이지가 있을 때만 필요).
+    """
+    oauth = None
+    
+    def fetch(entry):
+        nonlocal oauth
+        if oauth is None:
+            oauth = ConfluenceOAuth(offline=offline, http_cache=http_cache)
+        return oauth.fetch_page_body(entry["id"])
+    
+    return cache_verify.verify_cache(CACHE_DIR, cache_verify.page_worker(html_to_text, render_markdown), fetch,
+                                     CACHE_MESSAGES, workers)
+
+
 class OAuthCallbackHandler(BaseHTTPRequestHandler):
     """OAuth 콜백을 처리하는 HTTP 핸들러"""
     
@@ -113,11 +236,16 @@ class OAuthCallbackHandler(BaseHTTPRequestHandler):
 class ConfluenceOAuth:
     """Confluence OAuth 2.0 클라이언트"""
     
-    def __init__(self):
+    def __init__(self, offline=False, http_cache=True):
+        """
+        offline: 네트워크 없이 HTTP 응답 캐시(cache/http/)에서만 읽음 (인증 정보 불필요)
+        http_cache: 응답 캐시 + 조건부 요청(ETag/Last-Modified) 사용 여부
+        """
         self.client_id = os.environ.get("CONFLUENCE_CLIENT_ID")
         self.client_secret = os.environ.get("CONFLUENCE_CLIENT_SECRET")
+        self.offline = offline
         
-        if not self.client_id or not self.client_secret:
+        if not offline and (not self.client_id or not self.client_secret):
             raise ValueError(
                 "환경 변수를 설정해주세요:\n"
                 "  $env:CONFLUENCE_CLIENT_ID = 'your-client-id'\n"
@@ -126,6 +254,9 @@ class ConfluenceOAuth:
             )
         
         self.token = self._load_token()
+        self.metrics = None  # 동기화 중에만 SyncMetrics 할당
+        self.last_metrics = None
+        self.http_cache = http_client.ResponseCache(CACHE_DIR, offline=offline) if (http_cache or offline) else None
         CACHE_DIR.mkdir(parents=True, exist_ok=True)
     
     def _load_token(self):
@@ -263,6 +394,8 @@ class ConfluenceOAuth:
     
     def get_headers(self):
         """API 요청용 헤더"""
+        if self.offline:
+            return {}
         if not self.token:
             raise ValueError("토큰이 없습니다. --auth로 먼저 인증하세요.")
         return {
@@ -270,6 +403,11 @@ class ConfluenceOAuth:
             "Accept": "application/json"
         }
     
+    def _get(self, url, params=None, cacheable=False):
+        """GET 요청 (429/5xx 재시도, cacheable이면 조건부 요청, 동기화 중이면 지표 기록)"""
+        return http_client.get(url, headers=self.get_headers(), params=params, metrics=self.metrics,
+                               cache=self.http_cache, cacheable=cacheable)
+    
     def get_cloud_id(self):
         """저장된 Cloud ID 가져오기"""
         if CONFIG_PATH.exists():
@@ -299,7 +437,7 @@ class ConfluenceOAuth:
             print(f"[*] Trying: {endpoint}")
             
             params = {"limit": 100}
-            response = requests.get(endpoint, headers=self.get_headers(), params=params)
+            response = self._get(endpoint, params)
             
             print(f"    Status: {response.status_code}")
             
@@ -352,12 +490,12 @@ class ConfluenceOAuth:
                 params["cursor"] = cursor
             
             print(f"    Fetching page {page}...")
-            response = requests.get(base_url, headers=self.get_headers(), params=params)
+            response = self._get(base_url, params)
             
             if response.status_code == 401:
                 print("    [WARN] Token expired, refreshing...")
                 self.refresh_token()
-                response = requests.get(base_url, headers=self.get_headers(), params=params)
+                response = self._get(base_url, params)
             
             if response.status_code != 200:
                 print(f"[ERROR] {response.status_code} - {response.text[:200]}")
@@ -434,12 +572,13 @@ class ConfluenceOAuth:
                 params["cursor"] = cursor
             
             print(f"    Fetching page {page_num}...")
-            response = requests.get(url, headers=self.get_headers(), params=params)
+            # 본문이 없는 목록이라 캐시해도 본문을 두 번 저장하지 않음 (오프라인 모드 목록용)
+            response = self._get(url, params, cacheable=True)
             
             if response.status_code == 401:
                 print("[WARN] Token expired, refreshing...")
                 if self.refresh_token():
-                    response = requests.get(url, headers=self.get_headers(), params=params)
+                    response = self._get(url, params, cacheable=True)
                 else:
                     return []
             
@@ -464,6 +603,100 @@ class ConfluenceOAuth:
         
         return all_pages
     
+    def get_page_labels(self, space_key="AEGIS", limit=250):
+        """
+        스페이스 페이지별 라벨 (API v2, 라벨 수 + 1회 내외 요청)
+        라벨만 바뀐 페이지는 버전이 그대로라 본문을 다시 받지 않으므로,
+        스페이스 라벨 목록 → 라벨별 페이지 목록으로 따로 모아 모든 페이지의 라벨을 갱신합니다.
+        반환: {page_id: [라벨 이름 (정렬)]}, 실패하면 None (이전 라벨 유지)
+        """
+        cloud_id = self.get_cloud_id()
+        space_id = self._get_space_id(space_key) if cloud_id else None
+        if not space_id:
+            return None
+        
+        base_url = f"{API_URL}/ex/confluence/{cloud_id}/wiki/api/v2"
+        labels = self._get_results(f"{base_url}/spaces/{space_id}/content/labels", {"limit": limit})
+        if labels is None:
+            return None
+        
+        page_labels = {}
+        for label in labels:
+            pages = self._get_results(f"{base_url}/labels/{label['id']}/pages",
+                                      {"limit": limit, "space-id": space_id})
+            if pages is None:
+                return None
+            for page in pages:
+                page_labels.setdefault(page["id"], []).append(label["name"])
+        return {page_id: sorted(names) for page_id, names in page_labels.items()}
+    
+    @staticmethod
+    def _labels_due(previous_index, settings):
+        """마지막 라벨 전체 조회가 sync.label_refresh_minutes보다 오래됐으면 True"""
+        synced_at = previous_index.get("labels_synced_at")
+        try:
+            age = (datetime.now() - datetime.fromisoformat(synced_at)).total_seconds()
+        except (TypeError, ValueError):
+            return True
+        return age >= float(settings["label_refresh_minutes"]) * 60
+    
+    def get_user_names(self, pages, previous_pages, batch=100):
+        """
+        페이지 작성자/최종 수정자 계정 ID → 표시 이름
+        이전 카탈로그에 기록된 이름은 재사용하고, 처음 보는 계정만 user/bulk로 batch개씩 조회합니다.
+        실패한 계정은 빠지므로 해당 페이지는 이전 작성자 정보를 유지합니다.
+        """
+        names = {}
+        for entry in previous_pages:
+            for key in ("created_by", "updated_by"):
+                if entry.get(f"{key}_id") and entry.get(key):
+                    names[entry[f"{key}_id"]] = entry[key]
+        
+        wanted = set()
+        for page in pages:
+            wanted.update((page.get("authorId"), page.get("ownerId"), page.get("version", {}).get("authorId")))
+        unknown = sorted(account for account in wanted if account and account not in names)
+        
+        url = f"{API_URL}/ex/confluence/{self.get_cloud_id()}/wiki/rest/api/user/bulk"
+        for start in range(0, len(unknown), batch):
+            params = {"accountId": ",".join(unknown[start:start + batch]), "limit": batch}
+            try:
+                response = self._get(url, params)
+                if response.status_code == 401 and self.refresh_token():
+                    response = self._get(url, params)
+            except http_client.OfflineCacheMiss:
+                break
+            if response.status_code != 200:
+                break
+            for user in response.json().get("results", []):
+                if user.get("accountId") and user.get("displayName"):
+                    names[user["accountId"]] = user["displayName"]
+        return names
+    
+    def _get_results(self, url, params):
+        """cursor 기반 v2 목록의 results 전체 (실패하면 None)"""
+        results = []
+        params = dict(params)
+        while True:
+            try:
+                response = self._get(url, params)
+                if response.status_code == 401 and self.refresh_token():
+                    response = self._get(url, params)
+            except http_client.OfflineCacheMiss:
+                # 오프라인 모드에서는 라벨 목록을 캐시하지 않으므로 이전 라벨 유지
+                return None
+            if response.status_code != 200:
+                return None
+            
+            data = response.json()
+            results.extend(data.get("results", []))
+            
+            next_link = data.get("_links", {}).get("next")
+            if next_link and "cursor=" in next_link:
+                params["cursor"] = next_link.split("cursor=")[1].split("&")[0]
+            else:
+                return results
+    
     def _get_space_id(self, space_key):
         """space_key로 space_id 조회"""
         cloud_id = self.get_cloud_id()
@@ -479,11 +712,12 @@ class ConfluenceOAuth:
             if cursor:
                 params["cursor"] = cursor
             
-            response = requests.get(url, headers=self.get_headers(), params=params)
+            # 스페이스 목록도 오프라인 모드에서 쓸 수 있게 캐시
+            response = self._get(url, params, cacheable=True)
             
             if response.status_code == 401:
                 self.refresh_token()
-                response = requests.get(url, headers=self.get_headers(), params=params)
+                response = self._get(url, params, cacheable=True)
             
             if response.status_code != 200:
                 return None
@@ -503,14 +737,48 @@ class ConfluenceOAuth:
         
         return None
     
-    def sync_pages(self, space_key="AEGIS"):
-        """페이지 동기화 (API v2)"""
+    def sync_pages(self, space_key="AEGIS", full=False, metrics_prom=None, budget_seconds=None):
+        """
+        페이지 동기화 (API v2)
+        full: 버전이 같은 페이지도 본문을 다시 가져옴
+        metrics_prom: 실행 지표를 Prometheus text format으로 저장할 경로
+        budget_seconds: 시간 예산 (초과하면 남은 변경 페이지는 이전 내용을 유지하고 다음 동기화로 미룸)
+        본문 요청은 sync_scheduler 우선순위(고정 > 검색 빈도 + 최근 수정) 순으로 보내며,
+        Ctrl+C로 중단해도 그때까지 받은 페이지는 저장합니다.
+        """
         print(f"\n[*] Syncing {space_key} space...")
         
-        pages = self.get_all_pages(space_key)
+        # 이전 동기화 결과 (버전이 같은 페이지는 본문 요청 생략)
+        previous_index = {}
+        if INDEX_FILE.exists():
+            with open(INDEX_FILE, 'r', encoding='utf-8') as f:
+                previous_index = json.load(f)
+        previous = {p["id"]: p for p in previous_index.get("pages", [])}
+        
+        scheduler = sync_scheduler.SyncScheduler(CACHE_DIR, budget_seconds)
+        metrics = self.metrics = SyncMetrics("v2", space_key)
+        try:
+            with metrics.phase("list"):
+                pages = self.get_all_pages(space_key)
+                # 라벨 변경은 버전을 올리지 않으므로 본문을 받지 않는 페이지의 라벨은 전체 조회로 갱신
+                # (요청이 라벨 수만큼 들므로 sync.label_refresh_minutes마다 한 번, --full이면 항상)
+                labels_due = bool(pages) and (full or self._labels_due(previous_index, scheduler.settings))
+                page_labels = self.get_page_labels(space_key) if labels_due else None
+                user_names = self.get_user_names(pages, previous.values()) if pages else {}
+        except KeyboardInterrupt:
+            # 목록을 다 받기 전이면 받은 본문이 없으므로 이전 카탈로그를 그대로 둠
+            scheduler.interrupt()
+            print("\n[WARN] Interrupted while listing pages: previous cache kept")
+            self.metrics = None
+            return
+        scheduler.start()
+        if labels_due and page_labels is None:
+            print("[WARN] Failed to fetch labels: keeping labels from the previous sync for unchanged pages")
+        metrics.pages["total"] = len(pages)
         print(f"[*] Found {len(pages)} pages")
         
         if not pages:
+            self.metrics = None
             return
         
         cloud_id = self.get_cloud_id()
@@ -522,85 +790,223 @@ class ConfluenceOAuth:
             "total_pages": len(pages),
             "pages": []
         }
+        labels_synced_at = datetime.now().isoformat() if page_labels is not None else previous_index.get("labels_synced_at")
+        if labels_synced_at:
+            index["labels_synced_at"] = labels_synced_at
         
-        for i, page in enumerate(pages):
-            page_id = page["id"]
-            title = page.get("title", "Untitled")
-            
-            print(f"  [{i+1}/{len(pages)}] {title}")
-            
+        changed_texts = {}
+        changed_links = {}
+        raw = raw_store.RawStore(CACHE_DIR)
+        store = page_store.PageStore(CACHE_DIR)
+        history = page_history.PageHistory(CACHE_DIR)
+        parents = {p["id"]: p.get("parentId") for p in pages}
+        table_files = table_store.TableStore(CACHE_DIR)
+        entries = {}
+        
+        def author_fields(page):
+            # v2는 작성자를 계정 ID로만 주므로 표시 이름으로 바꿔 기록 (이름을 모르면 이전 값 유지)
+            fields = {}
+            created_id = page.get("authorId") or page.get("ownerId")
+            updated_id = page.get("version", {}).get("authorId") or created_id
+            if created_id in user_names:
+                fields.update(created_by=user_names[created_id], created_by_id=created_id)
+            if updated_id in user_names:
+                fields.update(updated_by=user_names[updated_id], updated_by_id=updated_id)
+            if page.get("createdAt"):
+                fields["created_date"] = page["createdAt"]
+            return fields
+        
+        def listed_fields(page):
+            # 상위 페이지는 목록의 parentId로, 라벨은 라벨별 페이지 목록으로 계산 (본문을 받지 않는 페이지도 갱신)
+            fields = {"ancestors": facets.ancestor_chain(page["id"], parents), **author_fields(page)}
+            if page_labels is not None:
+                fields["labels"] = page_labels.get(page["id"], [])
+            return fields
+        
+        def page_filename(page):
+            safe_title = "".join(c for c in page.get("title", "Untitled") if c.isalnum() or c in (' ', '-', '_')).strip()[:50]
+            return store.filename(f"{page['id']}_{safe_title}.md")
+        
+        def deferred_entry(page):
+            # 본문을 아직 받지 못한 페이지는 목록 정보만 남김 (version이 없어 다음 동기화에서 반드시 받음)
+            prev_entry = previous.get(page["id"])
+            if prev_entry and (CACHE_DIR / prev_entry["filename"]).exists():
+                return dict(prev_entry, **listed_fields(page))
+            return dict({
+                "id": page["id"],
+                "title": page.get("title", "Untitled"),
+                "filename": page_filename(page),
+                "updated_date": page.get("version", {}).get("createdAt", "Unknown"),
+                "version": None,
+                "deferred": True,
+            }, **listed_fields(page))
+        
+        ordered = scheduler.order(pages, lambda page: page.get("version", {}).get("createdAt"))
+        for i, page in enumerate(ordered):
+            # Ctrl+C는 페이지 단위로 받아 남은 변경 페이지를 미루고, 그때까지 받은 결과는 저장
             try:
-                # API v2에서는 body를 별도로 가져와야 함
-                body_url = f"{base_url}/pages/{page_id}?body-format=storage"
-                body_response = requests.get(body_url, headers=self.get_headers())
+                page_id = page["id"]
+                title = page.get("title", "Untitled")
+                version_number = page.get("version", {}).get("number")
+                fields = listed_fields(page)
+                
+                prev_entry = previous.get(page_id)
+                if (not full and prev_entry and version_number is not None and prev_entry.get("version") == version_number
+                        and (CACHE_DIR / prev_entry["filename"]).exists()):
+                    entries[page_id] = dict(prev_entry, **fields)
+                    metrics.count_page("skipped")
+                    continue
+                
+                if scheduler.expired():
+                    # 시간 예산 초과/중단: 이전에 받아 둔 내용은 유지하고 다음 동기화에서 처리
+                    entries[page_id] = deferred_entry(page)
+                    metrics.count_page("deferred")
+                    continue
                 
-                body = ""
-                version_date = "Unknown"
+                print(f"  [{i+1}/{len(pages)}] {title}")
                 
-                if body_response.status_code == 200:
+                try:
+                    # API v2에서는 body를 별도로 가져와야 함
+                    with metrics.phase("fetch"):
+                        body_response = self._get(f"{base_url}/pages/{page_id}", PAGE_BODY_PARAMS,
+                                                  cacheable=True)
+                    
+                    # 본문을 받지 못하면 빈 페이지로 저장하지 않고 실패 처리 (다음 동기화에서 재시도)
+                    if body_response.status_code != 200:
+                        raise RuntimeError(f"body request failed: HTTP {body_response.status_code}")
+                    
                     page_detail = body_response.json()
                     body = page_detail.get("body", {}).get("storage", {}).get("value", "")
                     version_date = page_detail.get("version", {}).get("createdAt", "Unknown")
-                
-                # 파일명 생성
-                safe_title = "".join(c for c in title if c.isalnum() or c in (' ', '-', '_')).strip()[:50]
-                filename = f"{page_id}_{safe_title}.md"
-                filepath = CACHE_DIR / filename
-                
-                # 마크다운 저장
-                md_content = f"""# {title}
-
-> **Page ID**: {page_id}
-> **Last Updated**: {version_date}
-
----
-
-{self._html_to_text(body)}
-"""
-                
-                with open(filepath, 'w', encoding='utf-8') as f:
-                    f.write(md_content)
-                
-                index["pages"].append({
-                    "id": page_id,
-                    "title": title,
-                    "filename": filename
-                })
-                
-            except Exception as e:
-                print(f"    [WARN] Error: {e}")
+                    
+                    # 파일명 생성
+                    filename = page_filename(page)
+                    
+                    with metrics.conversion(page_id, title, len(body)):
+                        body_text = self._html_to_text(body)
+                        page_links = link_graph.extract_page_links(body, space_key)
+                        tables = table_store.extract_tables(body)
+                    
+                    entry = {
+                        "id": page_id,
+                        "title": title,
+                        "filename": filename,
+                        "updated_date": version_date,
+                        "version": version_number,
+                        "labels": sorted(label["name"] for label in page_detail.get("labels", {}).get("results", [])),
+                        "ancestors": fields["ancestors"],
+                        **author_fields(page_detail)
+                    }
+                    
+                    with metrics.phase("write"):
+                        md_content = render_markdown(entry, body_text)
+                        
+                        # 바뀐 페이지는 덮어쓰기 전에 버전 이력에 델타로 남김
+                        if prev_entry:
+                            history.record_change(prev_entry, lambda: store.read(prev_entry["filename"]),
+                                                  entry, md_content)
+                        
+                        # 마크다운 저장
+                        entry["sha1"] = store.write(filename, md_content)
+                        
+                        # 변환기가 바뀌어도 --rebuild로 다시 만들 수 있도록 원본 보관
+                        raw.save(page_id, body)
+                        
+                        # 표는 페이지 ID + 표 번호 단위로 따로 저장 (열 조건 조회용)
+                        page_tables = table_files.save(page_id, tables)
+                        if page_tables:
+                            entry["tables"] = page_tables
+                        
+                        if prev_entry and prev_entry["filename"] != filename:
+                            (CACHE_DIR / prev_entry["filename"]).unlink(missing_ok=True)
+                    
+                    changed_texts[page_id] = f"{title}\n{body_text}"
+                    changed_links[page_id] = page_links
+                    metrics.count_page("changed")
+                    entries[page_id] = entry
+                    
+                except Exception as e:
+                    print(f"    [WARN] Error: {e}")
+                    metrics.count_page("failed")
+                    if prev_entry:
+                        entries[page_id] = prev_entry
+            
+            except KeyboardInterrupt:
+                print("    [WARN] Interrupted: saving pages synced so far")
+                scheduler.interrupt()
+                if page["id"] not in entries:
+                    entries[page["id"]] = deferred_entry(page)
+                    metrics.count_page("deferred")
+        
+        # 카탈로그는 처리 순서와 관계없이 API 목록 순서로 저장
+        index["pages"] = [entries[page["id"]] for page in pages if page["id"] in entries]
+        
+        # jira_sync.py가 같은 카탈로그에 넣은 Jira 이슈는 그대로 유지
+        index["pages"].extend(p for p in previous.values() if p.get("source") == "jira")
         
-        # 인덱스 저장
-        with open(INDEX_FILE, 'w', encoding='utf-8') as f:
-            json.dump(index, f, ensure_ascii=False, indent=2)
+        with metrics.phase("index"):
+            # 압축 저장소 첫 동기화면 공유 사전 학습 후 전체 압축 (filename이 바뀜)
+            store_stats = store.finalize(index)
+            if store_stats:
+                print(f"[*] {page_store.format_stats(store_stats)}")
+            
+            # 검색/중복 인덱스 갱신 (canonical_id 등이 index에 기록됨)
+            for name, stats in cache_indexes.update_cache_indexes(CACHE_DIR, index, changed_texts, changed_links):
+                if isinstance(stats, Exception):
+                    print(f"[WARN] {name} index update failed: {stats}")
+                else:
+                    print(f"[*] {cache_indexes.format_stats(name, stats)}")
+            
+            # 인덱스 저장
+            page_store.save_index(INDEX_FILE, index)
+            
+            raw.prune(p["id"] for p in index["pages"])
+            history.prune(p["id"] for p in index["pages"])
+            table_files.prune(p["id"] for p in index["pages"])
         
-        print(f"\n[OK] Sync complete! {len(index['pages'])} pages saved")
+        print(f"\n[OK] Sync complete! {len(index['pages'])} pages saved ({len(changed_texts)} changed)")
+        deferred = metrics.pages.get("deferred", 0)
+        if deferred:
+            reason = "interrupted" if scheduler.interrupted else f"time budget {budget_seconds:g}s exceeded"
+            print(f"[WARN] {reason}: {deferred} pages deferred to the next sync (previous content kept)")
         print(f"[*] Cache location: {CACHE_DIR}")
+        
+        metrics.extra["schedule"] = scheduler.stats(deferred)
+        metrics.finish()
+        if self.http_cache:
+            metrics.extra["http_cache"] = self.http_cache.stats()
+        report = metrics.write_report(CACHE_DIR)
+        if metrics_prom:
+            metrics.write_prometheus(Path(metrics_prom))
+        phases = ", ".join(f"{name} {seconds:.1f}s" for name, seconds in report["phases_seconds"].items())
+        print(f"[*] {report['duration_seconds']:.1f}s ({phases}) | {report['requests_total']} requests, "
+              f"{report['retries_total']} retries, {report['bytes_downloaded'] / 1e6:.1f} MB")
+        if self.http_cache:
+            cache_stats = self.http_cache.stats()
+            print(f"[*] HTTP cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses"
+                  + (" (offline)" if cache_stats["offline"] else ""))
+        self.last_metrics = metrics
+        self.metrics = None
+    
+    def fetch_page_body(self, page_id):
+        """
+        --verify 복구용 본문 다시 받기 (API v2)
+        반환: (body.storage HTML, page_index 항목에 반영할 버전 필드), 삭제된 페이지(404)면 None
+        """
+        base_url = f"{API_URL}/ex/confluence/{self.get_cloud_id()}/wiki/api/v2"
+        response = self._get(f"{base_url}/pages/{page_id}", PAGE_BODY_PARAMS, cacheable=True)
+        if response.status_code == 404:
+            return None
+        if response.status_code != 200:
+            raise RuntimeError(f"body request failed: HTTP {response.status_code}")
+        page_detail = response.json()
+        version = page_detail.get("version", {})
+        return (page_detail.get("body", {}).get("storage", {}).get("value", ""),
+                {"version": version.get("number"), "updated_date": version.get("createdAt", "Unknown")})
     
     def _html_to_text(self, html):
         """HTML to Text 변환"""
-        import re
-        
-        if not html:
-            return ""
-        
-        text = re.sub(r'<br\s*/?>', '\n', html)
-        text = re.sub(r'<p[^>]*>', '\n', text)
-        text = re.sub(r'</p>', '\n', text)
-        text = re.sub(r'<h([1-6])[^>]*>(.*?)</h\1>', r'\n## \2\n', text)
-        text = re.sub(r'<li[^>]*>', '- ', text)
-        text = re.sub(r'</li>', '\n', text)
-        text = re.sub(r'<[^>]+>', '', text)
-        
-        text = text.replace('&nbsp;', ' ')
-        text = text.replace('&lt;', '<')
-        text = text.replace('&gt;', '>')
-        text = text.replace('&amp;', '&')
-        
-        text = re.sub(r'\n{3,}', '\n\n', text)
-        
-        return text.strip()
-
+        return html_to_text(html)
 
 def main():
     import argparse
@@ -609,14 +1015,69 @@ def main():
     parser.add_argument('--auth', action='store_true', help='OAuth 인증 실행')
     parser.add_argument('--refresh', action='store_true', help='토큰 갱신')
     parser.add_argument('--sync', action='store_true', help='페이지 동기화')
+    parser.add_argument('--full', action='store_true', help='--sync 시 버전이 같은 페이지도 다시 가져오기')
+    parser.add_argument('--metrics-prom', type=str, help='--sync 실행 지표를 Prometheus text format으로 저장할 경로')
+    parser.add_argument('--budget', type=str, help='--sync 시간 예산 (예: 60s, 5m) - 우선순위 높은 페이지부터 처리')
+    parser.add_argument('--profile', action='store_true', help='--sync를 cProfile/tracemalloc으로 프로파일링 (cache/profile/)')
+    parser.add_argument('--offline', action='store_true', help='네트워크 없이 HTTP 응답 캐시만으로 실행')
+    parser.add_argument('--no-http-cache', action='store_true', help='HTTP 응답 캐시/조건부 요청 사용 안 함')
+    parser.add_argument('--rebuild', action='store_true', help='보관된 원본으로 마크다운/인덱스 재생성 (네트워크 불필요)')
+    parser.add_argument('--workers', type=int, help='--rebuild 변환 프로세스 수 / --verify 검사 스레드 수')
+    parser.add_argument('--verify', action='store_true', help='캐시 무결성 검사 (해시/누락/고아 파일) 후 문제 페이지만 복구')
+    parser.add_argument('--export-snapshot', type=str, metavar='PATH', help='캐시/인덱스를 스냅샷(tar.gz)으로 내보내기 (- 는 표준 출력)')
+    parser.add_argument('--import-snapshot', type=str, metavar='PATH', help='스냅샷을 검증 후 캐시로 가져오기 (- 는 표준 입력)')
+    parser.add_argument('--include-raw', action='store_true', help='--export-snapshot에 원본 본문(raw/) 포함')
+    parser.add_argument('--include-history', action='store_true', help='--export-snapshot에 버전 이력(history/) 포함')
+    parser.add_argument('--force', action='store_true', help='--import-snapshot 시 기존 캐시 덮어쓰기')
+    parser.add_argument('--diff', type=str, metavar='PAGE_ID', help='로컬 버전 이력으로 페이지 변경 내용 보기')
+    parser.add_argument('--since', type=str, metavar='DATE', help='--diff 비교 기준 날짜 (예: 2025-09-01, 기본: 직전 버전)')
     parser.add_argument('--spaces', action='store_true', help='스페이스 목록 조회')
     parser.add_argument('--find', type=str, help='스페이스 검색 (키워드)')
     parser.add_argument('--space', type=str, default='AEGIS', help='스페이스 키 (기본: AEGIS)')
     
     args = parser.parse_args()
+    try:
+        budget = sync_scheduler.parse_budget(args.budget)
+    except ValueError as e:
+        parser.error(str(e))
+    
+    if args.rebuild:
+        rebuild_cache(args.workers)
+        return
+    
+    if args.verify:
+        try:
+            verify_cache(args.workers, offline=args.offline, http_cache=not args.no_http_cache)
+        except OSError as e:
+            print(f"\n[ERROR] Verify failed: {e}")
+        return
+    
+    if args.diff:
+        page_history.print_diff(CACHE_DIR, args.diff, args.since)
+        return
+    
+    if args.export_snapshot or args.import_snapshot:
+        # 표준 출력으로 스트리밍할 때는 진행 메시지를 stderr로
+        log = sys.stderr if args.export_snapshot == '-' else sys.stdout
+        try:
+            if args.export_snapshot:
+                result = snapshot.export_snapshot(CACHE_DIR, args.export_snapshot,
+                                                  args.include_raw, args.include_history)
+                print(f"[OK] Snapshot saved: {result['path']} ({result['pages']} pages, {result['files']} files, "
+                      f"{result['bytes'] / 1e6:.1f} MB, {result['seconds']:.1f}s)", file=log)
+                print(f"     sha256 {result['sha256']}", file=log)
+            else:
+                result = snapshot.import_snapshot(CACHE_DIR, args.import_snapshot, args.force)
+                checked = "archive + per-file checksums" if result["verified_archive"] else "per-file checksums"
+                print(f"[OK] Snapshot imported: {result['pages']} pages, {result['files']} files "
+                      f"({checked} verified, {result['seconds']:.1f}s)")
+                print(f"     Snapshot synced at {result['synced_at']}; run --sync to catch up.")
+        except (snapshot.SnapshotError, OSError) as e:
+            print(f"\n[ERROR] Snapshot failed: {e}", file=log)
+        return
     
     try:
-        oauth = ConfluenceOAuth()
+        oauth = ConfluenceOAuth(offline=args.offline, http_cache=not args.no_http_cache)
         
         if args.auth:
             oauth.authorize()
@@ -626,8 +1087,18 @@ def main():
             oauth.list_spaces()
         elif args.find:
             oauth.find_space(args.find)
+        elif args.sync and args.profile:
+            with ProfileSession(CACHE_DIR, "v2") as session:
+                oauth.sync_pages(args.space, full=args.full, metrics_prom=args.metrics_prom, budget_seconds=budget)
+                if oauth.last_metrics:
+                    session.conversions = oauth.last_metrics.conversions
+            print(f"\n[*] Profile saved: {session.out_dir}")
+            for path in session.files:
+                print(f"    - {path.name}")
+            if session.summary():
+                print(f"    {session.summary()}")
         elif args.sync:
-            oauth.sync_pages(args.space)
+            oauth.sync_pages(args.space, full=args.full, metrics_prom=args.metrics_prom, budget_seconds=budget)
         else:
             parser.print_help()
     
@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+캐시 카탈로그 Python API
+page_index.json을 직접 dict로 읽거나 CLI 출력을 파싱하지 않고, 다른 스크립트/서비스에서 import해서 씁니다.
+
+    from page_catalog import PageCatalog
+
+    catalog = PageCatalog()                       # 기본: ./cache
+    page = catalog.get("700000123")               # ID 조회
+    page = catalog.find_title("전투 설계")         # 제목 조회 (대소문자/공백 무시, 같은 제목이면 첫 페이지)
+    for page in catalog.scan({"label": ["design"]}, since="30d"):
+        print(page.title, page.updated_date)
+    for page, score in catalog.search("스킬 쿨타임", limit=5):
+        print(page.title, score, page.body[:200])  # 본문은 처음 접근할 때 읽음
+
+메모리:
+    메타데이터는 __slots__ 레코드(PageRecord)로 보관하고 작성자/라벨/상위 페이지 문자열은 intern해서 공유하며,
+    자주 쓰지 않는 필드(표 목록 등)는 JSON 바이트로 두었다가 접근할 때 풉니다.
+    본문은 처음 접근할 때 page_store로 읽고 최근 BODY_CACHE_SIZE개만 LRU로 유지하므로,
+    서비스가 카탈로그 전체를 계속 올려 두어도 page_index.json을 dict로 들고 있을 때의 1/3 남짓입니다.
+    레코드는 dict처럼 page['title'], page.get('url', '')로도 읽을 수 있습니다 (기존 항목 dict 대체).
+
+갱신:
+    refresh()는 page_index.json의 (mtime, 크기)가 바뀌었을 때만 다시 읽습니다 (서비스는 요청마다 호출).
+
+사용법:
+    python page_catalog.py --stats
+    python page_catalog.py 700000123 --body
+    python page_catalog.py "전투 설계"
+"""
+
+import sys
+import json
+import time
+import argparse
+import threading
+import tracemalloc
+import unicodedata
+from pathlib import Path
+from typing import Optional, List, Dict, Iterator, Tuple
+
+import facets
+import local_search
+import page_store
+import title_index
+
+# Windows 콘솔 UTF-8 출력 설정
+if sys.platform == 'win32':
+    import io
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
+
+CACHE_DIR = Path(__file__).parent / "cache"
+INDEX_FILENAME = "page_index.json"
+BODY_CACHE_SIZE = 32
+
+# 레코드 슬롯으로 보관하는 항목 필드 (나머지는 extra: tables, sha1, Jira 상태 등)
+FIELDS = ("id", "title", "filename", "url", "source", "version", "updated_date", "updated_by",
+          "created_by", "created_date", "labels", "ancestors", "canonical_id")
+_INTERNED = ("source", "updated_by", "created_by")
+
+
+def normalize_title(title: str) -> str:
+    """제목 조회 키 (NFC, 대소문자/연속 공백 무시)"""
+    return " ".join(unicodedata.normalize('NFC', title).casefold().split())
+
+
+class PageRecord:
+    """카탈로그 항목 하나 (읽기 전용, 본문은 body로 지연 로드)"""
+
+    __slots__ = FIELDS + ("_extra", "_catalog")
+
+    def __init__(self, entry: dict, catalog: "PageCatalog"):
+        for name in FIELDS:
+            value = entry.get(name)
+            if name in _INTERNED and isinstance(value, str):
+                value = sys.intern(value)
+            elif name in ("labels", "ancestors"):
+                value = tuple(sys.intern(str(item)) for item in value or ())
+            setattr(self, name, value)
+        if self.source is None:
+            self.source = "confluence"
+        # 자주 쓰지 않는 나머지 필드(표 목록 등)는 dict/list 객체 대신 JSON 바이트로 보관
+        extra = {key: value for key, value in entry.items() if key not in FIELDS}
+        self._extra = json.dumps(extra, ensure_ascii=False, separators=(',', ':')).encode('utf-8') if extra else None
+        self._catalog = catalog
+
+    @property
+    def extra(self) -> dict:
+        """슬롯에 없는 항목 필드 (tables, sha1, Jira status 등) - 접근할 때마다 새 dict"""
+        return json.loads(self._extra) if self._extra else {}
+
+    @property
+    def body(self) -> Optional[str]:
+        """캐시된 마크다운 본문 (처음 접근할 때 읽음, 파일이 없으면 None)"""
+        return self._catalog.body(self.id)
+
+    def get(self, key: str, default=None):
+        """항목 dict와 같은 방식의 조회 (값이 없으면 default)"""
+        if key in FIELDS:
+            value = getattr(self, key)
+            return default if value is None else value
+        return self.extra.get(key, default) if self._extra else default
+
+    def __getitem__(self, key: str):
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+
+    def to_dict(self) -> dict:
+        """page_index.json 항목 형태로 변환"""
+        entry = {}
+        for name in FIELDS:
+            value = getattr(self, name)
+            if value is None or (name == "source" and value == "confluence"):
+                continue
+            entry[name] = list(value) if isinstance(value, tuple) else value
+        entry.update(self.extra)
+        return entry
+
+    def __repr__(self) -> str:
+        return f"PageRecord(id={self.id!r}, title={self.title!r})"
+
+
+class PageCatalog:
+    """page_index.json 위의 읽기 전용 카탈로그 (ID/제목 조회, 조건 스캔, 검색, 본문 지연 로드)"""
+
+    def __init__(self, cache_dir: Path = CACHE_DIR, body_cache_size: int = BODY_CACHE_SIZE):
+        self.cache_dir = Path(cache_dir)
+        self.space_key = None
+        self.synced_at = None
+        self.generation = 0
+        self._signature = None
+        self._records = []
+        self._by_id = {}
+        self._by_title = {}
+        self._facets = None
+        self._titles = None
+        self._lock = threading.Lock()
+        # 본문은 최근 것만 유지 (local_search의 LRU 재사용)
+        self._bodies = local_search.SearchCache(body_cache_size)
+        self._store = page_store.PageStore(self.cache_dir)
+        self.refresh()
+
+    # ------------------------------------------------------------------
+    # 로드
+    # ------------------------------------------------------------------
+
+    def refresh(self) -> bool:
+        """page_index.json이 바뀌었으면 다시 읽기 (다시 읽었으면 True, 파일이 없으면 빈 카탈로그)"""
+        index_file = self.cache_dir / INDEX_FILENAME
+        try:
+            stat = index_file.stat()
+            signature = (stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            signature = None
+        with self._lock:
+            if signature == self._signature:
+                return False
+            index = {}
+            if signature is not None:
+                with open(index_file, 'r', encoding='utf-8') as f:
+                    index = json.load(f)
+            self._load(index)
+            self._signature = signature
+        return True
+
+    def _load(self, index: dict):
+        records = [PageRecord(entry, self) for entry in index.get('pages', [])]
+        by_id = {}
+        by_title = {}
+        for record in records:
+            by_id.setdefault(record.id, record)
+            by_title.setdefault(normalize_title(record.title or ""), record)
+        # 조회 메서드는 지역 변수로 참조를 잡으므로 교체 중에도 이전/새 카탈로그 중 하나로 일관되게 동작
+        self._records, self._by_id, self._by_title = records, by_id, by_title
+        self.space_key = index.get('space_key')
+        self.synced_at = index.get('synced_at')
+        self.generation = index.get('generation', 0)
+        self._facets = None
+        self._titles = None
+        self._bodies.clear()
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __iter__(self) -> Iterator[PageRecord]:
+        return iter(self._records)
+
+    def __contains__(self, page_id: str) -> bool:
+        return page_id in self._by_id
+
+    def __getitem__(self, page_id: str) -> PageRecord:
+        return self._by_id[page_id]
+
+    def get(self, page_id: str, default=None) -> Optional[PageRecord]:
+        """ID로 조회"""
+        return self._by_id.get(page_id, default)
+
+    def find_title(self, title: str) -> Optional[PageRecord]:
+        """제목이 정확히 같은 페이지 (대소문자/공백 무시)"""
+        return self._by_title.get(normalize_title(title))
+
+    def complete(self, text: str, limit: int = 10) -> List[PageRecord]:
+        """입력 중인 제목으로 후보 조회 (title_index.py - 자모/초성 접두어)"""
+        if self._titles is None:
+            self._titles = title_index.TitleIndex(self.cache_dir)
+        by_id = self._by_id
+        return [by_id[result['id']] for result in self._titles.complete(text, limit) if result['id'] in by_id]
+
+    def scan(self, filters: Optional[Dict[str, List[str]]] = None, since: Optional[str] = None,
+             until: Optional[str] = None) -> Iterator[PageRecord]:
+        """
+        조건에 맞는 페이지를 카탈로그 순서대로 하나씩 반환 (조건이 없으면 전체)
+        filters/since/until: local_search.search와 같은 패싯 조건 ({"label": [...], "source": ["jira"]}, '30d')
+        """
+        records = self._records
+        if not (filters or since or until):
+            yield from records
+            return
+        if self._facets is None:
+            self._facets = facets.FacetIndex(self.cache_dir)
+        allowed = set(self._facets.matching_ids(filters, since, until))
+        for record in records:
+            if record.id in allowed:
+                yield record
+
+    def search(self, query: str, limit: int = 10, filters: Optional[Dict[str, List[str]]] = None,
+               since: Optional[str] = None, until: Optional[str] = None,
+               collapse_duplicates: bool = True) -> List[Tuple[PageRecord, float]]:
+        """로컬 검색 (local_search.search, numpy 필요) → [(레코드, 점수)] 점수 내림차순"""
+        results = local_search.search(query, self.cache_dir, limit, collapse_duplicates=collapse_duplicates,
+                                      filters=filters, since=since, until=until, pages=self)
+        by_id = self._by_id
+        return [(by_id[result['id']], result['score']) for result in results if result['id'] in by_id]
+
+    # ------------------------------------------------------------------
+    # 본문
+    # ------------------------------------------------------------------
+
+    def body(self, page_id: str) -> Optional[str]:
+        """페이지 본문 (최근 BODY_CACHE_SIZE개는 메모리에서, 나머지는 캐시 파일에서 읽음)"""
+        text = self._bodies.get(page_id)
+        if text is None:
+            record = self._by_id.get(page_id)
+            if record is None:
+                return None
+            text = self._store.read(record.filename)
+            if text is not None:
+                self._bodies.put(page_id, text)
+        return text
+
+    def iter_bodies(self, records: Optional[Iterator[PageRecord]] = None) -> Iterator[Tuple[PageRecord, str]]:
+        """(레코드, 본문)을 하나씩 반환 (전체 내보내기/재색인용, 본문 LRU를 거치지 않음, 파일 없는 페이지는 제외)"""
+        for record in self._records if records is None else records:
+            text = self._store.read(record.filename)
+            if text is not None:
+                yield record, text
+
+    def stats(self) -> dict:
+        return {
+            "pages": len(self._records),
+            "generation": self.generation,
+            "synced_at": self.synced_at,
+            "body_cache": self._bodies.stats(),
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='캐시 카탈로그 조회 (page_catalog.PageCatalog)')
+    parser.add_argument('page', type=str, nargs='?', help='페이지 ID 또는 제목')
+    parser.add_argument('--body', action='store_true', help='본문도 출력')
+    parser.add_argument('--stats', action='store_true', help='로드 시간과 레코드 메모리 사용량')
+    parser.add_argument('--cache-dir', type=str, default=str(CACHE_DIR), help='캐시 폴더 (기본: ./cache)')
+
+    args = parser.parse_args()
+    if args.stats:
+        tracemalloc.start()
+        start = time.perf_counter()
+        catalog = PageCatalog(Path(args.cache_dir))
+        elapsed = time.perf_counter() - start
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        if not len(catalog):
+            print("❌ 캐시된 데이터가 없습니다. --sync를 먼저 실행하세요.")
+            return
+        print(f"📚 {len(catalog)}개 페이지 (generation {catalog.generation}, 동기화: {catalog.synced_at})")
+        print(f"   로드 {elapsed * 1000:.0f} ms, 상주 메모리 {current / 1e6:.2f} MB "
+              f"(페이지당 {current / len(catalog):.0f} B, 로드 중 최대 {peak / 1e6:.2f} MB)")
+        return
+
+    if not args.page:
+        parser.error("페이지 ID 또는 제목을 지정하세요 (또는 --stats)")
+    catalog = PageCatalog(Path(args.cache_dir))
+    page = catalog.get(args.page) or catalog.find_title(args.page)
+    if page is None:
+        candidates = catalog.complete(args.page, limit=5)
+        print(f"❌ '{args.page}' 페이지가 없습니다." + (" 제목 후보:" if candidates else ""))
+        for candidate in candidates:
+            print(f"  - {candidate.title} (ID: {candidate.id})")
+        return
+
+    print(f"\n📄 {page.title} (ID: {page.id})")
+    for key, value in page.to_dict().items():
+        if key not in ("id", "title"):
+            print(f"   {key}: {value}")
+    if args.body:
+        print()
+        print(page.body or "(본문 파일 없음)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+페이지 버전 이력 (줄 단위 역방향 델타)
+동기화에서 페이지가 바뀔 때마다 최신 내용 전체와, 직전 버전을 복원하는 줄 단위 델타만 보관합니다.
+저장 공간은 (페이지 크기 x 버전 수)가 아니라 수정된 줄의 양에 비례해 늘어납니다.
+
+캐시 구조:
+    cache/history/<페이지ID>.json.gz
+        {"id", "latest": {버전 정보 + "text"}, "deltas": [{버전 정보 + "ops"}, ...]}  # deltas는 최신 → 과거 순
+
+델타 형식: [[시작 줄, 끝 줄, [바꿀 줄들]], ...]
+    한 단계 새 버전의 줄 목록에서 [시작, 끝) 구간을 바꿀 줄들로 바꾸면 이전 버전이 됩니다 (같은 구간은 생략).
+
+사용법:
+    python sync_confluence.py --diff <페이지ID>                     # 직전 버전과 비교
+    python sync_confluence.py --diff <페이지ID> --since 2025-09-01  # 해당 날짜 시점 버전과 비교
+"""
+
+import os
+import gzip
+import json
+import difflib
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, List, Dict, Tuple, Callable, Iterable
+
+HISTORY_DIRNAME = "history"
+
+# 이력 파일 하나에 보관하는 최대 버전 수 (가장 오래된 델타부터 삭제)
+MAX_VERSIONS = 200
+
+
+def line_delta(new_lines: List[str], old_lines: List[str]) -> list:
+    """new_lines → old_lines로 되돌리는 델타"""
+    matcher = difflib.SequenceMatcher(None, new_lines, old_lines, autojunk=False)
+    return [[i1, i2, old_lines[j1:j2]]
+            for tag, i1, i2, j1, j2 in matcher.get_opcodes() if tag != 'equal']
+
+
+def apply_delta(new_lines: List[str], ops: list) -> List[str]:
+    """line_delta 결과로 이전 버전 줄 목록 복원"""
+    result = []
+    position = 0
+    for start, end, lines in ops:
+        result.extend(new_lines[position:start])
+        result.extend(lines)
+        position = end
+    result.extend(new_lines[position:])
+    return result
+
+
+def _version_info(entry: dict) -> dict:
+    return {
+        "version": entry.get("version"),
+        "updated_date": entry.get("updated_date") or "",
+        "recorded_at": datetime.now().isoformat(),
+    }
+
+
+def _label(info: dict) -> str:
+    version = info.get("version")
+    when = info.get("updated_date") or info.get("recorded_at", "")
+    return f"v{version if version is not None else '?'} ({when[:19]})"
+
+
+class PageHistory:
+    """페이지별 버전 이력 저장소 (cache/history/)"""
+
+    def __init__(self, cache_dir: Path):
+        self.dir = Path(cache_dir) / HISTORY_DIRNAME
+
+    def path(self, page_id: str) -> Path:
+        return self.dir / f"{page_id}.json.gz"
+
+    def exists(self, page_id: str) -> bool:
+        return self.path(page_id).exists()
+
+    def load(self, page_id: str) -> Optional[dict]:
+        path = self.path(page_id)
+        if not path.exists():
+            return None
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            return json.load(f)
+
+    def _save(self, page_id: str, data: dict):
+        self.dir.mkdir(parents=True, exist_ok=True)
+        path = self.path(page_id)
+        tmp_path = path.with_name(path.name + '.tmp')
+        with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp_path, path)
+
+    def record(self, entry: dict, text: Optional[str]) -> bool:
+        """
+        page_index 항목의 새 내용 기록 (내용이 같으면 기록하지 않음)
+        이전 최신 버전은 새 내용에 대한 역방향 델타로 바뀝니다.
+        반환: 새 버전을 기록했는지 여부
+        """
+        if text is None:
+            return False
+        page_id = entry["id"]
+        data = self.load(page_id)
+        latest = dict(_version_info(entry), text=text)
+
+        if data is None:
+            data = {"id": page_id, "latest": latest, "deltas": []}
+        else:
+            previous = data["latest"]
+            if previous["text"] == text:
+                return False
+            ops = line_delta(text.splitlines(), previous["text"].splitlines())
+            delta = {key: value for key, value in previous.items() if key != "text"}
+            delta["ops"] = ops
+            data["deltas"] = ([delta] + data["deltas"])[:MAX_VERSIONS - 1]
+            data["latest"] = latest
+
+        self._save(page_id, data)
+        return True
+
+    def record_change(self, prev_entry: dict, load_previous: Callable[[], Optional[str]],
+                      entry: dict, text: str) -> bool:
+        """
+        동기화에서 다시 받은 페이지 기록 (이전 파일을 덮어쓰기 전에 호출)
+        이력이 없는 페이지는 내용이 실제로 바뀐 경우에만 이전 내용을 기준 버전으로 남기므로,
+        한 번도 수정되지 않은 페이지는 이력 파일을 만들지 않습니다.
+        """
+        if not self.exists(entry["id"]):
+            previous_text = load_previous()
+            if previous_text is None or previous_text == text:
+                return False
+            self.record(prev_entry, previous_text)
+        return self.record(entry, text)
+
+    def versions(self, page_id: str) -> List[Tuple[dict, List[str]]]:
+        """[(버전 정보, 줄 목록)] 최신 → 과거 순"""
+        data = self.load(page_id)
+        if data is None:
+            return []
+        latest = data["latest"]
+        lines = latest["text"].splitlines()
+        result = [({key: value for key, value in latest.items() if key != "text"}, lines)]
+        for delta in data["deltas"]:
+            lines = apply_delta(lines, delta["ops"])
+            result.append(({key: value for key, value in delta.items() if key != "ops"}, lines))
+        return result
+
+    def prune(self, keep_ids: Iterable[str]) -> int:
+        """인덱스에 없는 페이지의 이력 삭제 (중단된 쓰기의 .tmp 포함), 삭제 수 반환"""
+        if not self.dir.exists():
+            return 0
+        keep = set(keep_ids)
+        removed = 0
+        for path in self.dir.iterdir():
+            if path.name.endswith(".tmp") or path.name[:-len(".json.gz")] not in keep:
+                path.unlink()
+                removed += 1
+        return removed
+
+    def stats(self) -> dict:
+        """이력 파일 수와 디스크 크기"""
+        if not self.dir.exists():
+            return {"pages": 0, "bytes": 0}
+        files = list(self.dir.glob("*.json.gz"))
+        return {"pages": len(files), "bytes": sum(path.stat().st_size for path in files)}
+
+
+def _content_lines(lines: List[str]) -> List[str]:
+    """제목 줄 + 메타데이터 구분선(---) 이후 본문 (버전/수정일 헤더는 매번 바뀌므로 비교에서 제외)"""
+    if "---" not in lines:
+        return lines
+    return lines[:1] + lines[lines.index("---") + 1:]
+
+
+def diff_page(cache_dir: Path, page_id: str, since: Optional[str] = None) -> Optional[Dict]:
+    """
+    최신 버전과 과거 버전의 unified diff (제목과 본문만 비교, 메타데이터 헤더 제외)
+    since: 날짜(YYYY-MM-DD 또는 ISO 시각). 이 시각 이전의 마지막 버전과 비교하며,
+           없으면 직전 버전과 비교합니다 (시간대는 구분하지 않고 문자열 순서로 비교).
+    반환: {"from", "to", "versions", "diff": [줄], "note"} (이력이 없으면 None)
+    """
+    versions = PageHistory(cache_dir).versions(page_id)
+    if not versions:
+        return None
+
+    latest_info, latest_lines = versions[0]
+    note = ""
+    if len(versions) == 1:
+        base_info, base_lines = versions[0]
+        note = "기록된 이전 버전이 없습니다"
+    elif since:
+        base = next(((info, lines) for info, lines in versions[1:]
+                     if (info.get("updated_date") or info.get("recorded_at", "")) < since), None)
+        if base is None:
+            base = versions[-1]
+            note = f"{since} 이전 버전이 기록되어 있지 않아 가장 오래된 기록과 비교합니다"
+        base_info, base_lines = base
+    else:
+        base_info, base_lines = versions[1]
+
+    diff = list(difflib.unified_diff(_content_lines(base_lines), _content_lines(latest_lines),
+                                     fromfile=_label(base_info), tofile=_label(latest_info), lineterm=''))
+    return {"from": base_info, "to": latest_info, "versions": len(versions), "diff": diff, "note": note}
+
+
+def print_diff(cache_dir: Path, page_id: str, since: Optional[str] = None):
+    """--diff 출력"""
+    result = diff_page(cache_dir, page_id, since)
+    if result is None:
+        print(f"\n❌ {page_id}의 버전 이력이 없습니다. 이력은 동기화에서 페이지가 바뀔 때부터 쌓입니다.")
+        return
+    print(f"\n🕘 {page_id}: {_label(result['from'])} → {_label(result['to'])} (기록된 버전 {result['versions']}개)")
+    if result['note']:
+        print(f"   {result['note']}")
+    if not result['diff']:
+        print("   변경 사항 없음")
+        return
+    print()
+    for line in result['diff']:
+        print(line)
@@ -0,0 +1,458 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+캐시 마크다운 페이지 저장소 (선택적 압축)
+confluence_config.json의 storage.compression(또는 환경 변수 CONFLUENCE_CACHE_COMPRESSION)에 따라
+페이지를 그대로(.md) 또는 압축해서 저장하고, 읽을 때는 확장자를 보고 자동으로 풀어줍니다.
+
+    none  → <ID>_<제목>.md       (기본값, Slack 봇 등 외부 도구가 그대로 읽음)
+    zlib  → <ID>_<제목>.md.z     (표준 라이브러리, 공유 사전 사용)
+    lzma  → <ID>_<제목>.md.xz    (표준 라이브러리, 압축률 우선, 사전 미지원)
+    zstd  → <ID>_<제목>.md.zst   (zstandard 패키지가 있을 때, 학습된 공유 사전 사용)
+
+작은 페이지는 단독으로는 잘 압축되지 않으므로, 코퍼스에서 학습한 공유 사전을
+cache/page_store/dict-<sha1>.bin에 두고 zlib/zstd 압축에 사용합니다 (meta.json이 방식별 현재 사전을 가리킴).
+사전은 방식마다 처음 압축할 때 한 번만 학습합니다. 이미 압축된 페이지가 그 사전에 묶여 있으므로
+같은 방식으로 다시 --compress해도 재학습하지 않고, 다른 방식으로 저장된 페이지만 변환합니다.
+
+사용법:
+    python page_store.py --stats              # 현재 저장소 크기
+    python page_store.py --compress zstd      # 기존 캐시를 zstd로 변환 (page_index.json 갱신)
+    python page_store.py --compress none      # 압축 해제
+"""
+
+import os
+import sys
+import json
+import lzma
+import zlib
+import hashlib
+import argparse
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, List
+
+try:
+    import zstandard
+except ImportError:  # zstd가 없으면 zlib으로 대체
+    zstandard = None
+
+# Windows 콘솔 UTF-8 출력 설정
+if sys.platform == 'win32':
+    import io
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
+
+CONFIG_PATH = Path(__file__).parent / "confluence_config.json"
+CACHE_DIR = Path(__file__).parent / "cache"
+INDEX_FILENAME = "page_index.json"
+
+STORE_DIRNAME = "page_store"
+META_FILE = "meta.json"
+LEGACY_DICT_FILE = "dict.bin"  # 버전 구분 이전 형식 (meta.json의 dictionary_codec 하나만 지원)
+ENV_COMPRESSION = "CONFLUENCE_CACHE_COMPRESSION"
+
+SUFFIXES = {"none": "", "zlib": ".z", "lzma": ".xz", "zstd": ".zst"}
+DICTIONARY_CODECS = ("zlib", "zstd")
+
+# zlib은 32KB 창 밖의 사전 내용을 참조하지 못함
+ZLIB_DICT_SIZE = 32 * 1024
+DEFAULT_DICT_SIZE = 64 * 1024
+MAX_TRAINING_SAMPLES = 2000
+ZLIB_LEVEL = 9
+ZSTD_LEVEL = 9
+LZMA_PRESET = 6
+
+
+def load_storage_config() -> dict:
+    """confluence_config.json의 storage 섹션 로드 (환경 변수가 compression을 덮어씀)"""
+    settings = {"compression": "none", "dictionary_kb": DEFAULT_DICT_SIZE // 1024}
+    try:
+        with open(CONFIG_PATH, 'r', encoding='utf-8') as f:
+            settings.update(json.load(f).get('storage', {}))
+    except (OSError, ValueError):
+        pass
+    if os.environ.get(ENV_COMPRESSION):
+        settings["compression"] = os.environ[ENV_COMPRESSION]
+    return settings
+
+
+def resolve_compression(name: Optional[str]) -> str:
+    """압축 방식 이름 검증 (zstandard가 없으면 zlib으로 대체)"""
+    name = (name or "none").lower()
+    if name not in SUFFIXES:
+        raise ValueError(f"알 수 없는 압축 방식: {name} (none, zlib, lzma, zstd 중 선택)")
+    if name == "zstd" and zstandard is None:
+        return "zlib"
+    return name
+
+
+def codec_of(filename: str) -> str:
+    """파일명 확장자로 압축 방식 판별"""
+    for name, suffix in SUFFIXES.items():
+        if suffix and filename.endswith(".md" + suffix):
+            return name
+    return "none"
+
+
+def base_filename(filename: str) -> str:
+    """압축 확장자를 뗀 .md 파일명"""
+    suffix = SUFFIXES[codec_of(filename)]
+    return filename[:-len(suffix)] if suffix else filename
+
+
+def train_dictionary(samples: List[str], size: int) -> bytes:
+    """
+    여러 페이지에 반복되는 줄(메타데이터 헤더, 템플릿 문구 등)로 원시 사전 생성
+    (문서 빈도 x 길이)가 큰 줄을 고르고, 가장 유용한 줄이 끝에 오도록 배치합니다
+    (zlib/zstd 모두 가까운 위치의 일치를 더 적은 비트로 부호화).
+    """
+    df = Counter()
+    for text in samples:
+        lines = set()
+        for line in text.splitlines():
+            line = line.strip()
+            if len(line) < 4:
+                continue
+            lines.add(line)
+            # "> **Page ID**: 123" 처럼 값만 다른 줄은 앞부분만이라도 공유
+            key, sep, _ = line.partition(': ')
+            if sep and len(key) >= 4:
+                lines.add(key + sep)
+        df.update(lines)
+
+    candidates = sorted(((count * len(line.encode('utf-8')), line) for line, count in df.items() if count >= 2),
+                        reverse=True)
+    chosen = []
+    total = 0
+    for _, line in candidates:
+        data = (line + "\n").encode('utf-8')
+        if total + len(data) > size:
+            continue
+        chosen.append(data)
+        total += len(data)
+    chosen.reverse()
+    return b"".join(chosen)
+
+
+def _upgrade_meta(meta: dict) -> dict:
+    """이전 형식 meta.json(dict.bin 하나)을 방식별 사전 형식으로 읽기"""
+    if "dictionary_codec" not in meta:
+        return meta
+    return {"dictionaries": {meta["dictionary_codec"]: {
+        "file": LEGACY_DICT_FILE,
+        "type": meta.get("dictionary_type", "raw"),
+        "bytes": meta.get("dictionary_bytes", 0),
+        "sha1": meta.get("dictionary_sha1", ""),
+        "samples": meta.get("samples", 0),
+        "trained_at": meta.get("trained_at", ""),
+    }}}
+
+
+class PageStore:
+    """cache/ 폴더의 페이지 마크다운 읽기/쓰기"""
+
+    def __init__(self, cache_dir: Path, compression: Optional[str] = None):
+        self.cache_dir = Path(cache_dir)
+        self.dir = self.cache_dir / STORE_DIRNAME
+        config = load_storage_config()
+        self.compression = resolve_compression(compression or config["compression"])
+        self.dict_size = int(config.get("dictionary_kb", DEFAULT_DICT_SIZE // 1024)) * 1024
+        self._meta = None
+        self._meta_signature = None
+        self._dicts = {}       # 압축 방식 → (sha1, 사전 바이트)
+        self._zstd_dicts = {}  # sha1 → ZstdCompressionDict
+
+    # ------------------------------------------------------------------
+    # 사전
+    # 압축 방식별로 사전을 하나씩 두고, 파일명에 내용 해시를 붙여 버전을 구분합니다 (dict-<sha1>.bin).
+    # 같은 방식의 사전은 다시 학습하지 않으므로 변환이 중간에 끊겨도 기존 페이지는 계속 읽을 수 있고,
+    # 다른 프로세스가 사전을 새로 만들면 meta.json이 바뀐 것을 보고 다시 읽습니다.
+
+    @property
+    def meta(self) -> dict:
+        """meta.json ({"dictionaries": {압축 방식: {"file", "sha1", ...}}}, 파일이 바뀌면 다시 읽음)"""
+        meta_path = self.dir / META_FILE
+        try:
+            stat = meta_path.stat()
+            signature = (stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            signature = None
+        if self._meta is None or signature != self._meta_signature:
+            meta = {}
+            if signature is not None:
+                with open(meta_path, 'r', encoding='utf-8') as f:
+                    meta = json.load(f)
+            self._meta = _upgrade_meta(meta)
+            self._meta_signature = signature
+        return self._meta
+
+    def dictionary_info(self, compression: str) -> Optional[dict]:
+        return self.meta.get("dictionaries", {}).get(compression)
+
+    def has_dictionary(self, compression: str) -> bool:
+        info = self.dictionary_info(compression)
+        return info is not None and (self.dir / info["file"]).exists()
+
+    def dictionary(self, compression: str) -> bytes:
+        """압축 방식의 현재 사전 (meta.json의 sha1이 바뀌었으면 다시 읽음)"""
+        info = self.dictionary_info(compression)
+        if info is None:
+            return b""
+        cached = self._dicts.get(compression)
+        if cached is None or cached[0] != info["sha1"]:
+            dict_path = self.dir / info["file"]
+            cached = (info["sha1"], dict_path.read_bytes() if dict_path.exists() else b"")
+            self._dicts[compression] = cached
+        return cached[1]
+
+    def _zstd_dictionary(self):
+        info = self.dictionary_info("zstd") or {}
+        key = info.get("sha1")
+        if key not in self._zstd_dicts:
+            dict_type = (zstandard.DICT_TYPE_FULLDICT if info.get("type") == "trained"
+                         else zstandard.DICT_TYPE_RAWCONTENT)
+            self._zstd_dicts[key] = zstandard.ZstdCompressionDict(self.dictionary("zstd"), dict_type=dict_type)
+        return self._zstd_dicts[key]
+
+    def train(self, samples: List[str], compression: str) -> dict:
+        """
+        압축 방식의 공유 사전 학습 후 저장 (새 버전 파일 + meta.json 교체)
+        이미 사전이 있는 방식은 convert/finalize에서 다시 학습하지 않습니다 (기존 페이지가 그 사전에 묶여 있음).
+        """
+        dictionary_type = "raw"
+        if compression == "zstd":
+            encoded = [sample.encode('utf-8') for sample in samples]
+            try:
+                data = zstandard.train_dictionary(self.dict_size, encoded).as_bytes()
+                dictionary_type = "trained"
+            except zstandard.ZstdError:
+                # 표본이 너무 적으면 학습이 실패하므로 원시 사전으로 대체
+                data = train_dictionary(samples, self.dict_size)
+        else:
+            data = train_dictionary(samples, min(self.dict_size, ZLIB_DICT_SIZE))
+
+        sha1 = hashlib.sha1(data).hexdigest()
+        info = {
+            "file": f"dict-{sha1[:16]}.bin",
+            "type": dictionary_type,
+            "bytes": len(data),
+            "sha1": sha1,
+            "samples": len(samples),
+            "trained_at": datetime.now().isoformat(),
+        }
+        self.dir.mkdir(parents=True, exist_ok=True)
+        dict_path = self.dir / info["file"]
+        tmp_path = dict_path.with_name(dict_path.name + ".tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, dict_path)
+
+        meta = {"dictionaries": dict(self.meta.get("dictionaries", {}), **{compression: info})}
+        self._write_meta(meta)
+        return info
+
+    def prune_dictionaries(self, keep_codecs) -> int:
+        """keep_codecs에 없는 방식의 사전과 meta.json이 가리키지 않는 사전 파일 삭제, 삭제 파일 수 반환"""
+        dictionaries = {codec: info for codec, info in self.meta.get("dictionaries", {}).items()
+                        if codec in set(keep_codecs)}
+        if dictionaries != self.meta.get("dictionaries", {}):
+            self._write_meta({"dictionaries": dictionaries})
+        keep_files = {info["file"] for info in dictionaries.values()}
+        removed = 0
+        if self.dir.exists():
+            for path in list(self.dir.glob("dict-*.bin")) + [self.dir / LEGACY_DICT_FILE]:
+                if path.exists() and path.name not in keep_files:
+                    path.unlink()
+                    removed += 1
+        return removed
+
+    def _write_meta(self, meta: dict):
+        meta_path = self.dir / META_FILE
+        tmp_path = meta_path.with_name(META_FILE + ".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, meta_path)
+        self._meta = None
+
+    # ------------------------------------------------------------------
+    # 읽기/쓰기
+
+    def filename(self, md_filename: str) -> str:
+        """설정된 압축 방식의 파일명 (사전이 아직 없으면 일단 .md로 저장)"""
+        compression = self.compression
+        if compression in DICTIONARY_CODECS and not self.has_dictionary(compression):
+            compression = "none"
+        return md_filename + SUFFIXES[compression]
+
+    def encode(self, text: str, compression: str) -> bytes:
+        data = text.encode('utf-8')
+        if compression == "zlib":
+            compressor = zlib.compressobj(ZLIB_LEVEL, zdict=self.dictionary("zlib"))
+            return compressor.compress(data) + compressor.flush()
+        if compression == "zstd":
+            return zstandard.ZstdCompressor(level=ZSTD_LEVEL, dict_data=self._zstd_dictionary()).compress(data)
+        if compression == "lzma":
+            return lzma.compress(data, preset=LZMA_PRESET)
+        return data
+
+    def decode(self, data: bytes, compression: str) -> str:
+        if compression == "zlib":
+            decompressor = zlib.decompressobj(zdict=self.dictionary("zlib"))
+            data = decompressor.decompress(data) + decompressor.flush()
+        elif compression == "zstd":
+            data = zstandard.ZstdDecompressor(dict_data=self._zstd_dictionary()).decompress(data)
+        elif compression == "lzma":
+            data = lzma.decompress(data)
+        return data.decode('utf-8')
+
+    def write(self, filename: str, text: str) -> str:
+        """
+        파일명 확장자에 맞게 압축해서 저장 (임시 파일 후 교체)
+        반환: 저장한 바이트의 sha1 (page_index 항목에 기록해 --verify에서 대조)
+        """
+        path = self.cache_dir / filename
+        data = self.encode(text, codec_of(filename))
+        tmp_path = path.with_name(path.name + '.tmp')
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+        return hashlib.sha1(data).hexdigest()
+
+    def read(self, filename: str) -> Optional[str]:
+        """페이지 내용 (압축 여부와 무관, 파일이 없으면 None)"""
+        path = self.cache_dir / filename
+        if not filename or not path.is_file():
+            return None
+        if codec_of(filename) == "none":
+            with open(path, 'r', encoding='utf-8') as f:
+                return f.read()
+        return self.decode(path.read_bytes(), codec_of(filename))
+
+    # ------------------------------------------------------------------
+    # 변환
+
+    def size(self, index: dict) -> int:
+        """page_index.json에 있는 페이지 파일 + 사전의 디스크 크기 (바이트)"""
+        total = sum((self.cache_dir / page['filename']).stat().st_size
+                    for page in index['pages'] if (self.cache_dir / page['filename']).is_file())
+        for codec in {codec_of(page['filename']) for page in index['pages']} & set(DICTIONARY_CODECS):
+            total += len(self.dictionary(codec))
+        return total
+
+    def convert(self, index: dict, compression: Optional[str] = None) -> dict:
+        """
+        다른 방식으로 저장된 페이지만 지정한 방식으로 다시 저장하고 index['pages']의 filename을 갱신
+        zlib/zstd는 그 방식의 사전이 없을 때만 현재 페이지들로 학습합니다 (이미 있으면 그대로 사용).
+        변환이 끝나면 더 이상 쓰지 않는 방식의 사전을 지웁니다. 호출 후 page_index.json을 저장해야 합니다.
+        """
+        compression = resolve_compression(compression or self.compression)
+        pages = [page for page in index['pages'] if (self.cache_dir / page['filename']).is_file()]
+        before = self.size(index)
+        targets = [page for page in pages if codec_of(page['filename']) != compression]
+
+        if compression in DICTIONARY_CODECS and not self.has_dictionary(compression) and pages:
+            step = max(1, len(pages) // MAX_TRAINING_SAMPLES)
+            self.train([self.read(page['filename']) for page in pages[::step]], compression)
+
+        for page in targets:
+            old_name = page['filename']
+            new_name = base_filename(old_name) + SUFFIXES[compression]
+            page['sha1'] = self.write(new_name, self.read(old_name))
+            (self.cache_dir / old_name).unlink(missing_ok=True)
+            page['filename'] = new_name
+
+        self.prune_dictionaries({codec_of(page['filename']) for page in index['pages']})
+        self.compression = compression
+        return {
+            "compression": compression,
+            "pages": len(targets),
+            "bytes_before": before,
+            "bytes_after": self.size(index),
+            "dictionary_bytes": len(self.dictionary(compression)) if compression in DICTIONARY_CODECS else 0,
+        }
+
+    def finalize(self, index: dict) -> Optional[dict]:
+        """
+        동기화 후 호출: 사전이 필요한 압축 방식인데 사전이 없으면 (첫 압축 동기화)
+        이번에 .md로 저장된 페이지로 사전을 학습하고 전체를 압축
+        """
+        if self.compression in DICTIONARY_CODECS and not self.has_dictionary(self.compression) and index['pages']:
+            return self.convert(index)
+        return None
+
+
+_stores = {}
+
+
+def _store(cache_dir: Path) -> PageStore:
+    key = str(Path(cache_dir).resolve())
+    if key not in _stores:
+        _stores[key] = PageStore(cache_dir)
+    return _stores[key]
+
+
+def read_page(cache_dir: Path, filename: str) -> Optional[str]:
+    """캐시 페이지 읽기 (압축 자동 해제)"""
+    return _store(cache_dir).read(filename)
+
+
+def write_page(cache_dir: Path, filename: str, text: str) -> str:
+    """캐시 페이지 쓰기 (파일명 확장자에 맞춰 압축), 저장한 바이트의 sha1 반환"""
+    return _store(cache_dir).write(filename, text)
+
+
+def save_index(index_file: Path, index: dict):
+    """
+    page_index.json 원자적 저장 (임시 파일 작성 후 교체)
+    PageCatalog, query_server 등 상주 프로세스가 반쯤 쓰인 카탈로그를 읽지 않도록 모든 저장 경로에서 사용합니다.
+    """
+    index_file = Path(index_file)
+    tmp_path = index_file.with_name(index_file.name + ".tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(index, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, index_file)
+
+
+def format_stats(stats: dict) -> str:
+    return (f"page store ({stats['compression']}): {stats['pages']} pages, "
+            f"{stats['bytes_before'] / 1e6:.2f} MB -> {stats['bytes_after'] / 1e6:.2f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='캐시 페이지 저장소 압축 관리')
+    parser.add_argument('--compress', choices=sorted(SUFFIXES), help='기존 캐시를 지정한 방식으로 변환')
+    parser.add_argument('--stats', action='store_true', help='저장소 크기와 압축 방식별 페이지 수')
+    parser.add_argument('--cache-dir', type=str, default=str(CACHE_DIR), help='캐시 폴더 (기본: ./cache)')
+
+    args = parser.parse_args()
+    cache_dir = Path(args.cache_dir)
+    index_file = cache_dir / INDEX_FILENAME
+    if not index_file.exists():
+        print("[ERROR] No cached index. Please run --sync first.")
+        return
+    with open(index_file, 'r', encoding='utf-8') as f:
+        index = json.load(f)
+
+    store = PageStore(cache_dir)
+    if args.compress:
+        if args.compress == "zstd" and zstandard is None:
+            print("[WARN] zstandard is not installed; using zlib (pip install zstandard)")
+        stats = store.convert(index, args.compress)
+        save_index(index_file, index)
+        print(f"[OK] {format_stats(stats)}")
+        if stats['compression'] not in ("none", "zlib"):
+            print("[WARN] The Slack bot can only read uncompressed or zlib pages.")
+    elif args.stats:
+        by_codec = Counter(codec_of(page['filename']) for page in index['pages'])
+        print(f"[*] {len(index['pages'])} pages, {store.size(index) / 1e6:.2f} MB on disk")
+        for name, count in sorted(by_codec.items()):
+            print(f"    {name}: {count}")
+        for codec, info in sorted(store.meta.get("dictionaries", {}).items()):
+            print(f"    dictionary: {codec} ({info['type']}), {info['bytes'] / 1024:.1f} KB, "
+                  f"{info['samples']} samples, {info['file']}")
+    else:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
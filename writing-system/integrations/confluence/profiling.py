@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+동기화 프로파일링 (--profile)
+동기화를 cProfile + tracemalloc 아래에서 실행하고 결과를 cache/profile/에 저장합니다.
+
+    <source>_<시각>.pstats        # cProfile 원본 (python -m pstats, snakeviz 등으로 분석)
+    <source>_<시각>_stats.txt     # 누적 시간 상위 함수
+    <source>_<시각>_alloc.txt     # 메모리 할당 상위 위치 (tracemalloc)
+    <source>_<시각>_convert.json  # 페이지별 변환 시간 히스토그램 + 가장 느린 페이지
+"""
+
+import io
+import json
+import pstats
+import cProfile
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, List, Tuple
+
+PROFILE_DIRNAME = "profile"
+TOP_FUNCTIONS = 40
+TOP_ALLOCATIONS = 30
+TRACE_FRAMES = 10
+SLOWEST_PAGES = 20
+
+# 변환 시간 히스토그램 구간 (ms)
+HISTOGRAM_BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+
+def conversion_histogram(samples: List[Tuple[str, str, int, float]]) -> dict:
+    """
+    페이지별 변환 시간 요약
+    samples: [(page_id, title, HTML 바이트, 초)] (SyncMetrics.conversions)
+    """
+    millis = sorted(seconds * 1000 for _, _, _, seconds in samples)
+    buckets = []
+    lower = 0.0
+    for upper in HISTOGRAM_BUCKETS_MS + (float('inf'),):
+        count = sum(1 for value in millis if lower <= value < upper)
+        buckets.append({"le_ms": upper if upper != float('inf') else "+Inf", "count": count})
+        lower = upper
+
+    def percentile(ratio):
+        if not millis:
+            return 0.0
+        return round(millis[min(len(millis) - 1, int(round(ratio * (len(millis) - 1))))], 3)
+
+    slowest = sorted(samples, key=lambda sample: -sample[3])[:SLOWEST_PAGES]
+    return {
+        "pages": len(millis),
+        "total_ms": round(sum(millis), 1),
+        "p50_ms": percentile(0.5),
+        "p95_ms": percentile(0.95),
+        "p99_ms": percentile(0.99),
+        "max_ms": round(millis[-1], 3) if millis else 0.0,
+        "buckets": buckets,
+        "slowest": [
+            {
+                "id": page_id,
+                "title": title,
+                "html_kb": round(nbytes / 1024, 1),
+                "ms": round(seconds * 1000, 3),
+                "ms_per_kb": round(seconds * 1000 / max(nbytes / 1024, 0.001), 3),
+            }
+            for page_id, title, nbytes, seconds in slowest
+        ],
+    }
+
+
+class ProfileSession:
+    """
+    with ProfileSession(cache_dir, "v1") as session:
+        sync.sync_all_pages()
+        session.conversions = sync.last_metrics.conversions
+    """
+
+    def __init__(self, cache_dir: Path, source: str):
+        self.out_dir = Path(cache_dir) / PROFILE_DIRNAME
+        self.prefix = f"{source}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        self.profiler = cProfile.Profile()
+        self.conversions = []
+        self.files = []
+
+    def __enter__(self):
+        tracemalloc.start(TRACE_FRAMES)
+        self.profiler.enable()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.disable()
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        self._write_pstats()
+        self._write_allocations(snapshot, current, peak)
+        self._write_conversions()
+        return False
+
+    def _path(self, suffix: str) -> Path:
+        path = self.out_dir / f"{self.prefix}{suffix}"
+        self.files.append(path)
+        return path
+
+    def _write_pstats(self):
+        self.profiler.dump_stats(str(self._path(".pstats")))
+
+        buffer = io.StringIO()
+        stats = pstats.Stats(self.profiler, stream=buffer)
+        stats.strip_dirs().sort_stats("cumulative").print_stats(TOP_FUNCTIONS)
+        stats.sort_stats("tottime").print_stats(TOP_FUNCTIONS)
+        with open(self._path("_stats.txt"), 'w', encoding='utf-8') as f:
+            f.write(buffer.getvalue())
+
+    def _write_allocations(self, snapshot, current: int, peak: int):
+        snapshot = snapshot.filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ))
+        lines = [
+            f"traced memory: current {current / 1e6:.1f} MB, peak {peak / 1e6:.1f} MB",
+            "",
+            f"Top {TOP_ALLOCATIONS} allocation sites (by line):",
+        ]
+        for i, stat in enumerate(snapshot.statistics("lineno")[:TOP_ALLOCATIONS], 1):
+            frame = stat.traceback[0]
+            lines.append(f"{i:3}. {frame.filename}:{frame.lineno}  {stat.size / 1024:.1f} KB in {stat.count} blocks")
+
+        lines += ["", f"Top {min(10, TOP_ALLOCATIONS)} allocation tracebacks:"]
+        for stat in snapshot.statistics("traceback")[:10]:
+            lines.append(f"\n{stat.size / 1024:.1f} KB in {stat.count} blocks")
+            lines.extend(f"    {line}" for line in stat.traceback.format())
+
+        with open(self._path("_alloc.txt"), 'w', encoding='utf-8') as f:
+            f.write("\n".join(lines) + "\n")
+
+    def _write_conversions(self):
+        with open(self._path("_convert.json"), 'w', encoding='utf-8') as f:
+            json.dump(conversion_histogram(self.conversions), f, ensure_ascii=False, indent=2)
+
+    def summary(self) -> Optional[str]:
+        """가장 느린 변환 페이지 한 줄 요약"""
+        if not self.conversions:
+            return None
+        histogram = conversion_histogram(self.conversions)
+        slowest = histogram['slowest'][0]
+        return (f"convert p50 {histogram['p50_ms']} ms, p95 {histogram['p95_ms']} ms, "
+                f"max {histogram['max_ms']} ms ({slowest['title']}, {slowest['html_kb']} KB)")
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+로컬 캐시 조회 서비스
+웹 앱(ReferencePanel)처럼 입력할 때마다 조회하는 클라이언트를 위해 캐시 인덱스를 메모리에 올려 두고
+HTTP(JSON)로 응답합니다. 네트워크 요청을 하지 않으며, 동기화로 page_index.json이 바뀌면 다시 읽습니다.
+카탈로그는 page_catalog.PageCatalog(__slots__ 레코드)로 상주시킵니다.
+
+엔드포인트:
+    GET /titles?q=전ㅌ&limit=10                       제목 자동완성 (title_index.py)
+    GET /search?q=전투&limit=10&label=design&since=30d 로컬 검색 (local_search.py, 패싯 조건 가능)
+    GET /facets?facet=label                            패싯 값별 문서 수
+    GET /health                                        캐시 상태 (generation, 검색 결과 캐시 통계)
+    GET /metrics                                       검색 결과 캐시 적중/실패 (Prometheus text format)
+
+사용법:
+    python query_server.py                    # http://127.0.0.1:8765
+    python query_server.py --port 9000
+"""
+
+import sys
+import json
+import time
+import argparse
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+from pathlib import Path
+from typing import Optional
+
+import facets
+import local_search
+import page_catalog
+import semantic_index
+import title_index
+
+# Windows 콘솔 UTF-8 출력 설정
+if sys.platform == 'win32':
+    import io
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
+
+CACHE_DIR = Path(__file__).parent / "cache"
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+MAX_LIMIT = 100
+
+
+class QueryService:
+    """캐시 인덱스를 메모리에 유지하고 page_index.json이 바뀌면 다시 로드"""
+
+    def __init__(self, cache_dir: Path = CACHE_DIR):
+        self.cache_dir = Path(cache_dir)
+        self._lock = threading.Lock()
+        self.catalog = page_catalog.PageCatalog(self.cache_dir)
+        self.titles = title_index.TitleIndex(self.cache_dir)
+        self.facets = facets.FacetIndex(self.cache_dir)
+
+    def _refresh(self):
+        with self._lock:
+            if self.catalog.refresh():
+                self.titles = title_index.TitleIndex(self.cache_dir)
+                self.facets = facets.FacetIndex(self.cache_dir)
+
+    def health(self) -> dict:
+        self._refresh()
+        catalog = self.catalog
+        return {
+            "ok": len(catalog) > 0,
+            "pages": len(catalog),
+            "synced_at": catalog.synced_at,
+            "generation": catalog.generation,
+            "search_cache": local_search.cache_stats(),
+            "titles": self.titles.data is not None,
+            "semantic": semantic_index.is_available(),
+        }
+
+    def titles_query(self, text: str, limit: int) -> list:
+        self._refresh()
+        return self.titles.complete(text, limit)
+
+    def search(self, query: str, limit: int, filters: dict, since: Optional[str], until: Optional[str]) -> list:
+        self._refresh()
+        if query.strip() and not semantic_index.is_available():
+            raise RuntimeError("numpy가 설치되어 있지 않습니다: pip install numpy")
+        return local_search.search(query, self.cache_dir, limit, filters=filters, since=since, until=until,
+                                   pages=self.catalog)
+
+    def facet_values(self, facet: str, limit: int) -> list:
+        self._refresh()
+        if facet not in facets.FACETS:
+            raise ValueError(f"알 수 없는 패싯입니다: {facet} (지원: {', '.join(facets.FACETS)})")
+        return [{"value": value, "count": count} for value, count in self.facets.values(facet)[:limit]]
+
+
+def format_prometheus(service: QueryService) -> str:
+    """검색 결과 캐시 지표 (Prometheus text exposition format)"""
+    status = service.health()
+    stats = status['search_cache']
+    lines = [
+        "# HELP confluence_search_cache_hits_total Local search results served from the LRU cache.",
+        "# TYPE confluence_search_cache_hits_total counter",
+        f"confluence_search_cache_hits_total {stats['hits']}",
+        "# HELP confluence_search_cache_misses_total Local searches computed from the index.",
+        "# TYPE confluence_search_cache_misses_total counter",
+        f"confluence_search_cache_misses_total {stats['misses']}",
+        "# HELP confluence_search_cache_evictions_total Entries evicted from the LRU cache.",
+        "# TYPE confluence_search_cache_evictions_total counter",
+        f"confluence_search_cache_evictions_total {stats['evictions']}",
+        "# HELP confluence_search_cache_entries Entries currently in the LRU cache.",
+        "# TYPE confluence_search_cache_entries gauge",
+        f"confluence_search_cache_entries {stats['entries']}",
+        "# HELP confluence_cache_generation Catalog generation (incremented by every sync that changes pages).",
+        "# TYPE confluence_cache_generation gauge",
+        f"confluence_cache_generation {status['generation']}",
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def make_handler(service: QueryService):
+    class QueryHandler(BaseHTTPRequestHandler):
+        """JSON 조회 핸들러"""
+
+        def do_GET(self):
+            parsed = urlparse(self.path)
+            params = parse_qs(parsed.query)
+
+            def param(name: str, default: str = "") -> str:
+                return params.get(name, [default])[0]
+
+            try:
+                limit = max(1, min(int(param('limit', '10')), MAX_LIMIT))
+                start = time.perf_counter()
+                if parsed.path == '/titles':
+                    body = {"results": service.titles_query(param('q'), limit)}
+                elif parsed.path == '/search':
+                    filters = {facet: params[facet] for facet in facets.FACETS if params.get(facet)}
+                    body = {"results": service.search(param('q'), limit, filters,
+                                                      param('since') or None, param('until') or None)}
+                elif parsed.path == '/facets':
+                    body = {"results": service.facet_values(param('facet', 'label'), limit)}
+                elif parsed.path == '/health':
+                    body = service.health()
+                elif parsed.path == '/metrics':
+                    self._send_text(200, format_prometheus(service))
+                    return
+                else:
+                    self._send(404, {"error": f"not found: {parsed.path}"})
+                    return
+                if "results" in body:
+                    body["took_ms"] = round((time.perf_counter() - start) * 1000, 3)
+                self._send(200, body)
+            except ValueError as e:
+                self._send(400, {"error": str(e)})
+            except Exception as e:
+                self._send(500, {"error": str(e)})
+
+        def _send(self, status: int, body: dict):
+            data = json.dumps(body, ensure_ascii=False).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _send_text(self, status: int, text: str):
+            data = text.encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            """요청 로그 출력 안 함"""
+            pass
+
+    return QueryHandler
+
+
+def main():
+    parser = argparse.ArgumentParser(description='로컬 캐시 조회 서비스 (제목 자동완성 / 검색 / 패싯)')
+    parser.add_argument('--host', type=str, default=DEFAULT_HOST, help=f'바인드 주소 (기본: {DEFAULT_HOST})')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help=f'포트 (기본: {DEFAULT_PORT})')
+    parser.add_argument('--cache-dir', type=str, default=str(CACHE_DIR), help='캐시 폴더 (기본: ./cache)')
+
+    args = parser.parse_args()
+    service = QueryService(Path(args.cache_dir))
+    status = service.health()
+    if not status['ok']:
+        print("⚠️ 캐시된 데이터가 없습니다. --sync 후에는 자동으로 다시 읽습니다.")
+    else:
+        print(f"📦 {status['pages']}개 문서 (동기화: {status['synced_at']})")
+
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(service))
+    print(f"🔎 조회 서비스: http://{args.host}:{args.port}  (/titles, /search, /facets, /health, /metrics)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n종료합니다.")
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+원본 storage format 본문 보관 + 로컬 재변환 (--rebuild)
+동기화 시 Confluence에서 받은 body.storage HTML을 압축해 보관하고,
+변환기(_html_to_text, 마크다운 템플릿)가 바뀌면 네트워크 없이 여러 프로세스로 다시 변환합니다.
+
+캐시 구조:
+    cache/raw/<페이지ID>.html.gz   # body.storage 원본 (gzip)
+"""
+
+import os
+import gzip
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Optional, Callable, Iterable
+
+RAW_DIRNAME = "raw"
+COMPRESS_LEVEL = 6
+
+
+class RawStore:
+    """페이지별 원본 본문 저장소"""
+
+    def __init__(self, cache_dir: Path):
+        self.dir = Path(cache_dir) / RAW_DIRNAME
+
+    def path(self, page_id: str) -> Path:
+        return self.dir / f"{page_id}.html.gz"
+
+    def exists(self, page_id: str) -> bool:
+        return self.path(page_id).exists()
+
+    def save(self, page_id: str, html: str):
+        self.dir.mkdir(parents=True, exist_ok=True)
+        path = self.path(page_id)
+        tmp_path = path.with_name(path.name + '.tmp')
+        with gzip.open(tmp_path, 'wb', compresslevel=COMPRESS_LEVEL) as f:
+            f.write(html.encode('utf-8'))
+        os.replace(tmp_path, path)
+
+    def load(self, page_id: str) -> Optional[str]:
+        path = self.path(page_id)
+        if not path.exists():
+            return None
+        with gzip.open(path, 'rb') as f:
+            return f.read().decode('utf-8')
+
+    def prune(self, keep_ids: Iterable[str]) -> int:
+        """인덱스에 없는 페이지의 원본 삭제, 삭제 수 반환"""
+        if not self.dir.exists():
+            return 0
+        keep = set(keep_ids)
+        removed = 0
+        for path in self.dir.glob("*.html.gz"):
+            if path.name[:-len(".html.gz")] not in keep:
+                path.unlink()
+                removed += 1
+        return removed
+
+
+def apply_fields(index: dict, fields: dict):
+    """rebuild_pages 결과의 항목 필드를 page_index에 반영 (빈 값이면 키 삭제)"""
+    for entry in index["pages"]:
+        for key, value in fields.get(entry["id"], {}).items():
+            if value:
+                entry[key] = value
+            else:
+                entry.pop(key, None)
+
+
+def rebuild_pages(cache_dir: Path, index: dict, worker: Callable, workers: Optional[int] = None) -> dict:
+    """
+    보관된 원본으로 모든 Confluence 페이지를 다시 변환 (Jira 이슈 등 다른 출처 항목은 제외)
+    worker: (cache_dir 문자열, space_key, page_index 항목) -> (page_id, 본문 텍스트, 링크 목록, 항목 필드)
+            를 반환하는 모듈 수준 함수 (프로세스 간 전달을 위해 pickle 가능해야 함)
+            항목 필드는 page_index 항목에 다시 기록할 값입니다 (예: {"tables": [...]}).
+            실패 시 (page_id, None, 오류 메시지, None)를 반환합니다.
+    반환: {"converted", "missing", "failed", "workers", "seconds", "texts", "links", "fields", "errors"}
+    """
+    store = RawStore(cache_dir)
+    space_key = index.get("space_key", "")
+    pages = [entry for entry in index["pages"] if entry.get("source", "confluence") == "confluence"]
+    tasks = [(str(cache_dir), space_key, entry) for entry in pages if store.exists(entry["id"])]
+    workers = workers or os.cpu_count() or 1
+
+    start = time.perf_counter()
+    texts, links, fields, errors = {}, {}, {}, {}
+    if tasks:
+        chunksize = max(1, len(tasks) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for page_id, text, result, entry_fields in pool.map(worker, tasks, chunksize=chunksize):
+                if text is None:
+                    errors[page_id] = result
+                else:
+                    texts[page_id] = text
+                    links[page_id] = result
+                    fields[page_id] = entry_fields
+
+    return {
+        "converted": len(texts),
+        "missing": len(pages) - len(tasks),
+        "failed": len(errors),
+        "workers": workers,
+        "seconds": time.perf_counter() - start,
+        "texts": texts,
+        "links": links,
+        "fields": fields,
+        "errors": errors,
+    }
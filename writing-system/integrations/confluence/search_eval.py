@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+로컬 검색 품질/지연 평가 (배치 질의)
+질의 파일(JSONL)을 캐시에 대해 실행해 검색 방식별 recall@k, MRR, 지연 p50/p95/p99를 나란히 비교합니다.
+검색/청킹을 바꿨을 때 답이 좋아졌는지, 빨라지기만 했는지 확인하는 용도입니다.
+
+질의 파일 (한 줄에 하나):
+    {"query": "브랜치 전략", "expected": ["700000123"]}
+    {"query": "Jira 사용 가이드", "expected": ["700000456", "700000457"], "kind": "title"}
+
+검색 방식 (--rankers):
+    keyword      Slack 챗봇 searchRelevantPages 이식 (제목 포함 +10, 본문 등장 수 최대 +5, 단어별 합산)
+    index        local_search.search 기본값 (시맨틱 인덱스 + 유사 중복 합치기 + 링크 중심성)
+    index-plain  시맨틱 인덱스만 (중복 합치기/링크 중심성 없음)
+
+유사 중복으로 합쳐진 결과는 기대 페이지의 canonical 페이지가 나와도 맞은 것으로 봅니다.
+index 방식은 결과 캐시(local_search LRU)와 검색 기록을 끄고 측정합니다.
+
+사용법:
+    python search_eval.py --queries queries.jsonl --k 10
+    python search_eval.py --synthetic                                  # all_titles.txt로 만든 합성 코퍼스 (오프라인)
+    python search_eval.py --synthetic --pages 1900 --save-queries q.jsonl --json eval.json
+"""
+
+import io
+import re
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+import contextlib
+from pathlib import Path
+from typing import List, Dict, Callable
+
+import local_search
+import page_store
+import semantic_index
+
+# Windows 콘솔 UTF-8 출력 설정
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
+
+CACHE_DIR = Path(__file__).parent / "cache"
+RANKERS = ("keyword", "index", "index-plain")
+
+_NUMBERING = re.compile(r'^[\d.\s_\-]+')
+_WORD = re.compile(r'[^\s\[\]()#.,:_/|-]+')
+
+
+def percentile(values: List[float], ratio: float) -> float:
+    """가장 가까운 순위 방식 백분위수"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(ratio * (len(ordered) - 1))))]
+
+
+def load_queries(path: Path) -> List[Dict]:
+    """JSONL 질의 파일 로드 (expected 대신 expected_ids도 허용)"""
+    queries = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            item = json.loads(line)
+            expected = item.get('expected', item.get('expected_ids'))
+            if not item.get('query') or not expected:
+                raise ValueError(f"{path}:{number}: query와 expected가 필요합니다")
+            queries.append({"query": item['query'], "expected": [str(page_id) for page_id in expected],
+                            "kind": item.get('kind', '')})
+    return queries
+
+
+# ----------------------------------------------------------------------
+# 검색 방식
+# ----------------------------------------------------------------------
+
+class KeywordRanker:
+    """
+    Slack 챗봇(chatbot.ts) searchRelevantPages의 점수 계산 이식
+    단어(공백 분리, 2글자 이상)마다 제목에 포함되면 +10, 본문 등장 횟수 min(n, 5)을 더합니다.
+    JS 정규식 대신 문자열 개수 세기를 쓰므로 특수문자가 든 단어만 결과가 다를 수 있습니다.
+    """
+
+    def __init__(self, cache_dir: Path):
+        catalog = local_search.load_catalog(cache_dir) or {"pages": []}
+        self.pages = []
+        for page in catalog['pages']:
+            if page.get('source') == 'jira':
+                continue
+            content = page_store.read_page(cache_dir, page['filename']) or ''
+            self.pages.append((page['id'], page['title'], content))
+
+    def __call__(self, query: str, k: int) -> List[str]:
+        keywords = [keyword for keyword in query.lower().split() if len(keyword) > 1]
+        scored = []
+        for page_id, title, content in self.pages:
+            content_lower = content.lower()
+            title_lower = title.lower()
+            score = 0
+            for keyword in keywords:
+                if keyword in title_lower:
+                    score += 10
+                score += min(content_lower.count(keyword), 5)
+            if score > 0:
+                scored.append((page_id, score))
+        scored.sort(key=lambda item: -item[1])
+        return [page_id for page_id, _ in scored[:k]]
+
+
+def make_ranker(name: str, cache_dir: Path) -> Callable[[str, int], List[str]]:
+    """검색 방식 이름 → (query, k) → 페이지 ID 목록"""
+    if name == "keyword":
+        return KeywordRanker(cache_dir)
+    if name == "index":
+        return lambda query, k: [result['id'] for result in
+                                 local_search.search(query, cache_dir, k, use_cache=False, log=False)]
+    if name == "index-plain":
+        return lambda query, k: [result['id'] for result in
+                                 local_search.search(query, cache_dir, k, collapse_duplicates=False,
+                                                     use_link_prior=False, use_cache=False, log=False)]
+    raise ValueError(f"알 수 없는 검색 방식입니다: {name} (지원: {', '.join(RANKERS)})")
+
+
+# ----------------------------------------------------------------------
+# 평가
+# ----------------------------------------------------------------------
+
+def evaluate(ranker: Callable[[str, int], List[str]], queries: List[Dict], k: int,
+             canonical: Dict[str, str]) -> dict:
+    """
+    질의마다 상위 k개를 받아 recall@k, 역순위(MRR), 지연 측정
+    canonical: 페이지 ID → canonical ID (유사 중복으로 합쳐진 결과도 맞은 것으로 처리)
+    """
+    if queries:
+        ranker(queries[0]['query'], k)  # 인덱스 로드 등 첫 호출 비용은 제외
+
+    recalls, reciprocal_ranks, latencies = [], [], []
+    by_kind = {}
+    for item in queries:
+        start = time.perf_counter()
+        results = ranker(item['query'], k)[:k]
+        latencies.append((time.perf_counter() - start) * 1000)
+
+        ranks = {}
+        for position, page_id in enumerate(results, 1):
+            ranks.setdefault(page_id, position)
+        found = []
+        for expected in item['expected']:
+            candidates = [ranks[page_id] for page_id in (expected, canonical.get(expected, expected)) if page_id in ranks]
+            if candidates:
+                found.append(min(candidates))
+        recall = len(found) / len(item['expected'])
+        reciprocal_rank = 1.0 / min(found) if found else 0.0
+        recalls.append(recall)
+        reciprocal_ranks.append(reciprocal_rank)
+        kind = by_kind.setdefault(item.get('kind') or '-', {"queries": 0, "recall": 0.0, "mrr": 0.0})
+        kind['queries'] += 1
+        kind['recall'] += recall
+        kind['mrr'] += reciprocal_rank
+
+    count = len(queries) or 1
+    return {
+        "queries": len(queries),
+        "recall_at_k": round(sum(recalls) / count, 4),
+        "mrr": round(sum(reciprocal_ranks) / count, 4),
+        "latency_ms": {
+            "mean": round(sum(latencies) / count, 3),
+            "p50": round(percentile(latencies, 0.50), 3),
+            "p95": round(percentile(latencies, 0.95), 3),
+            "p99": round(percentile(latencies, 0.99), 3),
+        },
+        "by_kind": {name: {"queries": value['queries'],
+                           "recall_at_k": round(value['recall'] / value['queries'], 4),
+                           "mrr": round(value['mrr'] / value['queries'], 4)}
+                    for name, value in sorted(by_kind.items())},
+    }
+
+
+def run_evaluation(cache_dir: Path, queries: List[Dict], rankers: List[str], k: int) -> dict:
+    """여러 검색 방식을 같은 질의로 평가"""
+    catalog = local_search.load_catalog(cache_dir) or {"pages": []}
+    canonical = {page['id']: page.get('canonical_id', page['id']) for page in catalog['pages']}
+    results = {}
+    for name in rankers:
+        results[name] = evaluate(make_ranker(name, cache_dir), queries, k, canonical)
+    return {"k": k, "pages": len(catalog['pages']), "queries": len(queries), "rankers": results}
+
+
+# ----------------------------------------------------------------------
+# 합성 코퍼스
+# ----------------------------------------------------------------------
+
+def build_synthetic_cache(cache_dir: Path, pages: int, seed: int = 0):
+    """
+    all_titles.txt 제목으로 모의 서버(mock_confluence_server.py)를 띄우고 v1 동기화로 캐시 생성
+    로컬(127.0.0.1)에서만 통신하므로 네트워크/인증 정보가 필요 없습니다.
+    """
+    from mock_confluence_server import MockConfluence
+    import benchmark_sync
+
+    mock = MockConfluence(pages, body_kb=4, seed=seed)
+    base_url = mock.start()
+    try:
+        _, run = benchmark_sync._prepare_v1(base_url, cache_dir)
+        with contextlib.redirect_stdout(io.StringIO()):
+            run()
+    finally:
+        mock.stop()
+
+
+def _title_words(title: str) -> List[str]:
+    return [word for word in _WORD.findall(_NUMBERING.sub('', title)) if len(word) > 1]
+
+
+def make_synthetic_queries(cache_dir: Path, count: int, seed: int = 0) -> List[Dict]:
+    """
+    캐시된 제목으로 질의 생성 (같은 시드면 같은 질의)
+    kind: title = 제목 그대로, words = 제목 단어 1~2개, prefix = 첫 단어 + 마지막 단어 앞부분 (입력 중)
+    기대 페이지는 제목이 같은 페이지 전체입니다.
+    """
+    catalog = local_search.load_catalog(cache_dir) or {"pages": []}
+    pages = [page for page in catalog['pages'] if page.get('source', 'confluence') == 'confluence']
+    by_title = {}
+    for page in pages:
+        by_title.setdefault(page['title'].strip().lower(), []).append(page['id'])
+
+    rng = random.Random(seed)
+    queries = []
+    for page in rng.sample(pages, min(count, len(pages))):
+        words = _title_words(page['title'])
+        kind = rng.choice(("title", "words", "prefix")) if words else "title"
+        if kind == "words":
+            start = rng.randrange(len(words))
+            query = " ".join(words[start:start + rng.randint(1, 2)])
+        elif kind == "prefix" and len(words) > 1:
+            last = words[-1]
+            query = f"{words[0]} {last[:max(2, len(last) - 1)]}"
+        else:
+            kind, query = "title", page['title']
+        queries.append({"query": query, "expected": by_title[page['title'].strip().lower()], "kind": kind})
+    return queries
+
+
+def print_report(report: dict):
+    k = report['k']
+    print(f"\n📊 {report['queries']}개 질의, 문서 {report['pages']}개, k={k}\n")
+    print(f"{'ranker':12} {f'recall@{k}':>10} {'MRR':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for name, result in report['rankers'].items():
+        latency = result['latency_ms']
+        print(f"{name:12} {result['recall_at_k']:10.3f} {result['mrr']:7.3f} "
+              f"{latency['p50']:8.2f} {latency['p95']:8.2f} {latency['p99']:8.2f}")
+
+    kinds = sorted({kind for result in report['rankers'].values() for kind in result['by_kind']})
+    if len(kinds) > 1:
+        print(f"\n{'ranker':12} {'kind':8} {'queries':>8} {f'recall@{k}':>10} {'MRR':>7}")
+        for name, result in report['rankers'].items():
+            for kind in kinds:
+                item = result['by_kind'].get(kind)
+                if item:
+                    print(f"{name:12} {kind:8} {item['queries']:8d} {item['recall_at_k']:10.3f} {item['mrr']:7.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='로컬 검색 배치 평가 (recall@k, MRR, 지연)')
+    parser.add_argument('--queries', type=str, help='질의 파일 (JSONL: query, expected)')
+    parser.add_argument('--synthetic', action='store_true', help='all_titles.txt로 합성 코퍼스/질의를 만들어 평가 (오프라인)')
+    parser.add_argument('--pages', type=int, default=500, help='--synthetic 페이지 수 (기본: 500)')
+    parser.add_argument('--count', type=int, default=200, help='--synthetic 질의 수 (기본: 200)')
+    parser.add_argument('--seed', type=int, default=0, help='--synthetic 난수 시드 (기본: 0)')
+    parser.add_argument('--save-queries', type=str, metavar='PATH', help='생성한 합성 질의를 JSONL로 저장')
+    parser.add_argument('--rankers', type=str, default="keyword,index",
+                        help=f'비교할 검색 방식 (쉼표 구분, 기본: keyword,index / 지원: {", ".join(RANKERS)})')
+    parser.add_argument('--k', type=int, default=10, help='상위 k개 (기본: 10)')
+    parser.add_argument('--json', type=str, help='결과를 JSON 파일로 저장')
+    parser.add_argument('--cache-dir', type=str, default=str(CACHE_DIR), help='캐시 폴더 (기본: ./cache)')
+
+    args = parser.parse_args()
+    rankers = [name.strip() for name in args.rankers.split(',') if name.strip()]
+    unknown = [name for name in rankers if name not in RANKERS]
+    if unknown:
+        parser.error(f"알 수 없는 검색 방식: {', '.join(unknown)} (지원: {', '.join(RANKERS)})")
+    if not args.queries and not args.synthetic:
+        parser.error("--queries 또는 --synthetic을 지정하세요.")
+    if any(name.startswith("index") for name in rankers) and not semantic_index.is_available():
+        print("❌ index 방식에는 numpy가 필요합니다: pip install numpy")
+        return
+
+    with tempfile.TemporaryDirectory(prefix="search_eval_") as tmp:
+        if args.synthetic:
+            cache_dir = Path(tmp) / "cache"
+            cache_dir.mkdir()
+            print(f"🧪 합성 코퍼스 생성 중... ({args.pages}개 페이지, all_titles.txt)")
+            build_synthetic_cache(cache_dir, args.pages, args.seed)
+        else:
+            cache_dir = Path(args.cache_dir)
+            if not local_search.load_catalog(cache_dir):
+                print("❌ 캐시된 데이터가 없습니다. --sync를 먼저 실행하거나 --synthetic을 사용하세요.")
+                return
+
+        if args.queries:
+            queries = load_queries(Path(args.queries))
+        else:
+            queries = make_synthetic_queries(cache_dir, args.count, args.seed)
+        if args.save_queries:
+            with open(args.save_queries, 'w', encoding='utf-8') as f:
+                for item in queries:
+                    f.write(json.dumps(item, ensure_ascii=False) + "\n")
+            print(f"📝 질의 저장: {args.save_queries}")
+
+        report = run_evaluation(cache_dir, queries, rankers, args.k)
+
+    print_report(report)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n📄 결과 저장: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Confluence 캐시 시맨틱 인덱스
+동기화 시점에 페이지별 TF-IDF 벡터(선택적으로 LSA 축소)를 계산해
+memory-mapped float32 행렬로 저장합니다. 네트워크나 GPU 없이 NumPy만 사용합니다.
+
+저장 구조:
+    cache/semantic/
+    ├── meta.json        # 페이지 ID 순서, 어휘, IDF, 설정
+    ├── terms.json       # 페이지별 해시와 단어 빈도 (증분 갱신용)
+    ├── vectors.f32      # (페이지 수 x 차원) float32 행렬 (memmap)
+    └── components.npy   # LSA 사용 시 투영 행렬 (어휘 수 x 차원)
+"""
+
+import os
+import re
+import json
+import math
+import hashlib
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, List, Dict, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # numpy가 없으면 시맨틱 인덱스를 건너뜀
+    np = None
+
+import page_store
+
+CONFIG_PATH = Path(__file__).parent / "confluence_config.json"
+
+INDEX_DIRNAME = "semantic"
+META_FILE = "meta.json"
+TERMS_FILE = "terms.json"
+MATRIX_FILE = "vectors.f32"
+COMPONENTS_FILE = "components.npy"
+
+DEFAULT_MAX_FEATURES = 4096
+DEFAULT_LSA_COMPONENTS = 0
+# 변경된 페이지 비율이 이 값을 넘으면 어휘/IDF를 다시 학습
+REFIT_RATIO = 0.2
+# 이 비율 이상의 문서에 등장하는 단어는 불용어로 보고 어휘에서 제외
+MAX_DF_RATIO = 0.8
+# 제목 단어 가중치: 제목 토큰을 본문에 이 횟수만큼 더 나온 것으로 계산 (긴 본문에 제목이 묻히지 않도록)
+TITLE_WEIGHT = 5
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+|[가-힣]+')
+
+
+def is_available() -> bool:
+    """NumPy 사용 가능 여부"""
+    return np is not None
+
+
+def load_search_config() -> dict:
+    """confluence_config.json의 search 섹션 로드 (없으면 기본값)"""
+    settings = {
+        "semantic_index": True,
+        "max_features": DEFAULT_MAX_FEATURES,
+        "lsa_components": DEFAULT_LSA_COMPONENTS,
+    }
+    try:
+        with open(CONFIG_PATH, 'r', encoding='utf-8') as f:
+            settings.update(json.load(f).get('search', {}))
+    except (OSError, ValueError):
+        pass
+    return settings
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    검색용 토큰 분리
+    영문/숫자는 단어 단위, 한글은 단어 + 음절 bigram으로 분리해
+    조사가 붙거나 일부만 일치하는 표현도 매칭되도록 합니다.
+    """
+    tokens = []
+    for word in TOKEN_PATTERN.findall(text.lower()):
+        if '가' <= word[0] <= '힣':
+            tokens.append(word)
+            if len(word) > 2:
+                tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+        elif len(word) > 1:
+            tokens.append(word)
+    return tokens
+
+
+def document_terms(text: str) -> Counter:
+    """제목 + 본문 텍스트(첫 줄이 제목)의 단어 빈도, 제목 단어는 TITLE_WEIGHT배"""
+    title, _, body = text.partition('\n')
+    tf = Counter(tokenize(body))
+    for term in tokenize(title):
+        tf[term] += TITLE_WEIGHT
+    return tf
+
+
+def page_text_from_markdown(md_content: str) -> str:
+    """캐시 마크다운에서 메타데이터 블록을 제외한 제목 + 본문 추출"""
+    title, _, rest = md_content.partition('\n')
+    _, sep, body = rest.partition('\n---\n')
+    return f"{title.lstrip('# ')}\n{body if sep else rest}"
+
+
+def read_page_text(cache_dir: Path, page: Dict) -> Optional[str]:
+    """page_index.json 항목의 캐시 마크다운을 읽어 제목 + 본문 반환 (파일 없으면 None)"""
+    content = page_store.read_page(cache_dir, page.get('filename', ''))
+    if content is None:
+        return None
+    return page_text_from_markdown(content)
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+class SemanticIndex:
+    """TF-IDF/LSA 벡터 인덱스 (cache/semantic/)"""
+
+    def __init__(self, cache_dir: Path, max_features: Optional[int] = None,
+                 lsa_components: Optional[int] = None):
+        if np is None:
+            raise ImportError("시맨틱 인덱스에는 numpy가 필요합니다: pip install numpy")
+
+        settings = load_search_config()
+        self.cache_dir = Path(cache_dir)
+        self.index_dir = self.cache_dir / INDEX_DIRNAME
+        self.max_features = int(max_features or settings['max_features'])
+        self.lsa_components = int(settings['lsa_components'] if lsa_components is None else lsa_components)
+
+        self.meta = self._load_json(META_FILE)
+        self._matrix = None
+        self._components = None
+        self._vocab_pos = None
+
+    def _load_json(self, name: str) -> Optional[dict]:
+        path = self.index_dir / name
+        if path.exists():
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        return None
+
+    def _save_json(self, name: str, data: dict):
+        path = self.index_dir / name
+        tmp_path = path.with_suffix(path.suffix + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    # ------------------------------------------------------------------
+    # 빌드
+    # ------------------------------------------------------------------
+
+    def update(self, pages: List[Dict], texts: Optional[Dict[str, str]] = None) -> dict:
+        """
+        인덱스 증분 갱신
+        pages: page_index.json의 pages 항목
+        texts: 이번 동기화에서 새로 변환된 페이지 텍스트 {page_id: 제목+본문}
+        texts에 없는 페이지는 저장된 단어 빈도를 재사용하고,
+        저장된 적 없는 페이지만 캐시 마크다운을 읽어 토큰화합니다.
+        """
+        texts = texts or {}
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+
+        store = self._load_json(TERMS_FILE) or {"docs": {}}
+        if store.get("title_weight") != TITLE_WEIGHT:
+            # 가중치가 바뀌면 저장된 단어 빈도를 버리고 캐시 마크다운에서 다시 계산 (전체 재학습)
+            store = {"docs": {}, "title_weight": TITLE_WEIGHT}
+        docs = store["docs"]
+        page_ids = [page['id'] for page in pages]
+        current = set(page_ids)
+
+        changed = set()
+        for page in pages:
+            page_id = page['id']
+            text = texts.get(page_id)
+            if text is None:
+                if page_id in docs:
+                    continue
+                text = read_page_text(self.cache_dir, page)
+                if text is None:
+                    continue
+
+            digest = text_hash(text)
+            if docs.get(page_id, {}).get('hash') == digest:
+                continue
+            docs[page_id] = {"hash": digest, "tf": document_terms(text)}
+            changed.add(page_id)
+
+        removed = [page_id for page_id in docs if page_id not in current]
+        for page_id in removed:
+            del docs[page_id]
+
+        ids = [page_id for page_id in page_ids if page_id in docs]
+        touched = len(changed) + len(removed)
+
+        if self._needs_refit(ids, touched):
+            self._fit(ids, docs)
+            mode = "full"
+        else:
+            self._refresh_rows(ids, docs, changed)
+            mode = "incremental"
+
+        self._save_json(TERMS_FILE, store)
+        self._matrix = None
+
+        return {"mode": mode, "documents": len(ids), "updated": len(changed), "removed": len(removed)}
+
+    def _needs_refit(self, ids: List[str], touched: int) -> bool:
+        meta = self.meta
+        if not meta or not (self.index_dir / MATRIX_FILE).exists():
+            return True
+        if meta.get('max_features') != self.max_features or meta.get('lsa_components') != self.lsa_components:
+            return True
+        return touched > REFIT_RATIO * max(len(ids), 1)
+
+    def _fit(self, ids: List[str], docs: Dict[str, dict]):
+        """어휘/IDF(및 LSA)를 새로 학습하고 전체 행렬 재작성"""
+        df = Counter()
+        for page_id in ids:
+            df.update(docs[page_id]['tf'].keys())
+
+        n_docs = len(ids)
+        max_df = MAX_DF_RATIO * n_docs if n_docs >= 10 else n_docs
+        candidates = sorted((item for item in df.items() if item[1] <= max_df), key=lambda item: (-item[1], item[0]))
+        vocab = [term for term, _ in candidates[:self.max_features]]
+        idf = np.array([math.log((1 + n_docs) / (1 + df[term])) + 1 for term in vocab], dtype=np.float32)
+        self._vocab_pos = {term: j for j, term in enumerate(vocab)}
+
+        tfidf = np.zeros((n_docs, len(vocab)), dtype=np.float32)
+        for i, page_id in enumerate(ids):
+            tfidf[i] = self._vectorize(docs[page_id]['tf'], idf)
+
+        components = None
+        k = self.lsa_components
+        if k and k < min(tfidf.shape):
+            # Truncated SVD: 상위 k개 오른쪽 특이벡터로 투영
+            _, _, vt = np.linalg.svd(tfidf, full_matrices=False)
+            components = np.ascontiguousarray(vt[:k].T)
+            rows = _normalize_rows(tfidf @ components)
+            np.save(self.index_dir / COMPONENTS_FILE, components)
+        else:
+            rows = tfidf
+            (self.index_dir / COMPONENTS_FILE).unlink(missing_ok=True)
+
+        self._components = components
+        self._write_matrix(rows)
+        self.meta = {
+            "built_at": datetime.now().isoformat(),
+            "ids": ids,
+            "vocab": vocab,
+            "idf": idf.tolist(),
+            "dim": int(rows.shape[1]),
+            "max_features": self.max_features,
+            "lsa_components": self.lsa_components,
+            # 문서 수가 차원보다 적으면 LSA 없이 TF-IDF 그대로 사용
+            "lsa_applied": components is not None,
+        }
+        self._save_json(META_FILE, self.meta)
+
+    def _refresh_rows(self, ids: List[str], docs: Dict[str, dict], changed: set):
+        """기존 어휘/IDF를 유지한 채 변경된 페이지의 행만 다시 계산"""
+        meta = self.meta
+        idf = np.asarray(meta['idf'], dtype=np.float32)
+        self._load_vocab()
+        components = self._load_components()
+
+        old_matrix = self._open_matrix()
+        old_pos = {page_id: i for i, page_id in enumerate(meta['ids'])}
+        # 유지할 행은 메모리의 rows로 복사하고, 쓰기 전에 memmap 참조(지역 변수와 self._matrix)를 모두 놓음
+
+        rows = np.empty((len(ids), meta['dim']), dtype=np.float32)
+        for i, page_id in enumerate(ids):
+            if page_id in old_pos and page_id not in changed:
+                rows[i] = old_matrix[old_pos[page_id]]
+                continue
+            vec = self._vectorize(docs[page_id]['tf'], idf)
+            if components is not None:
+                vec = _normalize_rows((vec @ components)[None, :])[0]
+            rows[i] = vec
+
+        del old_matrix
+        self._write_matrix(rows)
+        meta['ids'] = ids
+        meta['built_at'] = datetime.now().isoformat()
+        self._save_json(META_FILE, meta)
+
+    def _vectorize(self, tf: Dict[str, int], idf) -> "np.ndarray":
+        vec = np.zeros(len(idf), dtype=np.float32)
+        for term, count in tf.items():
+            j = self._vocab_pos.get(term)
+            if j is not None:
+                vec[j] = (1 + math.log(count)) * idf[j]
+        norm = np.linalg.norm(vec)
+        if norm > 0:
+            vec /= norm
+        return vec
+
+    def _write_matrix(self, rows):
+        # 교체 전에 기존 memmap을 놓아야 함 (Windows는 매핑된 파일을 바꿀 수 없고, 남아 있으면 이전 행렬을 계속 읽음)
+        self._matrix = None
+        path = self.index_dir / MATRIX_FILE
+        tmp_path = path.with_suffix('.tmp')
+        if rows.size:
+            matrix = np.memmap(tmp_path, dtype=np.float32, mode='w+', shape=rows.shape)
+            matrix[:] = rows
+            matrix.flush()
+            del matrix
+        else:
+            tmp_path.write_bytes(b'')
+        os.replace(tmp_path, path)
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+
+    def _load_vocab(self):
+        if self._vocab_pos is None:
+            self._vocab_pos = {term: j for j, term in enumerate(self.meta['vocab'])}
+
+    def _load_components(self):
+        if self._components is None and self.meta.get('lsa_applied'):
+            self._components = np.load(self.index_dir / COMPONENTS_FILE)
+        return self._components
+
+    def _open_matrix(self):
+        if self._matrix is None:
+            shape = (len(self.meta['ids']), self.meta['dim'])
+            if shape[0] == 0:
+                return np.zeros(shape, dtype=np.float32)
+            self._matrix = np.memmap(self.index_dir / MATRIX_FILE, dtype=np.float32, mode='r', shape=shape)
+        return self._matrix
+
+    def _query_vectors(self, queries: List[str]):
+        idf = np.asarray(self.meta['idf'], dtype=np.float32)
+        self._load_vocab()
+        vectors = np.stack([self._vectorize(Counter(tokenize(q)), idf) for q in queries])
+        components = self._load_components()
+        if components is not None:
+            vectors = _normalize_rows(vectors @ components)
+        return vectors
+
+    def search_many(self, queries: List[str], k: int = 10,
+                    allowed: Optional[set] = None) -> List[List[Tuple[str, float]]]:
+        """
+        여러 쿼리를 한 번의 행렬 곱으로 검색
+        (문서 수 x 차원) @ (차원 x 쿼리 수) 후 argpartition으로 상위 k개만 정렬합니다.
+        allowed: 이 페이지 ID만 결과에 포함 (패싯 조건 등, 상위 k개를 고르기 전에 적용)
+        """
+        if not self.meta or not self.meta['ids'] or not queries:
+            return [[] for _ in queries]
+
+        ids = self.meta['ids']
+        scores = self._open_matrix() @ self._query_vectors(queries).T
+        if allowed is not None:
+            mask = np.fromiter((page_id in allowed for page_id in ids), dtype=bool, count=len(ids))
+            scores = scores * mask[:, None]
+
+        results = []
+        for column in scores.T:
+            top = _top_k(column, k)
+            results.append([(ids[i], float(column[i])) for i in top if column[i] > 0])
+        return results
+
+    def search(self, query: str, k: int = 10, allowed: Optional[set] = None) -> List[Tuple[str, float]]:
+        """단일 쿼리 검색 → [(page_id, 유사도)]"""
+        return self.search_many([query], k, allowed)[0]
+
+
+def _normalize_rows(matrix):
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1
+    return (matrix / norms).astype(np.float32)
+
+
+def _top_k(scores, k: int):
+    """argpartition으로 상위 k개 인덱스를 점수 내림차순으로 반환"""
+    if k >= len(scores):
+        return np.argsort(-scores)
+    top = np.argpartition(-scores, k)[:k]
+    return top[np.argsort(-scores[top])]
+
+
+def update_semantic_index(cache_dir: Path, pages: List[Dict], texts: Optional[Dict[str, str]] = None) -> Optional[dict]:
+    """동기화 후 시맨틱 인덱스 갱신 (numpy가 없거나 비활성화 시 None)"""
+    if np is None or not load_search_config().get('semantic_index', True):
+        return None
+    return SemanticIndex(cache_dir).update(pages, texts)
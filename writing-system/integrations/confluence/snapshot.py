@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+캐시 스냅샷 내보내기/가져오기
+page_index.json(카탈로그), 페이지 캐시, 검색 인덱스를 하나의 버전 있는 tar.gz 아카이브로 묶어
+새 PC나 CI 러너가 전체 동기화/OAuth 설정 없이 바로 따뜻한 캐시로 시작하게 합니다.
+가져온 뒤에는 평소처럼 --sync를 실행하면 바뀐 페이지만 받아옵니다.
+
+아카이브 구조 (스트리밍 가능한 tar.gz, 표준 입출력 '-' 지원):
+    SNAPSHOT.json              # 첫 멤버: 형식 버전, 생성 시각, 파일별 크기/sha256
+    page_index.json
+    <페이지 파일들>
+    page_store/ semantic/ minhash/ links/ duplicates.json
+    raw/ history/              # --include-raw / --include-history 지정 시
+
+<아카이브>.sha256             # 아카이브 전체 체크섬 (파일로 내보낸 경우)
+
+인증 토큰, HTTP 응답 캐시, 실행 보고서/프로파일은 포함하지 않습니다.
+"""
+
+import os
+import io
+import sys
+import json
+import time
+import zlib
+import shutil
+import tarfile
+import hashlib
+from datetime import datetime
+from pathlib import Path, PurePosixPath
+from typing import Optional, List, Tuple
+
+import dedup
+import facets
+import link_graph
+import page_history
+import page_store
+import raw_store
+import semantic_index
+import table_store
+import title_index
+
+FORMAT_NAME = "aegis-confluence-snapshot"
+FORMAT_VERSION = 1
+MANIFEST_NAME = "SNAPSHOT.json"
+INDEX_FILENAME = "page_index.json"
+CHUNK_SIZE = 1024 * 1024
+
+INDEX_DIRS = (page_store.STORE_DIRNAME, semantic_index.INDEX_DIRNAME, dedup.INDEX_DIRNAME, link_graph.INDEX_DIRNAME,
+              table_store.TABLES_DIRNAME, facets.INDEX_DIRNAME, title_index.INDEX_DIRNAME)
+INDEX_FILES = (dedup.DUPLICATES_FILE, "jira_state.json")
+# 가져올 때 스냅샷에 없으면 대상 캐시에서 지우는 폴더/파일 (이전 캐시의 원본/이력/인덱스가 남지 않도록)
+SNAPSHOT_DIRS = INDEX_DIRS + (raw_store.RAW_DIRNAME, page_history.HISTORY_DIRNAME)
+
+
+class SnapshotError(Exception):
+    """스냅샷 형식 오류 또는 체크섬 불일치"""
+
+
+class _HashingWriter:
+    """쓰는 바이트의 sha256을 함께 계산하는 파일 래퍼"""
+
+    def __init__(self, fileobj):
+        self.fileobj = fileobj
+        self.sha256 = hashlib.sha256()
+        self.size = 0
+
+    def write(self, data):
+        self.sha256.update(data)
+        self.size += len(data)
+        return self.fileobj.write(data)
+
+    def flush(self):
+        self.fileobj.flush()
+
+
+class _HashingReader:
+    """읽는 바이트의 sha256을 함께 계산하는 파일 래퍼"""
+
+    def __init__(self, fileobj):
+        self.fileobj = fileobj
+        self.sha256 = hashlib.sha256()
+
+    def read(self, size=-1):
+        data = self.fileobj.read(size)
+        self.sha256.update(data)
+        return data
+
+
+def _file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def collect_files(cache_dir: Path, include_raw: bool = False, include_history: bool = False) -> List[str]:
+    """스냅샷에 넣을 파일 목록 (cache_dir 기준 POSIX 상대 경로)"""
+    cache_dir = Path(cache_dir)
+    with open(cache_dir / INDEX_FILENAME, 'r', encoding='utf-8') as f:
+        index = json.load(f)
+
+    files = [INDEX_FILENAME]
+    files += [page['filename'] for page in index['pages'] if (cache_dir / page['filename']).is_file()]
+    files += [name for name in INDEX_FILES if (cache_dir / name).is_file()]
+
+    dirs = list(INDEX_DIRS)
+    if include_raw:
+        dirs.append(raw_store.RAW_DIRNAME)
+    if include_history:
+        dirs.append(page_history.HISTORY_DIRNAME)
+    for dirname in dirs:
+        directory = cache_dir / dirname
+        if directory.is_dir():
+            files += sorted(path.relative_to(cache_dir).as_posix() for path in directory.rglob("*")
+                            if path.is_file() and not path.name.endswith(".tmp"))
+    return files
+
+
+def export_snapshot(cache_dir: Path, target: str, include_raw: bool = False,
+                    include_history: bool = False) -> dict:
+    """
+    캐시를 tar.gz 스냅샷으로 내보내기
+    target: 파일 경로 또는 '-' (표준 출력으로 스트리밍)
+    반환: {"path", "files", "bytes", "sha256", "seconds"}
+    """
+    cache_dir = Path(cache_dir)
+    if not (cache_dir / INDEX_FILENAME).exists():
+        raise SnapshotError("캐시된 page_index.json이 없습니다. --sync를 먼저 실행하세요.")
+
+    start = time.perf_counter()
+    with open(cache_dir / INDEX_FILENAME, 'r', encoding='utf-8') as f:
+        index = json.load(f)
+    files = collect_files(cache_dir, include_raw, include_history)
+    manifest = {
+        "format": FORMAT_NAME,
+        "format_version": FORMAT_VERSION,
+        "created_at": datetime.now().isoformat(),
+        "space_key": index.get("space_key", ""),
+        "synced_at": index.get("synced_at", ""),
+        "pages": len(index['pages']),
+        "files": [
+            {"path": name, "size": (cache_dir / name).stat().st_size, "sha256": _file_sha256(cache_dir / name)}
+            for name in files
+        ],
+    }
+    manifest_bytes = json.dumps(manifest, ensure_ascii=False, indent=2).encode('utf-8')
+
+    to_stdout = target == "-"
+    out = sys.stdout.buffer if to_stdout else open(target, 'wb')
+    writer = _HashingWriter(out)
+    try:
+        with tarfile.open(fileobj=writer, mode="w|gz") as tar:
+            info = tarfile.TarInfo(MANIFEST_NAME)
+            info.size = len(manifest_bytes)
+            info.mtime = int(time.time())
+            tar.addfile(info, io.BytesIO(manifest_bytes))
+            for name in files:
+                tar.add(str(cache_dir / name), arcname=name, recursive=False)
+    finally:
+        if to_stdout:
+            out.flush()
+        else:
+            out.close()
+
+    sha256 = writer.sha256.hexdigest()
+    if not to_stdout:
+        with open(f"{target}.sha256", 'w', encoding='utf-8') as f:
+            f.write(f"{sha256}  {Path(target).name}\n")
+
+    return {
+        "path": target,
+        "files": len(files),
+        "pages": len(index['pages']),
+        "bytes": writer.size,
+        "sha256": sha256,
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def _safe_member_path(name: str) -> str:
+    """아카이브 멤버 이름 검증 (절대 경로/상위 디렉터리 참조 거부)"""
+    path = PurePosixPath(name)
+    if path.is_absolute() or ".." in path.parts or not path.parts:
+        raise SnapshotError(f"허용되지 않는 경로: {name}")
+    return path.as_posix()
+
+
+def _read_expected_sha256(source: str) -> Optional[str]:
+    sidecar = Path(f"{source}.sha256")
+    if source == "-" or not sidecar.exists():
+        return None
+    return sidecar.read_text(encoding='utf-8').split()[0].strip()
+
+
+def _extract(tar: tarfile.TarFile, staging: Path) -> Tuple[dict, int]:
+    """스트림에서 매니페스트를 먼저 읽고, 이후 멤버를 sha256 확인하며 staging에 풀기"""
+    first = tar.next()
+    if first is None or first.name != MANIFEST_NAME:
+        raise SnapshotError("스냅샷 매니페스트(SNAPSHOT.json)가 없습니다")
+    manifest = json.loads(tar.extractfile(first).read().decode('utf-8'))
+    if manifest.get("format") != FORMAT_NAME:
+        raise SnapshotError("Confluence 캐시 스냅샷이 아닙니다")
+    if manifest.get("format_version", 0) > FORMAT_VERSION:
+        raise SnapshotError(f"지원하지 않는 스냅샷 버전입니다: {manifest.get('format_version')} "
+                            f"(이 도구는 {FORMAT_VERSION}까지 지원)")
+
+    expected = {item["path"]: item for item in manifest["files"]}
+    seen = set()
+    # 스트림 모드에서는 for 반복이 처음 멤버부터 다시 돌려주므로 next()로 이어서 읽음
+    member = tar.next()
+    while member is not None:
+        name = _safe_member_path(member.name)
+        if not member.isfile():
+            raise SnapshotError(f"일반 파일이 아닌 멤버: {name}")
+        if name not in expected:
+            raise SnapshotError(f"매니페스트에 없는 파일: {name}")
+
+        destination = staging / name
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        digest = hashlib.sha256()
+        source = tar.extractfile(member)
+        with open(destination, 'wb') as f:
+            for chunk in iter(lambda: source.read(CHUNK_SIZE), b""):
+                digest.update(chunk)
+                f.write(chunk)
+        if digest.hexdigest() != expected[name]["sha256"]:
+            raise SnapshotError(f"체크섬 불일치: {name}")
+        seen.add(name)
+        member = tar.next()
+
+    missing = set(expected) - seen
+    if missing:
+        raise SnapshotError(f"아카이브에 빠진 파일 {len(missing)}개 (예: {sorted(missing)[0]})")
+    return manifest, len(seen)
+
+
+def import_snapshot(cache_dir: Path, source: str, force: bool = False) -> dict:
+    """
+    스냅샷을 검증한 뒤 캐시에 풀기
+    source: 파일 경로 또는 '-' (표준 입력에서 스트리밍)
+    파일별 sha256(매니페스트)과, 옆에 <아카이브>.sha256이 있으면 아카이브 전체 체크섬도 확인합니다.
+    검증이 끝나기 전에는 기존 캐시를 건드리지 않습니다.
+    force: 이미 동기화된 캐시가 있어도 덮어씀
+    반환: {"files", "pages", "created_at", "synced_at", "seconds", "verified_archive"}
+    """
+    cache_dir = Path(cache_dir)
+    if (cache_dir / INDEX_FILENAME).exists() and not force:
+        raise SnapshotError("이미 캐시가 있습니다. 덮어쓰려면 --force를 함께 지정하세요.")
+
+    start = time.perf_counter()
+    expected_archive_sha = _read_expected_sha256(source)
+    cache_dir.parent.mkdir(parents=True, exist_ok=True)
+    staging = cache_dir.parent / f".{cache_dir.name}.import-{os.getpid()}"
+    if staging.exists():
+        shutil.rmtree(staging)
+    staging.mkdir()
+
+    stream = sys.stdin.buffer if source == "-" else open(source, 'rb')
+    reader = _HashingReader(stream)
+    try:
+        try:
+            with tarfile.open(fileobj=reader, mode="r|gz") as tar:
+                manifest, count = _extract(tar, staging)
+        except (tarfile.TarError, EOFError, zlib.error) as e:
+            raise SnapshotError(f"손상된 아카이브입니다: {e}")
+        # gzip 꼬리 이후 남은 바이트까지 읽어 아카이브 전체 체크섬 계산
+        while reader.read(CHUNK_SIZE):
+            pass
+        if expected_archive_sha and reader.sha256.hexdigest() != expected_archive_sha:
+            raise SnapshotError("아카이브 체크섬(.sha256)이 일치하지 않습니다")
+        _install(cache_dir, staging)
+    finally:
+        if source != "-":
+            stream.close()
+        shutil.rmtree(staging, ignore_errors=True)
+
+    return {
+        "files": count,
+        "pages": manifest.get("pages", 0),
+        "created_at": manifest.get("created_at", ""),
+        "synced_at": manifest.get("synced_at", ""),
+        "seconds": time.perf_counter() - start,
+        "verified_archive": expected_archive_sha is not None,
+    }
+
+
+def _install(cache_dir: Path, staging: Path):
+    """
+    검증된 staging 내용을 캐시로 옮김 (같은 이름의 파일/인덱스 폴더는 교체)
+    스냅샷에 없는 인덱스/raw/history 폴더와 인덱스 파일은 삭제해 새 카탈로그와 섞이지 않게 합니다.
+    """
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    index_file = cache_dir / INDEX_FILENAME
+    old_pages = []
+    old_generation = 0
+    if index_file.exists():
+        with open(index_file, 'r', encoding='utf-8') as f:
+            old_index = json.load(f)
+        old_pages = [page['filename'] for page in old_index.get('pages', [])]
+        old_generation = int(old_index.get('generation', 0))
+
+    staged = {item.name for item in staging.iterdir()}
+    for item in staging.iterdir():
+        if item.name == INDEX_FILENAME:
+            continue
+        destination = cache_dir / item.name
+        if destination.is_dir():
+            shutil.rmtree(destination)
+        shutil.move(str(item), str(destination))
+    for name in SNAPSHOT_DIRS:
+        if name not in staged and (cache_dir / name).is_dir():
+            shutil.rmtree(cache_dir / name)
+    for name in INDEX_FILES:
+        if name not in staged:
+            (cache_dir / name).unlink(missing_ok=True)
+
+    # 카탈로그는 마지막에 교체하고, 새 카탈로그에 없는 이전 페이지 파일만 정리
+    # generation은 기존 값보다 크게 올려 실행 중인 검색 결과 캐시가 새 내용을 보도록 함
+    with open(staging / INDEX_FILENAME, 'r', encoding='utf-8') as f:
+        new_index = json.load(f)
+    new_pages = {page['filename'] for page in new_index.get('pages', [])}
+    new_index['generation'] = max(old_generation, int(new_index.get('generation', 0))) + 1
+    with open(staging / INDEX_FILENAME, 'w', encoding='utf-8') as f:
+        json.dump(new_index, f, ensure_ascii=False, indent=2)
+    os.replace(staging / INDEX_FILENAME, index_file)
+    for filename in old_pages:
+        if filename not in new_pages:
+            (cache_dir / filename).unlink(missing_ok=True)
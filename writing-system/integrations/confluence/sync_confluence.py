@@ -7,7 +7,16 @@ AEGIS 스페이스의 모든 문서를 로컬에 동기화합니다.
 사용법:
     python sync_confluence.py --fetch          # 문서 목록 가져오기
     python sync_confluence.py --sync           # 전체 동기화
+    python sync_confluence.py --sync --full    # 버전 비교 없이 전체 다시 변환
+    python sync_confluence.py --sync --budget 60s  # 우선순위 순으로 60초 안에 처리 (남은 페이지는 다음 동기화)
+    python sync_confluence.py --sync --profile # 프로파일링 (cache/profile/)
+    python sync_confluence.py --rebuild        # 보관된 원본으로 로컬 재변환 (네트워크 없음)
+    python sync_confluence.py --verify         # 캐시 무결성 검사, 손상/누락 페이지만 복구
+    python sync_confluence.py --diff <ID> --since 2025-09-01  # 로컬 버전 이력으로 변경 내용 보기
+    python sync_confluence.py --export-snapshot aegis.tar.gz  # 캐시 스냅샷 내보내기 / --import-snapshot로 가져오기
     python sync_confluence.py --search "키워드" # 문서 검색
+    python sync_confluence.py --local "질문"    # 로컬 캐시 검색 (네트워크 없음)
+    python sync_confluence.py --titles "전ㅌ"   # 제목 자동완성 (자모/초성, 네트워크 없음)
 """
 
 import os
@@ -20,6 +29,22 @@ from pathlib import Path
 from typing import Optional, List, Dict
 import base64
 
+import cache_indexes
+import cache_verify
+import http_client
+import link_graph
+import page_history
+import page_store
+import raw_store
+import semantic_index
+import snapshot
+import sync_scheduler
+import table_store
+import title_index
+import local_search
+from sync_metrics import SyncMetrics
+from profiling import ProfileSession
+
 # Windows 콘솔 UTF-8 출력 설정
 if sys.platform == 'win32':
     import io
@@ -38,15 +63,15 @@ def load_config() -> dict:
         return json.load(f)
 
 
-def get_auth_headers() -> dict:
+def get_auth_headers(email: Optional[str] = None, api_token: Optional[str] = None) -> dict:
     """
     인증 헤더 생성
-    환경 변수에서 인증 정보를 가져옵니다:
+    인자가 없으면 환경 변수에서 인증 정보를 가져옵니다 (jira_sync.py는 Jira 토큰을 직접 넘김):
     - CONFLUENCE_EMAIL: Atlassian 계정 이메일
     - CONFLUENCE_API_TOKEN: API 토큰 (https://id.atlassian.com/manage-profile/security/api-tokens)
     """
-    email = os.environ.get('CONFLUENCE_EMAIL')
-    api_token = os.environ.get('CONFLUENCE_API_TOKEN')
+    email = email or os.environ.get('CONFLUENCE_EMAIL')
+    api_token = api_token or os.environ.get('CONFLUENCE_API_TOKEN')
     
     if not email or not api_token:
         raise ValueError(
@@ -65,25 +90,152 @@ def get_auth_headers() -> dict:
     }
 
 
+def html_to_text(html: str) -> str:
+    """간단한 HTML to Text 변환"""
+    import re
+    
+    if not html:
+        return ""
+    
+    # Confluence 페이지 링크는 태그 제거 전에 [[제목]]으로 보존
+    text = link_graph.render_page_links(html)
+    
+    # 기본적인 HTML 태그 제거
+    text = re.sub(r'<br\s*/?>', '\n', text)
+    text = re.sub(r'<p[^>]*>', '\n', text)
+    text = re.sub(r'</p>', '\n', text)
+    text = re.sub(r'<h1[^>]*>(.*?)</h1>', r'\n# \1\n', text)
+    text = re.sub(r'<h2[^>]*>(.*?)</h2>', r'\n## \1\n', text)
+    text = re.sub(r'<h3[^>]*>(.*?)</h3>', r'\n### \1\n', text)
+    text = re.sub(r'<h([4-6])[^>]*>(.*?)</h\1>', r'\n#### \2\n', text)
+    text = re.sub(r'<li[^>]*>', '- ', text)
+    text = re.sub(r'</li>', '\n', text)
+    text = re.sub(r'<strong[^>]*>(.*?)</strong>', r'**\1**', text)
+    text = re.sub(r'<em[^>]*>(.*?)</em>', r'*\1*', text)
+    text = re.sub(r'<code[^>]*>(.*?)</code>', r'`\1`', text)
+    text = re.sub(r'<a[^>]*href="([^"]*)"[^>]*>(.*?)</a>', r'[\2](\1)', text)
+    text = re.sub(r'<[^>]+>', '', text)
+    
+    # HTML 엔티티 변환
+    text = text.replace('&nbsp;', ' ')
+    text = text.replace('&lt;', '<')
+    text = text.replace('&gt;', '>')
+    text = text.replace('&amp;', '&')
+    text = text.replace('&quot;', '"')
+    text = text.replace('&#39;', "'")
+    
+    # 연속 줄바꿈 정리
+    text = re.sub(r'\n{3,}', '\n\n', text)
+    
+    return text.strip()
+
+
+def render_markdown(entry: dict, body_text: str) -> str:
+    """page_index 항목과 변환된 본문으로 캐시 마크다운 생성"""
+    version = entry.get('version')
+    return f"""# {entry['title']}
+
+> **Page ID**: {entry['id']}
+> **URL**: {entry['url']}
+> **Created By**: {entry['created_by']}
+> **Created Date**: {entry['created_date']}
+> **Last Updated By**: {entry['updated_by']}
+> **Last Updated**: {entry.get('updated_date') or 'Unknown'}
+> **Version**: {version if version is not None else 'Unknown'}
+
+---
+
+{body_text}
+"""
+
+
+# --rebuild/--verify 출력 문구 (cache_verify.rebuild_cache / verify_cache)
+CACHE_MESSAGES = {
+    "no_index": "❌ 캐시된 데이터가 없습니다. --sync를 먼저 실행하세요.",
+    "unreadable_index": "❌ page_index.json을 읽을 수 없습니다 ({error}). --sync --full로 다시 받으세요.",
+    "rebuild_start": "🔁 로컬 재변환 시작... ({pages}개 페이지)",
+    "rebuild_converted": "🔁 {converted}개 변환 ({workers}개 프로세스, {seconds:.1f}s)",
+    "rebuild_missing": "⚠️ 원본이 없는 페이지 {missing}개는 건너뜀 (--sync --full로 한 번 다시 받으세요)",
+    "page_error": "⚠️ {page_id}: {error}",
+    "index_failed": "⚠️ {name} 인덱스 갱신 실패: {error}",
+    "index_stats": "🧭 {stats}",
+    "rebuild_done": "\n✅ 재변환 완료! 📁 {cache_dir}",
+    "verify_start": "🩺 캐시 검사 시작... ({pages}개 페이지)",
+    "verify_checked": ("🩺 {pages}개 검사 ({seconds:.2f}s): 정상 {ok}개, 손상/누락 {broken}개, "
+                       "중복 항목 {duplicates}개, 고아 파일 {orphans}개"),
+    "broken_page": "  ⚠️ {page_id}: {description}",
+    "hashed": "🔏 해시가 없던 {hashed}개 페이지에 sha1 기록",
+    "repaired": "🔧 원본으로 재변환 {rebuilt}개, 다시 받음 {fetched}개, 삭제된 페이지 {deleted}개",
+    "repair_skipped": "  ⚠️ {page_id}: Jira 이슈는 jira_sync.py --sync --full로 다시 받으세요",
+    "repair_failed": "  ⚠️ {page_id}: 복구 실패 ({error}) → 다음 --sync에서 다시 받음",
+    "removed": "🧹 카탈로그에 없는 파일 {removed}개 삭제",
+    "verify_incomplete": "\n⚠️ 검사 완료: 복구하지 못한 페이지 {problems}개 📁 {cache_dir}",
+    "verify_done": "\n✅ 검사 완료! 📁 {cache_dir}",
+}
+
+
+def rebuild_cache(workers: Optional[int] = None) -> Optional[dict]:
+    """
+    보관된 원본(cache/raw/)으로 마크다운과 인덱스를 다시 생성 (인증/네트워크 불필요)
+    workers: 변환 프로세스 수 (기본: CPU 코어 수)
+    """
+    return cache_verify.rebuild_cache(CACHE_DIR, cache_verify.page_worker(html_to_text, render_markdown),
+                                      CACHE_MESSAGES, workers)
+
+
+def verify_cache(workers: Optional[int] = None, offline: bool = False, http_cache: bool = True) -> Optional[dict]:
+    """
+    캐시 무결성 검사 후 손상/누락 페이지만 복구 (cache_verify.py)
+    보관된 원본으로 먼저 재변환하고, 원본도 없거나 손상된 페이지만 API로 다시 받습니다
+    (인증은 실제로 다시 받을 페이지가 있을 때만 필요).
+    workers: 검사 스레드 수 (기본: ThreadPoolExecutor 기본값)
+    """
+    sync = None
+    
+    def fetch(entry: dict):
+        nonlocal sync
+        if sync is None:
+            sync = ConfluenceSync(offline=offline, http_cache=http_cache)
+        return sync.fetch_page_body(entry['id'])
+    
+    return cache_verify.verify_cache(CACHE_DIR, cache_verify.page_worker(html_to_text, render_markdown), fetch,
+                                     CACHE_MESSAGES, workers)
+
+
 class ConfluenceSync:
-    def __init__(self):
+    def __init__(self, offline: bool = False, http_cache: bool = True):
+        """
+        offline: 네트워크 없이 HTTP 응답 캐시(cache/http/)에서만 읽음 (인증 정보 불필요)
+        http_cache: 응답 캐시 + 조건부 요청(ETag/Last-Modified) 사용 여부
+        """
         self.config = load_config()
         self.base_url = self.config['confluence']['base_url']
         self.space_key = self.config['confluence']['space_key']
-        self.headers = get_auth_headers()
+        self.headers = {} if offline else get_auth_headers()
+        self.metrics = None  # 동기화 중에만 SyncMetrics 할당
+        self.last_metrics = None
+        self.http_cache = http_client.ResponseCache(CACHE_DIR, offline=offline) if (http_cache or offline) else None
         
         # 캐시 디렉토리 생성
         CACHE_DIR.mkdir(parents=True, exist_ok=True)
     
+    def _get(self, url: str, params: Optional[dict] = None, cacheable: bool = False) -> requests.Response:
+        """GET 요청 (429/5xx 재시도, cacheable이면 조건부 요청, 동기화 중이면 지표 기록)"""
+        return http_client.get(url, headers=self.headers, params=params, metrics=self.metrics,
+                               cache=self.http_cache, cacheable=cacheable)
+    
     def get_all_pages(self, limit: int = 100) -> List[Dict]:
-        """AEGIS 스페이스의 모든 페이지 목록 가져오기 (REST API v1 사용)"""
+        """
+        AEGIS 스페이스의 모든 페이지 목록 가져오기 (REST API v1 사용)
+        본문은 빼고 메타데이터만 받습니다 (바뀐 페이지만 get_page_content로 본문을 받음)
+        """
         # REST API v1 엔드포인트 사용
         url = f"{self.base_url}/wiki/rest/api/content"
         params = {
             "spaceKey": self.space_key,
             "type": "page",
             "limit": limit,
-            "expand": "version,body.storage,history.createdBy,history.lastUpdated.by"
+            "expand": "version,history.createdBy,history.lastUpdated.by,metadata.labels,ancestors"
         }
         
         all_pages = []
@@ -91,7 +243,8 @@ class ConfluenceSync:
         
         while True:
             params["start"] = start
-            response = requests.get(url, headers=self.headers, params=params)
+            # 본문이 없는 목록이라 캐시해도 본문을 두 번 저장하지 않음 (오프라인 모드 목록용)
+            response = self._get(url, params, cacheable=True)
             try:
                 response.raise_for_status()
             except requests.exceptions.HTTPError as e:
@@ -117,7 +270,7 @@ class ConfluenceSync:
             "expand": "body.storage,version"
         }
         
-        response = requests.get(url, headers=self.headers, params=params)
+        response = self._get(url, params, cacheable=True)
         try:
             response.raise_for_status()
         except requests.exceptions.HTTPError as e:
@@ -125,6 +278,21 @@ class ConfluenceSync:
             raise
         return response.json()
     
+    def fetch_page_body(self, page_id: str) -> Optional[tuple]:
+        """
+        --verify 복구용 본문 다시 받기
+        반환: (body.storage HTML, page_index 항목에 반영할 버전 필드), 삭제된 페이지(404)면 None
+        """
+        try:
+            page = self.get_page_content(page_id)
+        except requests.exceptions.HTTPError as e:
+            if e.response is not None and e.response.status_code == 404:
+                return None
+            raise
+        version_info = page.get('version', {})
+        return (page.get('body', {}).get('storage', {}).get('value', ''),
+                {"version": version_info.get('number'), "updated_date": version_info.get('when', '')})
+    
     def search_pages(self, query: str) -> List[Dict]:
         """CQL로 페이지 검색"""
         url = f"{self.base_url}/wiki/rest/api/content/search"
@@ -133,7 +301,7 @@ class ConfluenceSync:
             "limit": 50
         }
         
-        response = requests.get(url, headers=self.headers, params=params)
+        response = self._get(url, params)
         try:
             response.raise_for_status()
         except requests.exceptions.HTTPError as e:
@@ -141,11 +309,31 @@ class ConfluenceSync:
             raise
         return response.json().get('results', [])
     
-    def sync_all_pages(self) -> dict:
-        """모든 페이지를 로컬에 동기화"""
+    def sync_all_pages(self, full: bool = False, metrics_prom: Optional[str] = None,
+                       budget_seconds: Optional[float] = None) -> dict:
+        """
+        모든 페이지를 로컬에 동기화
+        full: 버전이 같은 페이지도 다시 변환
+        metrics_prom: 실행 지표를 Prometheus text format으로 저장할 경로
+        budget_seconds: 시간 예산 (초과하면 남은 변경 페이지는 이전 내용을 유지하고 다음 동기화로 미룸)
+        변경 페이지는 sync_scheduler 우선순위(고정 > 검색 빈도 + 최근 수정) 순으로 처리하며,
+        Ctrl+C로 중단해도 그때까지 처리한 페이지는 저장합니다.
+        """
         print(f"📥 AEGIS 스페이스 동기화 시작...")
         
-        pages = self.get_all_pages()
+        scheduler = sync_scheduler.SyncScheduler(CACHE_DIR, budget_seconds)
+        metrics = self.metrics = SyncMetrics("v1", self.space_key)
+        try:
+            with metrics.phase("list"):
+                pages = self.get_all_pages()
+        except KeyboardInterrupt:
+            # 목록을 다 받기 전이면 처리한 페이지가 없으므로 이전 카탈로그를 그대로 둠
+            scheduler.interrupt()
+            print("\n⏸️ 중단 요청: 페이지 목록을 받는 중이라 이전 캐시를 그대로 유지합니다")
+            self.metrics = None
+            return self.get_cached_index()
+        scheduler.start()
+        metrics.pages["total"] = len(pages)
         print(f"📄 {len(pages)}개 페이지 발견")
         
         index = {
@@ -155,116 +343,219 @@ class ConfluenceSync:
             "pages": []
         }
         
-        for i, page in enumerate(pages):
-            page_id = page['id']
-            title = page['title']
-            
-            print(f"  [{i+1}/{len(pages)}] {title}")
-            
+        # 이전 동기화 결과 (버전이 같은 페이지는 변환/저장 생략)
+        previous = {p['id']: p for p in (self.get_cached_index() or {}).get('pages', [])}
+        changed_texts = {}
+        changed_links = {}
+        raw = raw_store.RawStore(CACHE_DIR)
+        store = page_store.PageStore(CACHE_DIR)
+        history = page_history.PageHistory(CACHE_DIR)
+        table_files = table_store.TableStore(CACHE_DIR)
+        entries = {}
+        
+        def listed_fields(page: dict) -> dict:
+            # 라벨/상위 페이지는 목록 응답에 포함 (라벨 변경은 버전을 올리지 않으므로 생략 시에도 갱신)
+            return {
+                "labels": [label['name'] for label in page.get('metadata', {}).get('labels', {}).get('results', [])],
+                "ancestors": [ancestor['id'] for ancestor in page.get('ancestors', [])],
+            }
+        
+        def page_filename(page: dict) -> str:
+            safe_title = "".join(c for c in page['title'] if c.isalnum() or c in (' ', '-', '_', '가-힣')).strip()
+            safe_title = safe_title[:50] if len(safe_title) > 50 else safe_title
+            return store.filename(f"{page['id']}_{safe_title}.md")
+        
+        def deferred_entry(page: dict) -> dict:
+            # 본문을 아직 받지 못한 페이지는 목록 정보만 남김 (version이 없어 다음 동기화에서 반드시 받음)
+            prev_entry = previous.get(page['id'])
+            if prev_entry and (CACHE_DIR / prev_entry['filename']).exists():
+                return dict(prev_entry, **listed_fields(page))
+            return dict({
+                "id": page['id'],
+                "title": page['title'],
+                "filename": page_filename(page),
+                "url": f"{self.base_url}/wiki/spaces/{self.space_key}/pages/{page['id']}",
+                "updated_date": page.get('version', {}).get('when', ''),
+                "version": None,
+                "deferred": True,
+            }, **listed_fields(page))
+        
+        ordered = scheduler.order(pages, lambda page: page.get('version', {}).get('when'))
+        for i, page in enumerate(ordered):
+            # Ctrl+C는 페이지 단위로 받아 남은 변경 페이지를 미루고, 그때까지 처리한 결과는 저장
             try:
-                # 본문 추출 (이미 expand로 가져옴)
-                body = page.get('body', {}).get('storage', {}).get('value', '')
+                page_id = page['id']
+                title = page['title']
                 version_info = page.get('version', {})
-                history_info = page.get('history', {})
-                
-                # 작성자 정보 추출
-                created_by = history_info.get('createdBy', {})
-                created_by_name = created_by.get('displayName', 'Unknown')
-                created_by_email = created_by.get('email', '')
-                created_date = history_info.get('createdDate', 'Unknown')
-                
-                # 최종 수정자 정보 추출
-                last_updated = history_info.get('lastUpdated', {})
-                updated_by = last_updated.get('by', {})
-                updated_by_name = updated_by.get('displayName', 'Unknown')
-                
-                # 마크다운 파일로 저장
-                safe_title = "".join(c for c in title if c.isalnum() or c in (' ', '-', '_', '가-힣')).strip()
-                safe_title = safe_title[:50] if len(safe_title) > 50 else safe_title
-                filename = f"{page_id}_{safe_title}.md"
-                filepath = CACHE_DIR / filename
+                fields = listed_fields(page)
+                    
+                prev_entry = previous.get(page_id)
+                if (not full and prev_entry and prev_entry.get('version') == version_info.get('number')
+                        and (CACHE_DIR / prev_entry['filename']).exists()):
+                    entries[page_id] = dict(prev_entry, **fields)
+                    metrics.count_page("skipped")
+                    continue
                 
-                # 페이지 URL 생성
-                page_url = f"{self.base_url}/wiki/spaces/{self.space_key}/pages/{page_id}"
+                if scheduler.expired():
+                    # 시간 예산 초과/중단: 이전에 받아 둔 내용은 유지하고 다음 동기화에서 처리
+                    entries[page_id] = deferred_entry(page)
+                    metrics.count_page("deferred")
+                    continue
                 
-                # 메타데이터와 함께 저장
-                md_content = f"""# {title}
-
-> **Page ID**: {page_id}
-> **URL**: {page_url}
-> **Created By**: {created_by_name}
-> **Created Date**: {created_date}
-> **Last Updated By**: {updated_by_name}
-> **Last Updated**: {version_info.get('when', 'Unknown')}
-> **Version**: {version_info.get('number', 'Unknown')}
-
----
-
-{self._html_to_text(body)}
-"""
+                print(f"  [{i+1}/{len(pages)}] {title}")
                 
-                with open(filepath, 'w', encoding='utf-8') as f:
-                    f.write(md_content)
-                
-                index['pages'].append({
-                    "id": page_id,
-                    "title": title,
-                    "filename": filename,
-                    "url": page_url,
-                    "created_by": created_by_name,
-                    "created_by_email": created_by_email,
-                    "created_date": created_date,
-                    "updated_by": updated_by_name,
-                    "updated_date": version_info.get('when', '')
-                })
-                
-            except Exception as e:
-                print(f"    ⚠️ 오류: {e}")
+                try:
+                    # 목록에는 본문이 없으므로 바뀐 페이지만 우선순위 순서대로 본문 요청
+                    with metrics.phase("fetch"):
+                        page_detail = self.get_page_content(page_id)
+                    body = page_detail.get('body', {}).get('storage', {}).get('value', '')
+                    history_info = page.get('history', {})
+                    
+                    # 작성자 정보 추출
+                    created_by = history_info.get('createdBy', {})
+                    created_by_name = created_by.get('displayName', 'Unknown')
+                    created_by_email = created_by.get('email', '')
+                    created_date = history_info.get('createdDate', 'Unknown')
+                    
+                    # 최종 수정자 정보 추출
+                    last_updated = history_info.get('lastUpdated', {})
+                    updated_by = last_updated.get('by', {})
+                    updated_by_name = updated_by.get('displayName', 'Unknown')
+                    
+                    # 마크다운 파일로 저장
+                    filename = page_filename(page)
+                    
+                    # 페이지 URL 생성
+                    page_url = f"{self.base_url}/wiki/spaces/{self.space_key}/pages/{page_id}"
+                    
+                    with metrics.conversion(page_id, title, len(body)):
+                        body_text = self._html_to_text(body)
+                        page_links = link_graph.extract_page_links(body, self.space_key)
+                        tables = table_store.extract_tables(body)
+                    
+                    entry = {
+                        "id": page_id,
+                        "title": title,
+                        "filename": filename,
+                        "url": page_url,
+                        "created_by": created_by_name,
+                        "created_by_email": created_by_email,
+                        "created_date": created_date,
+                        "updated_by": updated_by_name,
+                        "updated_date": version_info.get('when', ''),
+                        "version": version_info.get('number'),
+                        "labels": fields['labels'],
+                        "ancestors": fields['ancestors']
+                    }
+                    
+                    with metrics.phase("write"):
+                        md_content = render_markdown(entry, body_text)
+                        
+                        # 바뀐 페이지는 덮어쓰기 전에 버전 이력에 델타로 남김
+                        if prev_entry:
+                            history.record_change(prev_entry, lambda: store.read(prev_entry['filename']),
+                                                  entry, md_content)
+                        
+                        # 메타데이터와 함께 저장
+                        entry['sha1'] = store.write(filename, md_content)
+                        
+                        # 변환기가 바뀌어도 --rebuild로 다시 만들 수 있도록 원본 보관
+                        raw.save(page_id, body)
+                        
+                        # 표는 페이지 ID + 표 번호 단위로 따로 저장 (열 조건 조회용)
+                        page_tables = table_files.save(page_id, tables)
+                        if page_tables:
+                            entry['tables'] = page_tables
+                        
+                        # 제목이 바뀌어 파일명이 달라진 경우 이전 파일 삭제
+                        if prev_entry and prev_entry['filename'] != filename:
+                            (CACHE_DIR / prev_entry['filename']).unlink(missing_ok=True)
+                    
+                    changed_texts[page_id] = f"{title}\n{body_text}"
+                    changed_links[page_id] = page_links
+                    metrics.count_page("changed")
+                    entries[page_id] = entry
+                    
+                except Exception as e:
+                    print(f"    ⚠️ 오류: {e}")
+                    metrics.count_page("failed")
+                    # 이전에 받아둔 내용이 있으면 유지 (다음 동기화에서 다시 시도)
+                    if prev_entry:
+                        entries[page_id] = prev_entry
+            
+            except KeyboardInterrupt:
+                print("    ⏸️ 중단 요청: 지금까지 처리한 페이지만 저장합니다")
+                scheduler.interrupt()
+                if page['id'] not in entries:
+                    entries[page['id']] = deferred_entry(page)
+                    metrics.count_page("deferred")
         
-        # 인덱스 파일 저장
-        with open(INDEX_FILE, 'w', encoding='utf-8') as f:
-            json.dump(index, f, ensure_ascii=False, indent=2)
+        # 카탈로그는 처리 순서와 관계없이 API 목록 순서로 저장
+        index['pages'] = [entries[page['id']] for page in pages if page['id'] in entries]
         
-        print(f"\n✅ 동기화 완료! {len(index['pages'])}개 페이지 저장됨")
+        # jira_sync.py가 같은 카탈로그에 넣은 Jira 이슈는 그대로 유지
+        index['pages'].extend(p for p in previous.values() if p.get('source') == 'jira')
+        
+        with metrics.phase("index"):
+            # 압축 저장소 첫 동기화면 공유 사전 학습 후 전체 압축 (filename이 바뀜)
+            store_stats = store.finalize(index)
+            if store_stats:
+                print(f"🗜️ {page_store.format_stats(store_stats)}")
+            
+            # 검색/중복 인덱스 갱신 (canonical_id 등이 index에 기록됨)
+            self._update_cache_indexes(index, changed_texts, changed_links)
+            
+            # 인덱스 파일 저장
+            page_store.save_index(INDEX_FILE, index)
+            
+            raw.prune(p['id'] for p in index['pages'])
+            history.prune(p['id'] for p in index['pages'])
+            table_files.prune(p['id'] for p in index['pages'])
+        
+        print(f"\n✅ 동기화 완료! {len(index['pages'])}개 페이지 저장됨 (변경 {len(changed_texts)}개)")
+        deferred = metrics.pages.get("deferred", 0)
+        if deferred:
+            reason = "중단" if scheduler.interrupted else f"시간 예산 {budget_seconds:g}s 초과"
+            print(f"⏳ {reason}: {deferred}개 페이지는 다음 동기화로 미뤘습니다 (이전 내용 유지)")
         print(f"📁 캐시 위치: {CACHE_DIR}")
         
+        metrics.extra["schedule"] = scheduler.stats(deferred)
+        self._write_metrics(metrics_prom)
+        
         return index
     
+    def _write_metrics(self, metrics_prom: Optional[str] = None):
+        """실행 보고서(sync_report.json) 저장 및 요약 출력"""
+        metrics = self.metrics
+        metrics.finish()
+        if self.http_cache:
+            metrics.extra["http_cache"] = self.http_cache.stats()
+        report = metrics.write_report(CACHE_DIR)
+        if metrics_prom:
+            metrics.write_prometheus(Path(metrics_prom))
+        
+        phases = ", ".join(f"{name} {seconds:.1f}s" for name, seconds in report['phases_seconds'].items())
+        print(f"⏱️ {report['duration_seconds']:.1f}s ({phases}) | 요청 {report['requests_total']}회, "
+              f"재시도 {report['retries_total']}회, {report['bytes_downloaded'] / 1e6:.1f} MB")
+        if self.http_cache:
+            cache_stats = self.http_cache.stats()
+            print(f"🗄️ HTTP 캐시: 적중 {cache_stats['hits']}회, 새로 받음 {cache_stats['misses']}회"
+                  + (" (오프라인)" if cache_stats['offline'] else ""))
+        self.last_metrics = metrics
+        self.metrics = None
+    
+    def _update_cache_indexes(self, index: dict, changed_texts: Dict[str, str],
+                              changed_links: Dict[str, List[str]]):
+        """로컬 검색용 캐시 인덱스 갱신 (numpy 필요)"""
+        for name, stats in cache_indexes.update_cache_indexes(CACHE_DIR, index, changed_texts, changed_links):
+            if isinstance(stats, Exception):
+                print(f"⚠️ {name} 인덱스 갱신 실패: {stats}")
+            else:
+                print(f"🧭 {cache_indexes.format_stats(name, stats)}")
+    
     def _html_to_text(self, html: str) -> str:
         """간단한 HTML to Text 변환"""
-        import re
-        
-        if not html:
-            return ""
-        
-        # 기본적인 HTML 태그 제거
-        text = re.sub(r'<br\s*/?>', '\n', html)
-        text = re.sub(r'<p[^>]*>', '\n', text)
-        text = re.sub(r'</p>', '\n', text)
-        text = re.sub(r'<h1[^>]*>(.*?)</h1>', r'\n# \1\n', text)
-        text = re.sub(r'<h2[^>]*>(.*?)</h2>', r'\n## \1\n', text)
-        text = re.sub(r'<h3[^>]*>(.*?)</h3>', r'\n### \1\n', text)
-        text = re.sub(r'<h([4-6])[^>]*>(.*?)</h\1>', r'\n#### \2\n', text)
-        text = re.sub(r'<li[^>]*>', '- ', text)
-        text = re.sub(r'</li>', '\n', text)
-        text = re.sub(r'<strong[^>]*>(.*?)</strong>', r'**\1**', text)
-        text = re.sub(r'<em[^>]*>(.*?)</em>', r'*\1*', text)
-        text = re.sub(r'<code[^>]*>(.*?)</code>', r'`\1`', text)
-        text = re.sub(r'<a[^>]*href="([^"]*)"[^>]*>(.*?)</a>', r'[\2](\1)', text)
-        text = re.sub(r'<[^>]+>', '', text)
-        
-        # HTML 엔티티 변환
-        text = text.replace('&nbsp;', ' ')
-        text = text.replace('&lt;', '<')
-        text = text.replace('&gt;', '>')
-        text = text.replace('&amp;', '&')
-        text = text.replace('&quot;', '"')
-        text = text.replace('&#39;', "'")
-        
-        # 연속 줄바꿈 정리
-        text = re.sub(r'\n{3,}', '\n\n', text)
-        
-        return text.strip()
+        return html_to_text(html)
     
     def get_cached_index(self) -> Optional[dict]:
         """캐시된 인덱스 가져오기"""
@@ -295,13 +586,84 @@ def main():
     parser = argparse.ArgumentParser(description='Confluence AEGIS Space Sync Tool')
     parser.add_argument('--fetch', action='store_true', help='페이지 목록만 가져오기')
     parser.add_argument('--sync', action='store_true', help='전체 동기화')
+    parser.add_argument('--full', action='store_true', help='--sync 시 버전이 같은 페이지도 다시 변환')
+    parser.add_argument('--metrics-prom', type=str, help='--sync 실행 지표를 Prometheus text format으로 저장할 경로')
+    parser.add_argument('--budget', type=str, help='--sync 시간 예산 (예: 60s, 5m) - 우선순위 높은 페이지부터 처리')
+    parser.add_argument('--profile', action='store_true', help='--sync를 cProfile/tracemalloc으로 프로파일링 (cache/profile/)')
+    parser.add_argument('--offline', action='store_true', help='네트워크 없이 HTTP 응답 캐시만으로 실행')
+    parser.add_argument('--no-http-cache', action='store_true', help='HTTP 응답 캐시/조건부 요청 사용 안 함')
+    parser.add_argument('--rebuild', action='store_true', help='보관된 원본으로 마크다운/인덱스 재생성 (네트워크 불필요)')
+    parser.add_argument('--workers', type=int, help='--rebuild 변환 프로세스 수 / --verify 검사 스레드 수')
+    parser.add_argument('--verify', action='store_true', help='캐시 무결성 검사 (해시/누락/고아 파일) 후 문제 페이지만 복구')
+    parser.add_argument('--export-snapshot', type=str, metavar='PATH', help='캐시/인덱스를 스냅샷(tar.gz)으로 내보내기 (- 는 표준 출력)')
+    parser.add_argument('--import-snapshot', type=str, metavar='PATH', help='스냅샷을 검증 후 캐시로 가져오기 (- 는 표준 입력)')
+    parser.add_argument('--include-raw', action='store_true', help='--export-snapshot에 원본 본문(raw/) 포함')
+    parser.add_argument('--include-history', action='store_true', help='--export-snapshot에 버전 이력(history/) 포함')
+    parser.add_argument('--force', action='store_true', help='--import-snapshot 시 기존 캐시 덮어쓰기')
+    parser.add_argument('--diff', type=str, metavar='PAGE_ID', help='로컬 버전 이력으로 페이지 변경 내용 보기')
+    parser.add_argument('--since', type=str, metavar='DATE', help='--diff 비교 기준 날짜 (예: 2025-09-01, 기본: 직전 버전)')
     parser.add_argument('--list', action='store_true', help='캐시된 페이지 목록 보기')
     parser.add_argument('--search', type=str, help='문서 검색')
+    parser.add_argument('--local', type=str, help='로컬 캐시 검색 (인증/네트워크 불필요)')
+    parser.add_argument('--titles', type=str, metavar='PREFIX', help='제목 자동완성 (조합 중인 글자/초성 가능, 네트워크 불필요)')
     
     args = parser.parse_args()
+    try:
+        budget = sync_scheduler.parse_budget(args.budget)
+    except ValueError as e:
+        parser.error(str(e))
+    
+    if args.rebuild:
+        rebuild_cache(args.workers)
+        return
+    
+    if args.verify:
+        try:
+            verify_cache(args.workers, offline=args.offline, http_cache=not args.no_http_cache)
+        except OSError as e:
+            print(f"\n❌ 검사 오류: {e}")
+        return
+    
+    if args.diff:
+        page_history.print_diff(CACHE_DIR, args.diff, args.since)
+        return
+    
+    if args.export_snapshot or args.import_snapshot:
+        # 표준 출력으로 스트리밍할 때는 진행 메시지를 stderr로
+        log = sys.stderr if args.export_snapshot == '-' else sys.stdout
+        try:
+            if args.export_snapshot:
+                result = snapshot.export_snapshot(CACHE_DIR, args.export_snapshot,
+                                                  args.include_raw, args.include_history)
+                print(f"📦 스냅샷 저장: {result['path']} ({result['pages']}개 페이지, {result['files']}개 파일, "
+                      f"{result['bytes'] / 1e6:.1f} MB, {result['seconds']:.1f}s)", file=log)
+                print(f"   sha256 {result['sha256']}", file=log)
+            else:
+                result = snapshot.import_snapshot(CACHE_DIR, args.import_snapshot, args.force)
+                checked = "아카이브 + 파일별 체크섬 확인" if result['verified_archive'] else "파일별 체크섬 확인"
+                print(f"📦 스냅샷 가져오기 완료: {result['pages']}개 페이지, {result['files']}개 파일 "
+                      f"({checked}, {result['seconds']:.1f}s)")
+                print(f"   스냅샷 동기화 시각: {result['synced_at']} → --sync로 이후 변경분만 받아오세요")
+        except (snapshot.SnapshotError, OSError) as e:
+            print(f"\n❌ 스냅샷 오류: {e}", file=log)
+        return
+    
+    if args.local:
+        if not semantic_index.is_available():
+            print("\n❌ 로컬 검색에는 numpy가 필요합니다: pip install numpy")
+            return
+        local_search.print_results(args.local, local_search.search(args.local, CACHE_DIR))
+        return
+    
+    if args.titles:
+        results = title_index.TitleIndex(CACHE_DIR).complete(args.titles, limit=20)
+        print(f"\n🔤 '{args.titles}' 제목 후보: {len(results)}개\n")
+        for result in results:
+            print(f"  - {result['title']} (ID: {result['id']})")
+        return
     
     try:
-        sync = ConfluenceSync()
+        sync = ConfluenceSync(offline=args.offline, http_cache=not args.no_http_cache)
         
         if args.fetch:
             pages = sync.get_all_pages()
@@ -309,8 +671,19 @@ def main():
             for page in pages:
                 print(f"  - {page['title']} (ID: {page['id']})")
         
+        elif args.sync and args.profile:
+            with ProfileSession(CACHE_DIR, "v1") as session:
+                sync.sync_all_pages(full=args.full, metrics_prom=args.metrics_prom, budget_seconds=budget)
+                if sync.last_metrics:
+                    session.conversions = sync.last_metrics.conversions
+            print(f"\n🔬 프로파일 저장: {session.out_dir}")
+            for path in session.files:
+                print(f"   - {path.name}")
+            if session.summary():
+                print(f"   {session.summary()}")
+        
         elif args.sync:
-            sync.sync_all_pages()
+            sync.sync_all_pages(full=args.full, metrics_prom=args.metrics_prom, budget_seconds=budget)
         
         elif args.list:
             sync.list_cached_pages()
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+동기화 실행 지표 수집 및 내보내기
+단계별 소요 시간(목록 조회, 본문 요청, 변환, 저장, 인덱스), 엔드포인트별 요청 수/지연,
+재시도 횟수, 다운로드 바이트, 변경/생략/실패 페이지 수를 기록합니다.
+
+출력:
+    cache/sync_report.json     # 마지막 실행 보고서
+    cache/sync_history.jsonl   # 실행마다 한 줄씩 누적 (추이 확인용, 5 MB를 넘으면 최근 절반만 유지)
+    --metrics-prom <경로>      # Prometheus text format (node_exporter textfile collector용)
+"""
+
+import os
+import re
+import json
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, List
+
+REPORT_FILE = "sync_report.json"
+HISTORY_FILE = "sync_history.jsonl"
+# 실행 기록: 이 크기를 넘으면 최근 절반만 남김
+HISTORY_MAX_BYTES = 5 * 1024 * 1024
+
+PHASES = ("list", "fetch", "convert", "write", "index")
+
+_ID_SEGMENT = re.compile(r'/\d+(?=/|$)')
+_CLOUD_PREFIX = re.compile(r'^/ex/confluence/[^/]+')
+
+
+def endpoint_label(url: str) -> str:
+    """URL을 엔드포인트 라벨로 정규화 (호스트, cloud id, 페이지 ID 제거)"""
+    path = re.sub(r'^[a-z]+://[^/]+', '', url).split('?')[0]
+    path = _CLOUD_PREFIX.sub('', path)
+    return _ID_SEGMENT.sub('/{id}', path)
+
+
+def _percentile(values: List[float], ratio: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(ratio * (len(ordered) - 1))))]
+
+
+class SyncMetrics:
+    """동기화 1회 실행 지표"""
+
+    def __init__(self, source: str, space_key: str = ""):
+        self.source = source
+        self.space_key = space_key
+        self.started_at = datetime.now()
+        self._start = time.perf_counter()
+        self.duration = None
+
+        self.phases = {phase: 0.0 for phase in PHASES}
+        self.latencies = {}
+        self.statuses = {}
+        self.retries = {}
+        self.bytes_downloaded = 0
+        self.pages = {"total": 0, "changed": 0, "skipped": 0, "failed": 0}
+        self.conversions = []  # [(page_id, title, HTML 바이트, 초)]
+        self.extra = {}
+
+    @contextmanager
+    def phase(self, name: str):
+        """with metrics.phase("convert"): ... 형태로 단계 시간 누적"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - start
+
+    @contextmanager
+    def conversion(self, page_id: str, title: str, nbytes: int):
+        """페이지 하나의 변환 시간을 convert 단계에 누적하고 페이지별로도 기록"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.phases["convert"] += elapsed
+            self.conversions.append((page_id, title, nbytes, elapsed))
+
+    def record_request(self, url: str, seconds: float, status: Optional[int], nbytes: int):
+        endpoint = endpoint_label(url)
+        self.latencies.setdefault(endpoint, []).append(seconds)
+        by_status = self.statuses.setdefault(endpoint, {})
+        key = str(status) if status is not None else "error"
+        by_status[key] = by_status.get(key, 0) + 1
+        self.bytes_downloaded += nbytes
+
+    def record_retry(self, url: str):
+        endpoint = endpoint_label(url)
+        self.retries[endpoint] = self.retries.get(endpoint, 0) + 1
+
+    def count_page(self, state: str):
+        self.pages[state] = self.pages.get(state, 0) + 1
+
+    def finish(self):
+        self.duration = time.perf_counter() - self._start
+
+    # ------------------------------------------------------------------
+
+    def to_dict(self) -> dict:
+        requests = {}
+        for endpoint, values in self.latencies.items():
+            requests[endpoint] = {
+                "count": len(values),
+                "status": self.statuses.get(endpoint, {}),
+                "retries": self.retries.get(endpoint, 0),
+                "seconds_total": round(sum(values), 4),
+                "p50_ms": round(_percentile(values, 0.5) * 1000, 1),
+                "p95_ms": round(_percentile(values, 0.95) * 1000, 1),
+                "max_ms": round(max(values) * 1000, 1),
+            }
+
+        duration = self.duration if self.duration is not None else time.perf_counter() - self._start
+        return {
+            "source": self.source,
+            "space_key": self.space_key,
+            "started_at": self.started_at.isoformat(),
+            "duration_seconds": round(duration, 3),
+            "phases_seconds": {name: round(value, 4) for name, value in self.phases.items()},
+            "requests_total": sum(len(values) for values in self.latencies.values()),
+            "retries_total": sum(self.retries.values()),
+            "bytes_downloaded": self.bytes_downloaded,
+            "pages": dict(self.pages),
+            "requests": requests,
+            **self.extra,
+        }
+
+    def write_report(self, cache_dir: Path) -> dict:
+        """sync_report.json 저장 + sync_history.jsonl에 한 줄 추가"""
+        report = self.to_dict()
+        cache_dir = Path(cache_dir)
+        path = cache_dir / REPORT_FILE
+        tmp_path = path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+        history_path = cache_dir / HISTORY_FILE
+        with open(history_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(report, ensure_ascii=False) + "\n")
+        if history_path.stat().st_size > HISTORY_MAX_BYTES:
+            with open(history_path, 'r', encoding='utf-8') as f:
+                lines = f.readlines()
+            tmp_path = history_path.with_suffix('.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.writelines(lines[len(lines) // 2:])
+            os.replace(tmp_path, history_path)
+        return report
+
+    def write_prometheus(self, path: Path):
+        """Prometheus text exposition format으로 저장 (임시 파일 후 교체)"""
+        labels = f'source="{self.source}",space="{self.space_key}"'
+        lines = [
+            "# HELP confluence_sync_duration_seconds Total sync wall time.",
+            "# TYPE confluence_sync_duration_seconds gauge",
+            f"confluence_sync_duration_seconds{{{labels}}} {self.to_dict()['duration_seconds']}",
+            "# HELP confluence_sync_last_run_timestamp_seconds Unix time the sync started.",
+            "# TYPE confluence_sync_last_run_timestamp_seconds gauge",
+            f"confluence_sync_last_run_timestamp_seconds{{{labels}}} {int(self.started_at.timestamp())}",
+            "# HELP confluence_sync_phase_seconds Time spent per sync phase.",
+            "# TYPE confluence_sync_phase_seconds gauge",
+        ]
+        for name, value in self.phases.items():
+            lines.append(f'confluence_sync_phase_seconds{{{labels},phase="{name}"}} {value:.6f}')
+
+        lines += [
+            "# HELP confluence_sync_requests_total HTTP requests by endpoint and status.",
+            "# TYPE confluence_sync_requests_total counter",
+        ]
+        for endpoint, by_status in sorted(self.statuses.items()):
+            for status, count in sorted(by_status.items()):
+                lines.append(f'confluence_sync_requests_total{{{labels},endpoint="{endpoint}",status="{status}"}} {count}')
+
+        lines += [
+            "# HELP confluence_sync_request_seconds_sum Total request latency by endpoint.",
+            "# TYPE confluence_sync_request_seconds_sum counter",
+        ]
+        for endpoint, values in sorted(self.latencies.items()):
+            lines.append(f'confluence_sync_request_seconds_sum{{{labels},endpoint="{endpoint}"}} {sum(values):.6f}')
+
+        lines += [
+            "# HELP confluence_sync_retries_total Retried HTTP requests by endpoint.",
+            "# TYPE confluence_sync_retries_total counter",
+        ]
+        for endpoint, count in sorted(self.retries.items()):
+            lines.append(f'confluence_sync_retries_total{{{labels},endpoint="{endpoint}"}} {count}')
+
+        lines += [
+            "# HELP confluence_sync_bytes_downloaded_total Response bytes downloaded.",
+            "# TYPE confluence_sync_bytes_downloaded_total counter",
+            f"confluence_sync_bytes_downloaded_total{{{labels}}} {self.bytes_downloaded}",
+            "# HELP confluence_sync_pages Pages by sync outcome.",
+            "# TYPE confluence_sync_pages gauge",
+        ]
+        for state, count in self.pages.items():
+            lines.append(f'confluence_sync_pages{{{labels},state="{state}"}} {count}')
+
+        path = Path(path)
+        tmp_path = path.with_name(path.name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(tmp_path, path)
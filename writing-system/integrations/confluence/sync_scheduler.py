@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+동기화 우선순위 스케줄러
+전체 동기화는 API 순서대로 처리하므로 실제로 자주 찾는 페이지가 마지막에 받아질 수 있습니다.
+변경된 페이지를 아래 우선순위로 정렬해 먼저 처리하고, 시간 예산(--budget 60s)이 끝나거나
+Ctrl+C로 중단되면 남은 페이지는 다음 동기화로 미룬 채 지금까지의 결과를 저장합니다.
+(미룬 페이지는 이전에 받아 둔 내용을 그대로 유지하므로 캐시는 언제나 사용 가능한 상태입니다.
+ 아직 받은 적 없는 새 페이지는 목록 정보만 deferred 항목으로 카탈로그에 남겨 다음 동기화에서 받습니다.)
+예산은 페이지 목록을 다 받은 뒤(start())부터 계산합니다.
+
+우선순위 점수 (높을수록 먼저):
+    고정 페이지   confluence_config.json sync.pinned_pages (ID 또는 제목)         +PINNED_WEIGHT
+    검색 빈도     cache/query_log.jsonl에서 최근 결과로 나온 횟수 (log 정규화)      x QUERY_WEIGHT
+    최근 수정     목록의 수정 시각 기준 지수 감쇠 (sync.recent_half_life_days)      x RECENT_WEIGHT
+
+사용법:
+    python sync_confluence.py --sync --budget 60s
+    python oauth_confluence.py --sync --budget 5m
+"""
+
+import re
+import json
+import math
+import time
+from datetime import datetime, timezone, timedelta
+from pathlib import Path
+from typing import Optional, List, Dict, Callable
+
+import local_search
+
+CONFIG_PATH = Path(__file__).parent / "confluence_config.json"
+
+PINNED_WEIGHT = 3.0
+QUERY_WEIGHT = 1.0
+RECENT_WEIGHT = 1.0
+DEFAULT_HALF_LIFE_DAYS = 14
+DEFAULT_QUERY_LOG_DAYS = 30
+DEFAULT_LABEL_REFRESH_MINUTES = 60
+
+_DURATION = re.compile(r'^\s*(\d+(?:\.\d+)?)\s*(ms|s|m|h)?\s*$')
+_UNITS = {"ms": 0.001, "s": 1, "m": 60, "h": 3600, None: 1}
+
+
+def parse_budget(value: Optional[str]) -> Optional[float]:
+    """'60s', '5m', '1h', '90'(초) → 초 (None이면 제한 없음)"""
+    if value is None:
+        return None
+    match = _DURATION.match(str(value))
+    if not match:
+        raise ValueError(f"시간 예산 형식이 올바르지 않습니다: {value} (예: 60s, 5m, 1h)")
+    return float(match.group(1)) * _UNITS[match.group(2)]
+
+
+def load_schedule_config() -> dict:
+    """
+    confluence_config.json의 sync 섹션에서 스케줄 설정 로드 (없으면 기본값)
+    label_refresh_minutes: v2 라벨 전체 조회 간격 (라벨만 바뀐 페이지가 반영되기까지 걸리는 최대 시간)
+    """
+    settings = {
+        "pinned_pages": [],
+        "recent_half_life_days": DEFAULT_HALF_LIFE_DAYS,
+        "query_log_days": DEFAULT_QUERY_LOG_DAYS,
+        "label_refresh_minutes": DEFAULT_LABEL_REFRESH_MINUTES,
+    }
+    try:
+        with open(CONFIG_PATH, 'r', encoding='utf-8') as f:
+            settings.update(json.load(f).get('sync', {}))
+    except (OSError, ValueError):
+        pass
+    return settings
+
+
+def _parse_time(value: Optional[str]) -> Optional[datetime]:
+    if not value or value == "Unknown":
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+class SyncScheduler:
+    """변경 페이지 처리 순서 + 시간 예산"""
+
+    def __init__(self, cache_dir: Path, budget_seconds: Optional[float] = None,
+                 settings: Optional[dict] = None):
+        self.cache_dir = Path(cache_dir)
+        self.budget_seconds = budget_seconds
+        self.settings = settings or load_schedule_config()
+        self.interrupted = False
+        self._start = None
+
+    # ------------------------------------------------------------------
+    # 우선순위
+    # ------------------------------------------------------------------
+
+    def query_counts(self) -> Dict[str, int]:
+        """최근 query_log.jsonl에서 페이지별 검색 결과 등장 횟수"""
+        since = (datetime.now() - timedelta(days=self.settings['query_log_days'])).isoformat()
+        return local_search.query_counts(self.cache_dir, since)
+
+    def order(self, pages: List[Dict], updated: Callable[[Dict], Optional[str]]) -> List[Dict]:
+        """
+        우선순위가 높은 순서로 정렬한 페이지 목록 (점수가 같으면 원래 순서)
+        updated: 페이지 → 최종 수정 시각 문자열 (API 버전마다 위치가 다름)
+        """
+        pinned = {str(value) for value in self.settings['pinned_pages']}
+        counts = self.query_counts()
+        max_count = math.log1p(max(counts.values())) if counts else 0.0
+        half_life = max(float(self.settings['recent_half_life_days']), 0.001)
+        now = datetime.now(timezone.utc)
+
+        def score(page: Dict) -> float:
+            value = 0.0
+            if page['id'] in pinned or page.get('title') in pinned:
+                value += PINNED_WEIGHT
+            if max_count:
+                value += QUERY_WEIGHT * math.log1p(counts.get(page['id'], 0)) / max_count
+            when = _parse_time(updated(page))
+            if when:
+                age_days = max((now - when).total_seconds() / 86400, 0.0)
+                value += RECENT_WEIGHT * 0.5 ** (age_days / half_life)
+            return value
+
+        scores = {page['id']: score(page) for page in pages}
+        return sorted(pages, key=lambda page: -scores[page['id']])
+
+    # ------------------------------------------------------------------
+    # 시간 예산
+    # ------------------------------------------------------------------
+
+    def start(self):
+        """예산 시계 시작 (페이지 목록을 다 받은 뒤 호출해 목록 요청 시간은 예산에서 빼기)"""
+        self._start = time.monotonic()
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self._start if self._start is not None else 0.0
+
+    def expired(self) -> bool:
+        """예산을 다 썼거나 중단 요청을 받았으면 True (이후 변경 페이지는 다음 동기화로 미룸)"""
+        if self.interrupted:
+            return True
+        return self.budget_seconds is not None and self.elapsed >= self.budget_seconds
+
+    def interrupt(self):
+        """Ctrl+C 등으로 중단: 남은 페이지는 미루고 지금까지 결과만 저장"""
+        self.interrupted = True
+
+    def stats(self, deferred: int) -> dict:
+        return {
+            "budget_seconds": self.budget_seconds,
+            "elapsed_seconds": round(self.elapsed, 3),
+            "deferred": deferred,
+            "interrupted": self.interrupted,
+        }
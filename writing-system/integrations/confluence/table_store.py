@@ -0,0 +1,377 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+명세 표 구조화 추출
+동기화 시 페이지 본문(storage format)의 모든 <table>을 행/열 구조로 뽑아
+페이지 ID + 표 번호 단위로 저장하고, page_index.json 항목의 "tables"에 기록합니다.
+"01. 테이블 명세" 같은 페이지를 마크다운으로 뭉개진 텍스트 대신 열 조건으로 조회할 수 있습니다.
+
+캐시 구조:
+    cache/tables/<페이지ID>_<번호>.csv       # 엑셀에서 바로 열 수 있는 UTF-8(BOM) CSV
+    cache/tables/<페이지ID>_<번호>.jsonl     # 행마다 {열 이름: 값}
+    cache/tables/<페이지ID>_<번호>.parquet   # pyarrow가 있을 때만
+
+사용법:
+    python table_store.py --list                          # 표가 있는 페이지 목록
+    python table_store.py --list --title 명세             # 제목으로 거르기
+    python table_store.py --show 736988863:0              # 표 하나 보기
+    python table_store.py --where "테이블명=BotConfig"     # 열 조건 조회 (열 이름/값 모두 부분 일치)
+"""
+
+import sys
+import csv
+import json
+import argparse
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import Optional, List, Dict, Iterable, Iterator, Tuple
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # pyarrow가 없으면 parquet 파일을 만들지 않음
+    pyarrow = None
+
+# Windows 콘솔 UTF-8 출력 설정
+if sys.platform == 'win32':
+    import io
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
+
+CACHE_DIR = Path(__file__).parent / "cache"
+INDEX_FILENAME = "page_index.json"
+TABLES_DIRNAME = "tables"
+
+# 잘못된 colspan/rowspan 값으로 표가 터무니없이 커지지 않도록 제한
+MAX_SPAN = 100
+_CELL_BREAK_TAGS = ("br", "p", "li", "div")
+
+
+class _TableParser(HTMLParser):
+    """storage format에서 표를 [행 → (셀 텍스트, th 여부, colspan, rowspan)] 목록으로 수집"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.tables = []   # 여는 순서대로 (중첩 표도 별도 표로 포함)
+        self._open = []    # 열려 있는 표 스택: {"slot", "rows", "row", "cell"}
+
+    def _close_cell(self, table):
+        cell = table["cell"]
+        if cell is not None:
+            text = "".join(cell["text"])
+            text = "\n".join(" ".join(line.split()) for line in text.split("\n"))
+            cell["text"] = "\n".join(line for line in text.split("\n") if line)
+            if table["row"] is None:
+                table["row"] = []
+            table["row"].append(cell)
+            table["cell"] = None
+
+    def _close_row(self, table):
+        self._close_cell(table)
+        if table["row"]:
+            table["rows"].append(table["row"])
+        table["row"] = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "table":
+            self.tables.append(None)
+            self._open.append({"slot": len(self.tables) - 1, "rows": [], "row": None, "cell": None})
+            return
+        if not self._open:
+            return
+        table = self._open[-1]
+        if tag == "tr":
+            self._close_row(table)
+            table["row"] = []
+        elif tag in ("td", "th"):
+            self._close_cell(table)
+            attrs = dict(attrs)
+            table["cell"] = {
+                "text": [],
+                "header": tag == "th",
+                "colspan": _span(attrs.get("colspan")),
+                "rowspan": _span(attrs.get("rowspan")),
+            }
+        elif tag in _CELL_BREAK_TAGS and table["cell"] is not None:
+            table["cell"]["text"].append("\n")
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+
+    def handle_endtag(self, tag):
+        if not self._open:
+            return
+        table = self._open[-1]
+        if tag == "table":
+            self._close_row(table)
+            self._open.pop()
+            self.tables[table["slot"]] = table["rows"]
+            # 중첩 표의 내용은 바깥 셀에도 텍스트로 남김
+            if self._open and self._open[-1]["cell"] is not None:
+                text = "\n".join(" | ".join(cell["text"] for cell in row) for row in table["rows"])
+                self._open[-1]["cell"]["text"].append("\n" + text + "\n")
+        elif tag == "tr":
+            self._close_row(table)
+        elif tag in ("td", "th"):
+            self._close_cell(table)
+
+    def handle_data(self, data):
+        if self._open and self._open[-1]["cell"] is not None:
+            self._open[-1]["cell"]["text"].append(data)
+
+    def unknown_decl(self, data):
+        # <ac:plain-text-body><![CDATA[...]]> 안의 텍스트
+        if data.startswith("CDATA["):
+            self.handle_data(data[len("CDATA["):])
+
+
+def _span(value: Optional[str]) -> int:
+    try:
+        return max(1, min(int(value), MAX_SPAN))
+    except (TypeError, ValueError):
+        return 1
+
+
+def _to_grid(rows: List[List[dict]]) -> List[List[str]]:
+    """colspan/rowspan을 펼쳐 직사각형 격자로 변환 (병합된 셀은 값을 복제)"""
+    grid = []
+    carry = {}  # 열 번호 -> [텍스트, 남은 행 수] (위 행의 rowspan)
+    for row in rows:
+        out = {}
+        new_carry = {}
+        col = 0
+        for cell in row:
+            while col in carry:
+                out[col] = carry[col][0]
+                col += 1
+            for _ in range(cell["colspan"]):
+                out[col] = cell["text"]
+                if cell["rowspan"] > 1:
+                    new_carry[col] = [cell["text"], cell["rowspan"] - 1]
+                col += 1
+        for column, (text, _) in carry.items():
+            out.setdefault(column, text)
+
+        width = max(out) + 1 if out else 0
+        grid.append([out.get(i, "") for i in range(width)])
+
+        carry = {column: [text, left - 1] for column, (text, left) in carry.items() if left > 1}
+        carry.update(new_carry)
+
+    width = max((len(row) for row in grid), default=0)
+    return [row + [""] * (width - len(row)) for row in grid]
+
+
+def _column_names(header: List[str], width: int) -> List[str]:
+    """빈 이름은 col_N, 중복 이름은 _2, _3을 붙여 고유하게"""
+    names = []
+    seen = {}
+    for i in range(width):
+        name = " ".join(header[i].split()) if i < len(header) and header[i].strip() else f"col_{i + 1}"
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}_{seen[name]}"
+        else:
+            seen[name] = 1
+        names.append(name)
+    return names
+
+
+def extract_tables(html: str) -> List[Dict]:
+    """
+    storage format HTML의 모든 표 추출
+    첫 행이 모두 <th>이면 열 이름으로 쓰고, 아니면 col_1, col_2, ...를 붙입니다.
+    반환: [{"columns": [...], "rows": [[...], ...]}] (빈 표 제외, 문서 순서)
+    """
+    if not html or "<table" not in html:
+        return []
+    parser = _TableParser()
+    parser.feed(html)
+    parser.close()
+
+    tables = []
+    for rows in parser.tables:
+        if not rows:
+            continue
+        grid = _to_grid(rows)
+        if not grid or not grid[0]:
+            continue
+        has_header = all(cell["header"] for cell in rows[0])
+        columns = _column_names(grid[0] if has_header else [], len(grid[0]))
+        tables.append({"columns": columns, "rows": grid[1:] if has_header else grid})
+    return tables
+
+
+class TableStore:
+    """페이지별 표 파일 저장소 (cache/tables/)"""
+
+    def __init__(self, cache_dir: Path):
+        self.cache_dir = Path(cache_dir)
+        self.dir = self.cache_dir / TABLES_DIRNAME
+
+    def _remove(self, page_id: str):
+        if self.dir.exists():
+            for path in self.dir.glob(f"{page_id}_*"):
+                path.unlink()
+
+    def save(self, page_id: str, tables: List[Dict]) -> List[Dict]:
+        """
+        페이지의 표를 저장하고 page_index.json "tables"에 넣을 요약 반환
+        (이전 동기화에서 저장한 같은 페이지의 표 파일은 먼저 지움)
+        """
+        self._remove(page_id)
+        if not tables:
+            return []
+        self.dir.mkdir(parents=True, exist_ok=True)
+
+        catalog = []
+        for number, table in enumerate(tables):
+            stem = f"{page_id}_{number}"
+            columns, rows = table["columns"], table["rows"]
+
+            with open(self.dir / f"{stem}.csv", 'w', encoding='utf-8-sig', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(columns)
+                writer.writerows(rows)
+            with open(self.dir / f"{stem}.jsonl", 'w', encoding='utf-8') as f:
+                for row in rows:
+                    f.write(json.dumps(dict(zip(columns, row)), ensure_ascii=False) + "\n")
+
+            entry = {
+                "index": number,
+                "columns": columns,
+                "rows": len(rows),
+                "csv": f"{TABLES_DIRNAME}/{stem}.csv",
+                "jsonl": f"{TABLES_DIRNAME}/{stem}.jsonl",
+            }
+            if pyarrow is not None:
+                arrow_table = pyarrow.table({name: [row[i] for row in rows] for i, name in enumerate(columns)})
+                pyarrow.parquet.write_table(arrow_table, self.dir / f"{stem}.parquet")
+                entry["parquet"] = f"{TABLES_DIRNAME}/{stem}.parquet"
+            catalog.append(entry)
+        return catalog
+
+    def load(self, page_id: str, number: int) -> Optional[List[Dict]]:
+        """표 하나를 [{열 이름: 값}] 목록으로 로드 (없으면 None)"""
+        path = self.dir / f"{page_id}_{number}.jsonl"
+        if not path.exists():
+            return None
+        with open(path, 'r', encoding='utf-8') as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def prune(self, keep_ids: Iterable[str]) -> int:
+        """인덱스에 없는 페이지의 표 파일 삭제, 삭제 수 반환"""
+        if not self.dir.exists():
+            return 0
+        keep = set(keep_ids)
+        removed = 0
+        for path in self.dir.iterdir():
+            if path.name.split("_", 1)[0] not in keep:
+                path.unlink()
+                removed += 1
+        return removed
+
+
+def _load_catalog(cache_dir: Path) -> Optional[dict]:
+    index_file = Path(cache_dir) / INDEX_FILENAME
+    if not index_file.exists():
+        return None
+    with open(index_file, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _match(text: str, needle: str) -> bool:
+    return needle.lower() in text.lower()
+
+
+def query_tables(cache_dir: Path, filters: Dict[str, str], title: Optional[str] = None,
+                 limit: int = 100) -> Iterator[Tuple[dict, dict, Dict[str, str]]]:
+    """
+    열 조건으로 표 행 조회
+    filters: {열 이름: 값} - 열 이름과 값 모두 대소문자 무시 부분 일치, 모든 조건을 만족하는 행만
+    title: 페이지 제목 부분 일치 필터
+    반환: (페이지 항목, 표 요약, 행) 반복자
+    """
+    catalog = _load_catalog(cache_dir)
+    if not catalog:
+        return
+    store = TableStore(cache_dir)
+    found = 0
+    for page in catalog['pages']:
+        if title and not _match(page['title'], title):
+            continue
+        for table in page.get('tables', []):
+            # 모든 조건의 열이 이 표에 있어야 함 (열 목록은 카탈로그만 보고 판단)
+            matched_columns = {key: [c for c in table['columns'] if _match(c, key)] for key in filters}
+            if any(not columns for columns in matched_columns.values()):
+                continue
+            for row in store.load(page['id'], table['index']) or []:
+                if all(any(_match(row.get(column, ""), value) for column in matched_columns[key])
+                       for key, value in filters.items()):
+                    yield page, table, row
+                    found += 1
+                    if found >= limit:
+                        return
+
+
+def main():
+    parser = argparse.ArgumentParser(description='캐시된 Confluence 표 조회')
+    parser.add_argument('--list', action='store_true', help='표가 있는 페이지 목록')
+    parser.add_argument('--show', type=str, metavar='PAGE_ID[:N]', help='표 내용 보기 (N 생략 시 모든 표)')
+    parser.add_argument('--where', action='append', default=[], metavar='COL=VALUE', help='열 조건 (여러 번 지정 가능)')
+    parser.add_argument('--title', type=str, help='페이지 제목 필터 (부분 일치)')
+    parser.add_argument('--limit', type=int, default=100, help='--where 최대 행 수 (기본: 100)')
+    parser.add_argument('--cache-dir', type=str, default=str(CACHE_DIR), help='캐시 폴더 (기본: ./cache)')
+
+    args = parser.parse_args()
+    cache_dir = Path(args.cache_dir)
+    catalog = _load_catalog(cache_dir)
+    if not catalog:
+        print("❌ 캐시된 데이터가 없습니다. --sync를 먼저 실행하세요.")
+        return
+
+    if args.where:
+        filters = {}
+        for condition in args.where:
+            column, sep, value = condition.partition("=")
+            if not sep:
+                parser.error(f"--where 형식은 열=값 입니다: {condition}")
+            filters[column.strip()] = value.strip()
+        count = 0
+        for page, table, row in query_tables(cache_dir, filters, args.title, args.limit):
+            count += 1
+            print(f"\n📋 {page['title']} (표 {table['index']}, {page['id']})")
+            for column, value in row.items():
+                if value:
+                    print(f"   {column}: {value}")
+        print(f"\n🔍 {count}개 행")
+
+    elif args.show:
+        page_id, _, number = args.show.partition(":")
+        page = next((p for p in catalog['pages'] if p['id'] == page_id), None)
+        if not page or not page.get('tables'):
+            print(f"❌ {page_id}에 추출된 표가 없습니다.")
+            return
+        store = TableStore(cache_dir)
+        for table in page['tables']:
+            if number and table['index'] != int(number):
+                continue
+            print(f"\n📋 {page['title']} - 표 {table['index']} ({table['rows']}행)")
+            print("   " + " | ".join(table['columns']))
+            for row in store.load(page_id, table['index']) or []:
+                print("   " + " | ".join(row.get(column, "").replace("\n", " / ") for column in table['columns']))
+
+    elif args.list:
+        pages = [p for p in catalog['pages'] if p.get('tables') and (not args.title or _match(p['title'], args.title))]
+        print(f"\n📋 표가 있는 페이지 {len(pages)}개\n")
+        for page in pages:
+            print(f"  {page['id']}  {page['title']}")
+            for table in page['tables']:
+                print(f"      [{table['index']}] {table['rows']}행: {', '.join(table['columns'][:8])}"
+                      + (" ..." if len(table['columns']) > 8 else ""))
+    else:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
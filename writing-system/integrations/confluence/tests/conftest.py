@@ -0,0 +1,77 @@
+"""
+공용 픽스처: 모의 Confluence 서버와 임시 캐시 디렉토리로 두 CLI를 구성합니다.
+실행: python -m pytest -q writing-system/integrations/confluence/tests
+"""
+
+import sys
+import json
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from mock_confluence_server import MockConfluence, SPACE_KEY, CLOUD_ID  # noqa: E402
+
+
+@pytest.fixture
+def mock():
+    server = MockConfluence(pages=30, body_kb=2, seed=3)
+    server.start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def cache_dir(tmp_path):
+    path = tmp_path / "cache"
+    path.mkdir()
+    return path
+
+
+@pytest.fixture
+def v1_sync(mock, cache_dir, monkeypatch):
+    """모의 서버를 바라보는 API v1 클라이언트"""
+    import sync_confluence
+
+    monkeypatch.setenv('CONFLUENCE_EMAIL', 'test@example.com')
+    monkeypatch.setenv('CONFLUENCE_API_TOKEN', 'test-token')
+    monkeypatch.setattr(sync_confluence, 'CACHE_DIR', cache_dir)
+    monkeypatch.setattr(sync_confluence, 'INDEX_FILE', cache_dir / "page_index.json")
+
+    def make(offline: bool = False, http_cache: bool = True):
+        client = sync_confluence.ConfluenceSync(offline=offline, http_cache=http_cache)
+        client.base_url = mock.base_url
+        client.space_key = SPACE_KEY
+        return client
+
+    return make
+
+
+@pytest.fixture
+def v2_sync(mock, cache_dir, tmp_path, monkeypatch):
+    """모의 서버를 바라보는 API v2(OAuth) 클라이언트"""
+    import oauth_confluence
+
+    config_path = tmp_path / "oauth_config.json"
+    token_path = tmp_path / "oauth_token.json"
+    config_path.write_text(json.dumps({"cloud_id": CLOUD_ID, "site_url": mock.base_url}))
+    token_path.write_text(json.dumps({"access_token": "test-token", "refresh_token": "test-refresh"}))
+
+    monkeypatch.setenv('CONFLUENCE_CLIENT_ID', 'test-client')
+    monkeypatch.setenv('CONFLUENCE_CLIENT_SECRET', 'test-secret')
+    monkeypatch.setattr(oauth_confluence, 'CACHE_DIR', cache_dir)
+    monkeypatch.setattr(oauth_confluence, 'INDEX_FILE', cache_dir / "page_index.json")
+    monkeypatch.setattr(oauth_confluence, 'API_URL', mock.base_url)
+    monkeypatch.setattr(oauth_confluence, 'CONFIG_PATH', config_path)
+    monkeypatch.setattr(oauth_confluence, 'TOKEN_PATH', token_path)
+
+    def make(offline: bool = False, http_cache: bool = True):
+        return oauth_confluence.ConfluenceOAuth(offline=offline, http_cache=http_cache)
+
+    return make
+
+
+def load_index(cache_dir: Path) -> dict:
+    with open(cache_dir / "page_index.json", 'r', encoding='utf-8') as f:
+        return json.load(f)
@@ -0,0 +1,131 @@
+"""cache_verify: 손상/누락 페이지 검사와 복구 (--verify)"""
+
+import json
+
+import pytest
+
+import cache_verify
+import oauth_confluence
+import page_store
+import raw_store
+import sync_confluence
+from conftest import load_index
+
+
+def save_index(cache_dir, index):
+    with open(cache_dir / "page_index.json", 'w', encoding='utf-8') as f:
+        json.dump(index, f, ensure_ascii=False)
+
+
+@pytest.fixture
+def synced(v1_sync, cache_dir):
+    v1_sync().sync_all_pages()
+    return load_index(cache_dir)
+
+
+def test_clean_cache_has_no_problems(synced, cache_dir):
+    check = cache_verify.check_cache(cache_dir, synced)
+    assert check["pages"] == check["ok"] == len(synced['pages'])
+    assert check["broken"] == {}
+    assert check["orphans"] == []
+
+
+def test_check_detects_broken_duplicate_and_orphan_files(synced, cache_dir):
+    first, second = synced['pages'][:2]
+    (cache_dir / first['filename']).write_bytes(b"garbage")
+    (cache_dir / second['filename']).unlink()
+    (cache_dir / "stray_page.md").write_text("# stray\n")
+    synced['pages'].append(dict(synced['pages'][3]))
+
+    check = cache_verify.check_cache(cache_dir, synced)
+    assert check["broken"] == {first['id']: "hash", second['id']: "missing"}
+    assert check["duplicates"] == 1
+    assert check["orphans"] == ["stray_page.md"]
+    assert len(synced['pages']) == check["pages"]
+
+
+def test_entries_without_sha1_are_checked_and_hashed(synced, cache_dir):
+    for page in synced['pages']:
+        page.pop('sha1', None)
+    truncated = synced['pages'][0]
+    store = page_store.PageStore(cache_dir)
+    codec = page_store.codec_of(truncated['filename'])
+    text = store.read(truncated['filename'])
+    (cache_dir / truncated['filename']).write_bytes(store.encode(text[:len(text) // 2], codec))
+
+    check = cache_verify.check_cache(cache_dir, synced)
+    assert check["broken"] == {truncated['id']: "truncated"}
+    assert check["hashed"] == len(synced['pages']) - 1
+    assert all(page.get('sha1') for page in synced['pages'][1:])
+
+
+def test_deferred_entries_are_not_checked(synced, cache_dir):
+    synced['pages'].append({"id": "999999", "title": "New", "filename": "999999_New.md",
+                            "version": None, "deferred": True})
+    check = cache_verify.check_cache(cache_dir, synced)
+    assert check["broken"] == {}
+    assert check["pages"] == len(synced['pages']) - 1
+
+
+def test_verify_rebuilds_from_raw_fetches_missing_and_removes_orphans(synced, v1_sync, cache_dir):
+    expected = {page['id']: (cache_dir / page['filename']).read_bytes() for page in synced['pages']}
+    from_raw, refetch, gone = synced['pages'][:3]
+    (cache_dir / from_raw['filename']).write_bytes(b"garbage")
+    (cache_dir / refetch['filename']).unlink()
+    raw_store.RawStore(cache_dir).path(refetch['id']).unlink()
+    (cache_dir / "stray_page.md").write_text("# stray\n")
+    (cache_dir / gone['filename']).unlink()
+    raw_store.RawStore(cache_dir).path(gone['id']).unlink()
+    fetched = []
+
+    def fetch(entry):
+        fetched.append(entry['id'])
+        if entry['id'] == gone['id']:
+            return None
+        return v1_sync().fetch_page_body(entry['id'])
+
+    worker = cache_verify.page_worker(sync_confluence.html_to_text, sync_confluence.render_markdown)
+    result = cache_verify.verify_cache(cache_dir, worker, fetch, sync_confluence.CACHE_MESSAGES)
+
+    assert result["repair"]["rebuilt"] == [from_raw['id']]
+    assert result["repair"]["fetched"] == [refetch['id']]
+    assert result["repair"]["deleted"] == [gone['id']]
+    assert sorted(fetched) == sorted([refetch['id'], gone['id']])
+    assert not (cache_dir / "stray_page.md").exists()
+
+    index = load_index(cache_dir)
+    assert gone['id'] not in {page['id'] for page in index['pages']}
+    for page in index['pages']:
+        assert (cache_dir / page['filename']).read_bytes() == expected[page['id']]
+    assert cache_verify.check_cache(cache_dir, index)["broken"] == {}
+
+
+def test_verify_without_fetch_reports_failures(synced, cache_dir):
+    victim = synced['pages'][0]
+    (cache_dir / victim['filename']).unlink()
+    raw_store.RawStore(cache_dir).path(victim['id']).unlink()
+
+    worker = cache_verify.page_worker(sync_confluence.html_to_text, sync_confluence.render_markdown)
+    result = cache_verify.verify_cache(cache_dir, worker, None, sync_confluence.CACHE_MESSAGES)
+    assert list(result["repair"]["failed"]) == [victim['id']]
+
+
+def test_v2_cli_verify_repairs_pages(v2_sync, cache_dir):
+    v2_sync().sync_pages()
+    index = load_index(cache_dir)
+    expected = {page['id']: (cache_dir / page['filename']).read_bytes() for page in index['pages']}
+    corrupt, missing = index['pages'][:2]
+    (cache_dir / corrupt['filename']).write_bytes(b"garbage")
+    (cache_dir / missing['filename']).unlink()
+    raw_store.RawStore(cache_dir).path(missing['id']).unlink()
+
+    result = oauth_confluence.verify_cache()
+    assert result["repair"]["rebuilt"] == [corrupt['id']]
+    assert result["repair"]["fetched"] == [missing['id']]
+    for page in load_index(cache_dir)['pages']:
+        assert (cache_dir / page['filename']).read_bytes() == expected[page['id']]
+
+
+def test_verify_without_catalog_returns_none(cache_dir):
+    worker = cache_verify.page_worker(sync_confluence.html_to_text, sync_confluence.render_markdown)
+    assert cache_verify.verify_cache(cache_dir, worker, None, sync_confluence.CACHE_MESSAGES) is None
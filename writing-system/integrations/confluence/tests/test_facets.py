@@ -0,0 +1,105 @@
+"""facets: 비트맵 교집합 조회, v2 작성자 패싯, 라벨 전체 조회 주기"""
+
+import json
+
+import pytest
+
+from facets import FacetIndex, bitmap_positions
+from conftest import load_index
+
+LABEL_SWEEP = "v2/spaces/{id}/content/labels"
+USER_BULK = "v1/user/bulk"
+
+
+@pytest.fixture
+def facet_index(cache_dir):
+    pages = [
+        {"id": "1", "title": "Combat", "labels": ["design", "combat"], "created_by": "Kim", "updated_by": "Lee",
+         "updated_date": "2025-09-01T10:00:00", "ancestors": []},
+        {"id": "2", "title": "Skills", "labels": ["design"], "created_by": "Lee", "updated_by": "Lee",
+         "updated_date": "2025-09-15T10:00:00", "ancestors": ["1"]},
+        {"id": "3", "title": "Notes", "labels": ["meeting"], "created_by": "Park", "updated_by": "Kim",
+         "updated_date": "2025-10-02T10:00:00", "ancestors": ["1"]},
+        {"id": "4", "title": "Ticket", "labels": ["design"], "assignee": "Park", "updated_by": "Unknown",
+         "updated_date": "Unknown", "source": "jira"},
+    ]
+    index = FacetIndex(cache_dir)
+    index.build(pages)
+    return index
+
+
+def test_bitmap_positions():
+    assert bitmap_positions(0) == []
+    assert bitmap_positions(0b101001) == [0, 3, 5]
+    assert bitmap_positions(1 << 200) == [200]
+
+
+def test_values_within_a_facet_are_or_and_facets_are_and(facet_index):
+    assert facet_index.matching_ids({"label": ["design"]}) == ["1", "2", "4"]
+    assert facet_index.matching_ids({"label": ["combat", "meeting"]}) == ["1", "3"]
+    assert facet_index.matching_ids({"label": ["design"], "updated_by": ["Lee"]}) == ["1", "2"]
+    assert facet_index.matching_ids({"label": ["design"], "author": ["Park"]}) == ["4"]
+    assert facet_index.matching_ids({"label": ["meeting"], "source": ["jira"]}) == []
+    assert facet_index.matching_ids({"label": []}) == ["1", "2", "3", "4"]
+
+
+def test_ancestor_matches_by_title_and_dates_narrow_results(facet_index):
+    assert facet_index.matching_ids({"ancestor": ["combat"]}) == ["2", "3"]
+    assert facet_index.matching_ids({"ancestor": ["Combat"]}, since="2025-10") == ["3"]
+    assert facet_index.matching_ids(until="2025-09-15") == ["1", "2"]
+
+
+def test_unknown_facet_is_rejected(facet_index):
+    with pytest.raises(ValueError):
+        facet_index.query({"color": ["red"]})
+
+
+def test_index_is_reloaded_from_disk(facet_index, cache_dir):
+    reopened = FacetIndex(cache_dir)
+    assert reopened.ids == facet_index.ids
+    assert reopened.query({"label": ["design"]}) == facet_index.query({"label": ["design"]})
+
+
+def test_v2_sync_fills_author_facets(mock, v2_sync, cache_dir):
+    v2_sync().sync_pages()
+    pages = {page['id']: page for page in load_index(cache_dir)['pages']}
+    for source in mock.pages:
+        entry = pages[source['id']]
+        assert entry['created_by'] == "Mock User"
+        assert entry['updated_by'] == source['author']
+        assert entry['updated_by_id']
+
+    index = FacetIndex(cache_dir)
+    index.build(list(pages.values()))
+    author = mock.pages[0]['author']
+    expected = sorted(page['id'] for page in mock.pages if page['author'] == author)
+    assert sorted(index.matching_ids({"updated_by": [author]})) == expected
+
+    # 이미 아는 계정은 다시 조회하지 않음
+    mock.reset_stats()
+    mock.touch(2)
+    v2_sync().sync_pages()
+    assert mock.stats()["requests_by_endpoint"].get(USER_BULK, 0) == 0
+
+
+def test_label_sweep_runs_only_after_refresh_interval(mock, v2_sync, cache_dir):
+    v2_sync().sync_pages()
+    assert load_index(cache_dir)['labels_synced_at']
+
+    mock.reset_stats()
+    mock.touch_labels(3, "hot")
+    v2_sync().sync_pages()
+    assert LABEL_SWEEP not in mock.stats()["requests_by_endpoint"]
+    labels = {page['id']: page['labels'] for page in load_index(cache_dir)['pages']}
+    assert "hot" not in labels[mock.pages[2]['id']]
+
+    index = load_index(cache_dir)
+    index['labels_synced_at'] = "2020-01-01T00:00:00"
+    with open(cache_dir / "page_index.json", 'w', encoding='utf-8') as f:
+        json.dump(index, f, ensure_ascii=False)
+
+    mock.reset_stats()
+    v2_sync().sync_pages()
+    assert mock.stats()["requests_by_endpoint"][LABEL_SWEEP] == 1
+    labels = {page['id']: page['labels'] for page in load_index(cache_dir)['pages']}
+    assert all("hot" in labels[page['id']] for page in mock.pages[:3])
@@ -0,0 +1,106 @@
+"""http_client: 조건부 요청(304), 본문 없는 캐시 항목, 오프라인 모드"""
+
+import pytest
+
+import http_client
+from http_client import OfflineCacheMiss, ResponseCache
+from conftest import load_index
+
+HEADERS = {"Accept": "application/json"}
+
+
+def content_url(mock, page_id):
+    return f"{mock.base_url}/wiki/rest/api/content/{page_id}"
+
+
+@pytest.fixture
+def page_id(mock):
+    return mock.pages[1]['id']
+
+
+def test_second_request_is_answered_from_cache_with_304(mock, cache_dir, page_id):
+    cache = ResponseCache(cache_dir)
+    params = {"expand": "body.storage"}
+    first = http_client.get(content_url(mock, page_id), HEADERS, params, cache=cache, cacheable=True)
+    assert first.status_code == 200
+    assert cache.stats()["stored"] == 1
+
+    mock.reset_stats()
+    second = http_client.get(content_url(mock, page_id), HEADERS, params, cache=cache, cacheable=True)
+    assert second.status_code == 200
+    assert getattr(second, 'from_cache', False)
+    assert second.json() == first.json()
+    assert mock.stats()["not_modified"] == 1
+
+
+def test_missing_body_is_a_cache_miss(mock, cache_dir, page_id):
+    cache = ResponseCache(cache_dir)
+    url = content_url(mock, page_id)
+    http_client.get(url, HEADERS, cache=cache, cacheable=True)
+    (cache.dir / f"{cache.key(url)}.body.gz").unlink()
+
+    mock.reset_stats()
+    response = http_client.get(url, HEADERS, cache=cache, cacheable=True)
+    assert response.status_code == 200
+    assert not getattr(response, 'from_cache', False)
+    assert mock.stats()["not_modified"] == 0
+    assert (cache.dir / f"{cache.key(url)}.body.gz").exists()
+
+
+def test_corrupt_body_is_refetched_without_validators(mock, cache_dir, page_id):
+    cache = ResponseCache(cache_dir)
+    url = content_url(mock, page_id)
+    first = http_client.get(url, HEADERS, cache=cache, cacheable=True)
+    (cache.dir / f"{cache.key(url)}.body.gz").write_bytes(b"not gzip")
+
+    response = http_client.get(url, HEADERS, cache=cache, cacheable=True)
+    assert response.status_code == 200
+    assert response.json() == first.json()
+    assert cache.response(cache.lookup(url)) is not None
+
+
+def test_non_cacheable_requests_are_not_stored(mock, cache_dir, page_id):
+    cache = ResponseCache(cache_dir)
+    http_client.get(content_url(mock, page_id), HEADERS, cache=cache)
+    assert cache.stats()["stored"] == 0
+    assert not cache.dir.exists() or not any(cache.dir.iterdir())
+
+
+def test_offline_miss_raises(mock, cache_dir, page_id):
+    cache = ResponseCache(cache_dir, offline=True)
+    mock.reset_stats()
+    with pytest.raises(OfflineCacheMiss):
+        http_client.get(content_url(mock, page_id), HEADERS, cache=cache, cacheable=True)
+    assert mock.stats()["requests"] == 0
+
+
+def test_full_resync_uses_conditional_requests(mock, v1_sync, cache_dir):
+    v1_sync().sync_all_pages()
+    pages = len(load_index(cache_dir)['pages'])
+
+    mock.reset_stats()
+    client = v1_sync()
+    client.sync_all_pages(full=True)
+    stats = mock.stats()
+    assert stats["not_modified"] >= pages
+    assert client.http_cache.stats()["hits"] >= pages
+
+
+def test_offline_sync_makes_no_requests(mock, v1_sync, cache_dir):
+    v1_sync().sync_all_pages()
+    expected = {page['id'] for page in load_index(cache_dir)['pages']}
+
+    mock.reset_stats()
+    v1_sync(offline=True).sync_all_pages(full=True)
+    assert mock.stats()["requests"] == 0
+    assert {page['id'] for page in load_index(cache_dir)['pages']} == expected
+
+
+def test_v2_offline_sync_makes_no_requests(mock, v2_sync, cache_dir):
+    v2_sync().sync_pages()
+    expected = {page['id'] for page in load_index(cache_dir)['pages']}
+
+    mock.reset_stats()
+    v2_sync(offline=True).sync_pages(full=True)
+    assert mock.stats()["requests"] == 0
+    assert {page['id'] for page in load_index(cache_dir)['pages']} == expected
@@ -0,0 +1,83 @@
+"""link_graph: PageRank 계산, 증분 갱신, 빠진 outlinks 재추출"""
+
+import shutil
+
+import numpy as np
+import pytest
+
+import link_graph
+from link_graph import LinkGraph, extract_page_links, load_centrality, pagerank
+from conftest import load_index
+
+
+def page(page_id, title):
+    return {"id": page_id, "title": title}
+
+
+def test_pagerank_sums_to_one_and_ranks_hub_first():
+    # 1, 2, 3 → 0 (허브), 0 → 1
+    indptr = np.array([0, 1, 2, 3, 4], dtype=np.int32)
+    indices = np.array([1, 0, 0, 0], dtype=np.int32)
+    rank, iterations = pagerank(indptr, indices, 4)
+
+    assert rank.sum() == pytest.approx(1.0)
+    assert int(np.argmax(rank)) == 0
+    assert rank[1] > rank[2] == pytest.approx(rank[3])
+    assert 0 < iterations < link_graph.MAX_ITERATIONS
+
+
+def test_pagerank_warm_start_converges_faster():
+    indptr = np.array([0, 1, 2, 3, 4], dtype=np.int32)
+    indices = np.array([1, 0, 0, 0], dtype=np.int32)
+    rank, cold = pagerank(indptr, indices, 4)
+    warm_rank, warm = pagerank(indptr, indices, 4, initial=rank)
+
+    np.testing.assert_allclose(warm_rank, rank, atol=1e-6)
+    assert warm < cold
+
+
+def test_extract_page_links_keeps_same_space_only():
+    html = ('<ac:link><ri:page ri:content-title="Hub" ri:space-key="AEGIS" /></ac:link>'
+            '<ac:link><ri:page ri:content-title="Other" ri:space-key="ELSE" /></ac:link>'
+            '<ac:link><ri:page ri:content-title="Local" /></ac:link>'
+            '<a href="https://x.atlassian.net/wiki/spaces/AEGIS/pages/42/Title">x</a>'
+            '<ac:link><ri:page ri:content-title="Hub" ri:space-key="AEGIS" /></ac:link>')
+    assert extract_page_links(html, "AEGIS") == ["title:Hub", "title:Local", "id:42"]
+
+
+def test_update_replaces_changed_links_only(cache_dir):
+    pages = [page("1", "Hub"), page("2", "A"), page("3", "B")]
+    graph = LinkGraph(cache_dir)
+    stats = graph.update(pages, {"1": [], "2": ["title:Hub"], "3": ["title:Hub"]})
+    assert stats["edges"] == 2
+    centrality = load_centrality(cache_dir)
+    assert max(centrality, key=centrality.get) == "1"
+
+    assert LinkGraph(cache_dir).update(pages)["iterations"] == 0
+
+    stats = LinkGraph(cache_dir).update(pages, {"1": ["title:B"], "2": ["id:3"]})
+    assert stats["edges"] == 3
+    centrality = load_centrality(cache_dir)
+    assert centrality["3"] > centrality["2"]
+
+
+def test_missing_outlinks_are_recovered_after_sync(v1_sync, cache_dir):
+    v1_sync().sync_all_pages()
+    index = load_index(cache_dir)
+    expected = load_centrality(cache_dir)
+    assert expected
+
+    # 링크 그래프 도입 전 캐시: links/ 없음 → raw/ 원본에서 재추출
+    shutil.rmtree(cache_dir / link_graph.INDEX_DIRNAME)
+    stats = LinkGraph(cache_dir).update(index['pages'], space_key=index['space_key'])
+    assert stats["recovered"] == len(index['pages'])
+    recovered = load_centrality(cache_dir)
+    assert recovered.keys() == expected.keys()
+    assert max(abs(recovered[k] - expected[k]) for k in expected) < 1e-4
+
+    # 원본도 없으면 마크다운의 [[제목]] 링크에서 재추출
+    shutil.rmtree(cache_dir / link_graph.INDEX_DIRNAME)
+    shutil.rmtree(cache_dir / "raw")
+    LinkGraph(cache_dir).update(index['pages'], space_key=index['space_key'])
+    from_markdown = load_centrality(cache_dir)
+    assert max(abs(from_markdown[k] - expected[k]) for k in expected) < 1e-4
@@ -0,0 +1,85 @@
+"""semantic_index: 전체 학습 후 바뀐 페이지의 행만 다시 계산하는 증분 갱신"""
+
+import numpy as np
+import pytest
+
+import semantic_index
+from semantic_index import SemanticIndex
+
+TOPICS = ["battle", "quest", "guild", "dungeon", "crafting", "market", "pvp", "raid", "pet", "housing"]
+
+
+def make_corpus(count: int = 20):
+    pages, texts = [], {}
+    for i in range(count):
+        page_id = str(1000 + i)
+        topic = TOPICS[i % len(TOPICS)]
+        pages.append({"id": page_id, "title": f"{topic} design {i}"})
+        texts[page_id] = f"{topic} design {i}\n{topic} system balance notes {topic} page{i} filler text"
+    return pages, texts
+
+
+@pytest.fixture
+def corpus():
+    return make_corpus()
+
+
+@pytest.mark.parametrize("lsa_components", [0, 4])
+def test_incremental_update_refreshes_only_changed_rows(cache_dir, corpus, lsa_components):
+    pages, texts = corpus
+    index = SemanticIndex(cache_dir, lsa_components=lsa_components)
+    assert index.update(pages, texts)["mode"] == "full"
+    assert index.meta["lsa_applied"] == bool(lsa_components)
+    before = np.array(index._open_matrix())
+
+    changed_id = pages[0]["id"]
+    texts = {changed_id: "raid design 0\nraid raid boss schedule"}
+    stats = index.update(pages, texts)
+
+    assert stats == {"mode": "incremental", "documents": len(pages), "updated": 1, "removed": 0}
+    after = np.array(index._open_matrix())
+    assert after.shape == before.shape
+    assert not np.allclose(after[0], before[0])
+    np.testing.assert_array_equal(after[1:], before[1:])
+
+
+def test_search_sees_refreshed_row_without_reopening(cache_dir, corpus):
+    pages, texts = corpus
+    index = SemanticIndex(cache_dir, lsa_components=0)
+    index.update(pages, texts)
+    assert pages[0]["id"] not in [page_id for page_id, _ in index.search("raid", k=5)]
+
+    index.update(pages, {pages[0]["id"]: "raid raid raid raid"})
+    assert index.search("raid", k=1)[0][0] == pages[0]["id"]
+
+    reopened = SemanticIndex(cache_dir, lsa_components=0)
+    assert reopened.search("raid", k=1)[0][0] == pages[0]["id"]
+
+
+def test_unchanged_texts_are_not_touched(cache_dir, corpus):
+    pages, texts = corpus
+    index = SemanticIndex(cache_dir, lsa_components=0)
+    index.update(pages, texts)
+    assert index.update(pages, texts) == {"mode": "incremental", "documents": len(pages), "updated": 0, "removed": 0}
+
+
+def test_removed_pages_drop_their_rows(cache_dir, corpus):
+    pages, texts = corpus
+    index = SemanticIndex(cache_dir, lsa_components=0)
+    index.update(pages, texts)
+
+    stats = index.update(pages[1:])
+    assert stats["mode"] == "incremental"
+    assert stats["removed"] == 1
+    assert index.meta["ids"] == [page["id"] for page in pages[1:]]
+    assert index._open_matrix().shape[0] == len(pages) - 1
+
+
+def test_large_change_triggers_refit(cache_dir, corpus):
+    pages, texts = corpus
+    index = SemanticIndex(cache_dir, lsa_components=0)
+    index.update(pages, texts)
+
+    touched = int(semantic_index.REFIT_RATIO * len(pages)) + 1
+    changed = {page["id"]: f"rewritten {page['id']} crafting market" for page in pages[:touched]}
+    assert index.update(pages, changed)["mode"] == "full"
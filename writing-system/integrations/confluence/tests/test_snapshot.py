@@ -0,0 +1,106 @@
+"""snapshot: 내보내기/가져오기 왕복, 체크섬 검증, --force 설치"""
+
+import json
+import shutil
+import tarfile
+
+import pytest
+
+import page_history
+import raw_store
+import snapshot
+from snapshot import MANIFEST_NAME, SnapshotError, export_snapshot, import_snapshot
+from conftest import load_index
+
+
+@pytest.fixture
+def synced_cache(v1_sync, cache_dir):
+    v1_sync().sync_all_pages()
+    return cache_dir
+
+
+def page_contents(cache_dir):
+    index = load_index(cache_dir)
+    return {page['id']: (cache_dir / page['filename']).read_bytes() for page in index['pages']}
+
+
+def test_round_trip_restores_pages_and_indexes(synced_cache, tmp_path):
+    archive = tmp_path / "cache.tar.gz"
+    result = export_snapshot(synced_cache, str(archive))
+    assert (tmp_path / "cache.tar.gz.sha256").read_text().split()[0] == result["sha256"]
+
+    target = tmp_path / "restored"
+    imported = import_snapshot(target, str(archive))
+    assert imported["verified_archive"]
+    assert imported["files"] == result["files"]
+    assert page_contents(target) == page_contents(synced_cache)
+    assert load_index(target)['generation'] > load_index(synced_cache).get('generation', 0)
+    assert not (target / raw_store.RAW_DIRNAME).exists()
+    assert not list(tmp_path.glob(".restored.import-*"))
+
+
+def test_archive_checksum_mismatch_leaves_target_untouched(synced_cache, tmp_path):
+    archive = tmp_path / "cache.tar.gz"
+    export_snapshot(synced_cache, str(archive))
+    (tmp_path / "cache.tar.gz.sha256").write_text("0" * 64 + "  cache.tar.gz\n")
+
+    target = tmp_path / "restored"
+    with pytest.raises(SnapshotError):
+        import_snapshot(target, str(archive))
+    assert not target.exists() or not any(target.iterdir())
+
+
+def test_member_checksum_mismatch_is_rejected(synced_cache, tmp_path, monkeypatch):
+    original = snapshot._file_sha256
+    monkeypatch.setattr(snapshot, '_file_sha256',
+                        lambda path: "0" * 64 if path.name == "page_index.json" else original(path))
+    archive = tmp_path / "cache.tar.gz"
+    export_snapshot(synced_cache, str(archive))
+    (tmp_path / "cache.tar.gz.sha256").unlink()
+
+    with pytest.raises(SnapshotError, match="page_index.json"):
+        import_snapshot(tmp_path / "restored", str(archive))
+
+
+def test_import_refuses_existing_cache_without_force(synced_cache, tmp_path):
+    archive = tmp_path / "cache.tar.gz"
+    export_snapshot(synced_cache, str(archive))
+    before = page_contents(synced_cache)
+
+    with pytest.raises(SnapshotError):
+        import_snapshot(synced_cache, str(archive))
+    assert page_contents(synced_cache) == before
+
+
+def test_force_import_drops_data_missing_from_snapshot(synced_cache, tmp_path):
+    source = tmp_path / "source"
+    shutil.copytree(synced_cache, source)
+    index = load_index(source)
+    dropped = index['pages'].pop()
+    (source / dropped['filename']).unlink()
+    with open(source / "page_index.json", 'w', encoding='utf-8') as f:
+        json.dump(index, f, ensure_ascii=False)
+
+    archive = tmp_path / "cache.tar.gz"
+    export_snapshot(source, str(archive))
+    assert (synced_cache / raw_store.RAW_DIRNAME).is_dir()
+    history = synced_cache / page_history.HISTORY_DIRNAME
+    history.mkdir(exist_ok=True)
+    (history / "stale.json").write_text("{}")
+
+    import_snapshot(synced_cache, str(archive), force=True)
+    assert not (synced_cache / raw_store.RAW_DIRNAME).exists()
+    assert not history.exists()
+    assert not (synced_cache / dropped['filename']).exists()
+    assert {page['id'] for page in load_index(synced_cache)['pages']} == {page['id'] for page in index['pages']}
+
+
+def test_non_snapshot_archive_is_rejected(tmp_path):
+    archive = tmp_path / "other.tar.gz"
+    payload = tmp_path / "README.md"
+    payload.write_text("hello")
+    with tarfile.open(archive, "w:gz") as tar:
+        tar.add(payload, arcname="README.md")
+
+    with pytest.raises(SnapshotError, match=MANIFEST_NAME):
+        import_snapshot(tmp_path / "restored", str(archive))
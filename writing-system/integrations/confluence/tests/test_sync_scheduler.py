@@ -0,0 +1,82 @@
+"""sync_scheduler: 우선순위 정렬, 시간 예산, 예산 초과 시 미룬 페이지 처리"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import sync_scheduler
+from sync_scheduler import SyncScheduler, parse_budget
+from conftest import load_index
+
+SETTINGS = {"pinned_pages": [], "recent_half_life_days": 14, "query_log_days": 30, "label_refresh_minutes": 60}
+
+
+def days_ago(days: float) -> str:
+    return (datetime.now(timezone.utc) - timedelta(days=days)).isoformat()
+
+
+@pytest.mark.parametrize("value, seconds", [("60s", 60), ("5m", 300), ("1h", 3600), ("90", 90), ("250ms", 0.25)])
+def test_parse_budget(value, seconds):
+    assert parse_budget(value) == pytest.approx(seconds)
+
+
+def test_parse_budget_rejects_garbage():
+    assert parse_budget(None) is None
+    with pytest.raises(ValueError):
+        parse_budget("soon")
+
+
+def test_pinned_pages_come_first_then_recent(cache_dir):
+    pages = [
+        {"id": "1", "title": "Old", "when": days_ago(300)},
+        {"id": "2", "title": "Recent", "when": days_ago(1)},
+        {"id": "3", "title": "Pinned", "when": days_ago(200)},
+        {"id": "4", "title": "Undated", "when": None},
+    ]
+    scheduler = SyncScheduler(cache_dir, settings=dict(SETTINGS, pinned_pages=["Pinned"]))
+    ordered = scheduler.order(pages, lambda page: page['when'])
+    assert [page['id'] for page in ordered] == ["3", "2", "1", "4"]
+
+
+def test_budget_clock_starts_after_listing(cache_dir, monkeypatch):
+    clock = iter([100.0, 100.5, 101.5])
+    monkeypatch.setattr(sync_scheduler.time, 'monotonic', lambda: next(clock))
+    scheduler = SyncScheduler(cache_dir, budget_seconds=1.0, settings=SETTINGS)
+
+    assert scheduler.elapsed == 0.0
+    assert not scheduler.expired()
+    scheduler.start()
+    assert not scheduler.expired()
+    assert scheduler.expired()
+
+
+def test_interrupt_expires_without_budget(cache_dir):
+    scheduler = SyncScheduler(cache_dir, settings=SETTINGS)
+    scheduler.start()
+    assert not scheduler.expired()
+    scheduler.interrupt()
+    assert scheduler.expired()
+    assert scheduler.stats(deferred=3)["interrupted"]
+
+
+@pytest.mark.parametrize("mode", ["v1", "v2"])
+def test_budget_defers_new_pages_until_next_sync(mode, mock, v1_sync, v2_sync, cache_dir):
+    def run(budget=None):
+        if mode == "v1":
+            v1_sync().sync_all_pages(budget_seconds=budget)
+        else:
+            v2_sync().sync_pages(budget_seconds=budget)
+
+    run(budget=1e-6)
+    index = load_index(cache_dir)
+    deferred = [page for page in index['pages'] if page.get('deferred')]
+    assert {page['id'] for page in index['pages']} == {page['id'] for page in mock.pages}
+    assert deferred
+    for page in deferred:
+        assert page['version'] is None
+        assert not (cache_dir / page['filename']).exists()
+
+    run()
+    index = load_index(cache_dir)
+    assert not [page for page in index['pages'] if page.get('deferred')]
+    assert all((cache_dir / page['filename']).is_file() for page in index['pages'])
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+제목 자동완성 인덱스 (한글 자모 분해 + 정렬 배열 이진 탐색)
+입력 중인 글자(조합 중인 음절)까지 맞추기 위해 제목과 입력을 모두 자모 단위로 풀어 접두어를 비교합니다.
+    "전ㅌ" → ㅈㅓㄴㅌ  ⊂  "전투 설계" → ㅈㅓㄴㅌㅜㅅㅓㄹㄱㅖ
+    "과" 입력 중의 "고" → ㄱㅗ ⊂ ㄱㅗㅏ (겹모음/겹받침도 나눠서 비교)
+단어 시작 위치마다 키를 만들어 "릴리" 같은 제목 중간 단어로도 찾고,
+자음만 입력하면 초성 키("ㄹㄹㅈ" → 릴리즈 노트)로 찾습니다. 공백/기호는 무시합니다.
+
+구조:
+    키 배열 = 정렬된 (자모 키) 목록, 같은 순서의 (제목 번호, 단어 위치) 배열
+    조회    = bisect로 접두어 범위를 찾고 범위 안의 제목만 순위 매김 (제목 시작 일치 > 짧은 제목)
+
+캐시 구조:
+    cache/titles/titles.json
+
+사용법:
+    python title_index.py 전ㅌ
+    python title_index.py ㄹㄹㅈ --limit 5
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import argparse
+import unicodedata
+from bisect import bisect_left
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, List, Dict
+
+# Windows 콘솔 UTF-8 출력 설정
+if sys.platform == 'win32':
+    import io
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
+
+CACHE_DIR = Path(__file__).parent / "cache"
+INDEX_DIRNAME = "titles"
+TITLES_FILE = "titles.json"
+
+# 한글 음절 = 0xAC00 + (초성 x 21 + 중성) x 28 + 종성
+_SYLLABLE_BASE, _SYLLABLE_LAST = 0xAC00, 0xD7A3
+_CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+_JUNGSEONG = ["ㅏ", "ㅐ", "ㅑ", "ㅒ", "ㅓ", "ㅔ", "ㅕ", "ㅖ", "ㅗ", "ㅗㅏ", "ㅗㅐ", "ㅗㅣ", "ㅛ", "ㅜ",
+              "ㅜㅓ", "ㅜㅔ", "ㅜㅣ", "ㅠ", "ㅡ", "ㅡㅣ", "ㅣ"]
+_JONGSEONG = ["", "ㄱ", "ㄲ", "ㄱㅅ", "ㄴ", "ㄴㅈ", "ㄴㅎ", "ㄷ", "ㄹ", "ㄹㄱ", "ㄹㅁ", "ㄹㅂ", "ㄹㅅ", "ㄹㅌ",
+              "ㄹㅍ", "ㄹㅎ", "ㅁ", "ㅂ", "ㅂㅅ", "ㅅ", "ㅆ", "ㅇ", "ㅈ", "ㅊ", "ㅋ", "ㅌ", "ㅍ", "ㅎ"]
+# 입력으로 들어온 겹자모(호환 자모)도 같은 방식으로 분해
+_COMPOUND_JAMO = {
+    "ㄳ": "ㄱㅅ", "ㄵ": "ㄴㅈ", "ㄶ": "ㄴㅎ", "ㄺ": "ㄹㄱ", "ㄻ": "ㄹㅁ", "ㄼ": "ㄹㅂ", "ㄽ": "ㄹㅅ", "ㄾ": "ㄹㅌ",
+    "ㄿ": "ㄹㅍ", "ㅀ": "ㄹㅎ", "ㅄ": "ㅂㅅ", "ㅘ": "ㅗㅏ", "ㅙ": "ㅗㅐ", "ㅚ": "ㅗㅣ", "ㅝ": "ㅜㅓ", "ㅞ": "ㅜㅔ",
+    "ㅟ": "ㅜㅣ", "ㅢ": "ㅡㅣ",
+}
+_WORD_START = re.compile(r'(?:^|(?<=[\s\-_/|()\[\]#.,:·]))\w', re.UNICODE)
+
+
+def decompose(text: str) -> str:
+    """소문자 + 한글 자모 분해 (공백/기호 제거)"""
+    result = []
+    for char in unicodedata.normalize('NFC', text).lower():
+        code = ord(char)
+        if _SYLLABLE_BASE <= code <= _SYLLABLE_LAST:
+            offset = code - _SYLLABLE_BASE
+            result.append(_CHOSEONG[offset // 588])
+            result.append(_JUNGSEONG[(offset % 588) // 28])
+            result.append(_JONGSEONG[offset % 28])
+        elif char in _COMPOUND_JAMO:
+            result.append(_COMPOUND_JAMO[char])
+        elif char.isalnum():
+            result.append(char)
+    return "".join(result)
+
+
+def initials(text: str) -> str:
+    """초성 키 (한글은 초성, 그 밖의 글자는 그대로, 공백/기호 제거)"""
+    result = []
+    for char in unicodedata.normalize('NFC', text).lower():
+        code = ord(char)
+        if _SYLLABLE_BASE <= code <= _SYLLABLE_LAST:
+            result.append(_CHOSEONG[(code - _SYLLABLE_BASE) // 588])
+        elif char.isalnum():
+            result.append(char)
+    return "".join(result)
+
+
+def _is_initials_query(text: str) -> bool:
+    letters = [char for char in text if not char.isspace()]
+    return bool(letters) and all(char in _CHOSEONG for char in letters)
+
+
+def _word_starts(title: str) -> List[int]:
+    return [match.start() for match in _WORD_START.finditer(title)] or [0]
+
+
+class TitleIndex:
+    """제목 자동완성 인덱스 (cache/titles/)"""
+
+    def __init__(self, cache_dir: Path):
+        self.cache_dir = Path(cache_dir)
+        self.index_dir = self.cache_dir / INDEX_DIRNAME
+        self._data = None
+
+    def build(self, pages: List[Dict]) -> dict:
+        """카탈로그 제목으로 다시 생성"""
+        keys, initial_keys = [], []
+        for number, page in enumerate(pages):
+            title = page['title']
+            for word, start in enumerate(_word_starts(title)):
+                suffix = title[start:]
+                keys.append((decompose(suffix), number, word))
+                initial_keys.append((initials(suffix), number, word))
+        keys.sort()
+        initial_keys.sort()
+
+        data = {
+            "built_at": datetime.now().isoformat(),
+            "pages": [[page['id'], page['title'], page.get('url', '')] for page in pages],
+            "keys": [key for key, _, _ in keys],
+            "refs": [[number, word] for _, number, word in keys],
+            "initial_keys": [key for key, _, _ in initial_keys],
+            "initial_refs": [[number, word] for _, number, word in initial_keys],
+        }
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        path = self.index_dir / TITLES_FILE
+        tmp_path = path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp_path, path)
+        self._data = data
+        return {"titles": len(pages), "keys": len(keys)}
+
+    @property
+    def data(self) -> Optional[dict]:
+        if self._data is None:
+            path = self.index_dir / TITLES_FILE
+            if not path.exists():
+                return None
+            with open(path, 'r', encoding='utf-8') as f:
+                self._data = json.load(f)
+        return self._data
+
+    def complete(self, text: str, limit: int = 10) -> List[Dict]:
+        """
+        입력 중인 문자열로 제목 후보 조회
+        반환: [{"id", "title", "url"}] - 제목 시작 일치 우선, 다음은 짧은 제목 순
+        """
+        data = self.data
+        if not data or not text.strip():
+            return []
+        if _is_initials_query(text):
+            keys, refs, prefix = data['initial_keys'], data['initial_refs'], initials(text)
+        else:
+            keys, refs, prefix = data['keys'], data['refs'], decompose(text)
+        if not prefix:
+            return []
+
+        best = {}
+        position = bisect_left(keys, prefix)
+        while position < len(keys) and keys[position].startswith(prefix):
+            number, word = refs[position]
+            if word < best.get(number, word + 1):
+                best[number] = word
+            position += 1
+
+        pages = data['pages']
+        ranked = sorted(best, key=lambda number: (best[number] > 0, len(pages[number][1]), pages[number][1]))
+        return [{"id": pages[number][0], "title": pages[number][1], "url": pages[number][2]}
+                for number in ranked[:limit]]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='캐시된 문서 제목 자동완성')
+    parser.add_argument('text', type=str, help='입력 중인 제목 (조합 중인 글자, 초성 가능)')
+    parser.add_argument('--limit', type=int, default=10, help='최대 결과 수 (기본: 10)')
+    parser.add_argument('--cache-dir', type=str, default=str(CACHE_DIR), help='캐시 폴더 (기본: ./cache)')
+
+    args = parser.parse_args()
+    index = TitleIndex(Path(args.cache_dir))
+    if not index.data:
+        print("❌ 제목 인덱스가 없습니다. --sync를 먼저 실행하세요.")
+        return
+
+    start = time.perf_counter()
+    results = index.complete(args.text, args.limit)
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"\n🔤 '{args.text}' 제목 후보 {len(results)}개 ({elapsed:.2f} ms)\n")
+    for result in results:
+        print(f"  - {result['title']}")
+        if result['url']:
+            print(f"    {result['url']}")
+
+
+if __name__ == "__main__":
+    main()
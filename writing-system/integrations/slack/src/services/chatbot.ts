@@ -2,6 +2,7 @@ import Anthropic from '@anthropic-ai/sdk';
 import { GoogleGenerativeAI } from '@google/generative-ai';
 import * as fs from 'fs';
 import * as path from 'path';
+import * as zlib from 'zlib';
 
 const isDebug = process.env.NODE_ENV !== 'production';
 function debugLog(...args: unknown[]) {
@@ -40,18 +41,42 @@ interface PageIndex {
   space_key: string;
   synced_at: string;
   total_pages: number;
+  // Incremented by every sync that changes pages (confluence/cache_indexes.py)
+  generation?: number;
   pages: {
     id: string;
     title: string;
     filename: string;
     url?: string;
+    // Jira issues mirrored by confluence/jira_sync.py
+    source?: 'jira';
+    status?: string;
+    issue_type?: string;
+    priority?: string;
+    assignee?: string | null;
+    created_date?: string;
+    updated_date?: string;
   }[];
 }
 
 // Configuration
 const CACHE_DIR = path.join(__dirname, '..', '..', '..', 'confluence', 'cache');
 const INDEX_FILE = path.join(CACHE_DIR, 'page_index.json');
+// Shared zlib dictionary for compressed pages (*.md.z), see confluence/page_store.py
+const PAGE_STORE_DIR = path.join(CACHE_DIR, 'page_store');
 const CONFIG_FILE = path.join(__dirname, '..', '..', '..', 'confluence', 'confluence_config.json');
+// Search log read by confluence/sync_scheduler.py to sync frequently referenced pages first
+const QUERY_LOG_FILE = path.join(CACHE_DIR, 'query_log.jsonl');
+
+// page_store/meta.json points at the current dictionary file (dict-<sha1>.bin; dict.bin in older caches)
+function loadPageDictionary(): Buffer | null {
+  const metaFile = path.join(PAGE_STORE_DIR, 'meta.json');
+  if (!fs.existsSync(metaFile)) return null;
+  const meta = JSON.parse(fs.readFileSync(metaFile, 'utf-8'));
+  const file = meta.dictionaries?.zlib?.file ?? (meta.dictionary_codec === 'zlib' ? 'dict.bin' : null);
+  const dictPath = file ? path.join(PAGE_STORE_DIR, file) : null;
+  return dictPath && fs.existsSync(dictPath) ? fs.readFileSync(dictPath) : null;
+}
 
 const DEFAULT_CONFLUENCE_BASE_URL = 'https://krafton.atlassian.net';
 const DEFAULT_SPACE_KEY = 'AEGIS';
@@ -80,6 +105,18 @@ function generatePageUrl(pageId: string, baseUrl: string, spaceKey: string): str
   return `${baseUrl}/wiki/spaces/${spaceKey}/pages/${pageId}`;
 }
 
+// Read a cached page (plain .md or zlib-compressed .md.z with the shared dictionary)
+function readCachedPage(filePath: string, dictionary: Buffer | null): string | null {
+  if (filePath.endsWith('.md.z')) {
+    if (!dictionary) return null;
+    return zlib.inflateSync(fs.readFileSync(filePath), { dictionary }).toString('utf-8');
+  }
+  if (filePath.endsWith('.md')) {
+    return fs.readFileSync(filePath, 'utf-8');
+  }
+  return null;
+}
+
 // Load cached documents
 function loadDocuments(): { index: PageIndex | null; contents: Map<string, string> } {
   const contents = new Map<string, string>();
@@ -91,13 +128,22 @@ function loadDocuments(): { index: PageIndex | null; contents: Map<string, strin
       index = JSON.parse(indexData);
 
       if (index && index.pages) {
+        const dictionary = loadPageDictionary();
+        let unsupported = 0;
         for (const page of index.pages) {
           const filePath = path.join(CACHE_DIR, page.filename);
           if (fs.existsSync(filePath)) {
-            const content = fs.readFileSync(filePath, 'utf-8');
+            const content = readCachedPage(filePath, dictionary);
+            if (content === null) {
+              unsupported++;
+              continue;
+            }
             contents.set(page.id, content);
           }
         }
+        if (unsupported > 0) {
+          console.error(`Skipped ${unsupported} cached pages with unsupported compression (use none or zlib)`);
+        }
       }
     }
   } catch (error) {
@@ -107,6 +153,59 @@ function loadDocuments(): { index: PageIndex | null; contents: Map<string, strin
   return { index, contents };
 }
 
+type RelevantPage = { id: string; title: string; url: string; snippet: string; score: number };
+
+// LRU cache for page search results, keyed by index generation + normalized query.
+// A sync that changes pages bumps the generation, so stale entries are never hit again and age out.
+const SEARCH_CACHE_SIZE = 256;
+const searchCache = new Map<string, RelevantPage[]>();
+const searchCacheStats = { hits: 0, misses: 0, evictions: 0 };
+
+function normalizeQuery(query: string): string {
+  return query.normalize('NFC').toLowerCase().split(/\s+/).filter(Boolean).join(' ');
+}
+
+export function getSearchCacheStats(): { entries: number; hits: number; misses: number; evictions: number } {
+  return { entries: searchCache.size, ...searchCacheStats };
+}
+
+function cachedSearchRelevantPages(
+  query: string,
+  index: PageIndex | null,
+  contents: Map<string, string>
+): RelevantPage[] {
+  if (!index) return [];
+
+  const key = `${index.generation ?? index.synced_at}\u0000${normalizeQuery(query)}`;
+  const cached = searchCache.get(key);
+  if (cached) {
+    // Map keeps insertion order: re-insert to mark as most recently used
+    searchCache.delete(key);
+    searchCache.set(key, cached);
+    searchCacheStats.hits++;
+    return cached;
+  }
+
+  searchCacheStats.misses++;
+  const results = searchRelevantPages(query, index, contents);
+  searchCache.set(key, results);
+  if (searchCache.size > SEARCH_CACHE_SIZE) {
+    searchCache.delete(searchCache.keys().next().value as string);
+    searchCacheStats.evictions++;
+  }
+  return results;
+}
+
+function logQuery(query: string, pageIds: string[]): void {
+  if (pageIds.length === 0) return;
+  try {
+    const line = JSON.stringify({ at: new Date().toISOString().slice(0, 19), query, ids: pageIds, source: 'slack' });
+    fs.appendFileSync(QUERY_LOG_FILE, line + '\n', 'utf-8');
+  } catch (error) {
+    debugLog('Failed to write query log:', error);
+  }
+}
+
 // Search relevant pages
 function searchRelevantPages(
   query: string,
@@ -123,6 +222,9 @@ function searchRelevantPages(
   const results: { id: string; title: string; url: string; snippet: string; score: number }[] = [];
 
   for (const page of index.pages) {
+    // Mirrored Jira issues are answered through the Jira context instead
+    if (page.source === 'jira') continue;
+
     const content = contents.get(page.id) || '';
     const contentLower = content.toLowerCase();
     const titleLower = page.title.toLowerCase();
@@ -320,6 +422,79 @@ async function findJiraUserByName(
   }
 }
 
+// Search Jira issues mirrored into the local cache by confluence/jira_sync.py (no API calls).
+// Returns null when no issues have been mirrored yet, or the queried issue key is not in the mirror,
+// so the caller can fall back to the live API.
+function searchLocalJiraIssues(
+  query: string,
+  index: PageIndex | null,
+  contents: Map<string, string>,
+  maxResults: number = 15
+): JiraIssue[] | null {
+  const mirrored = index ? index.pages.filter(page => page.source === 'jira') : [];
+  if (mirrored.length === 0) {
+    return null;
+  }
+
+  let issues = mirrored;
+  const issueKeyMatch = query.match(/([A-Z]{2,10}-\d{1,6})/);
+
+  if (issueKeyMatch) {
+    issues = issues.filter(issue => issue.id === issueKeyMatch[1]);
+    if (issues.length === 0) {
+      // Key not mirrored (other project or created since the last sync): let the live API answer
+      debugLog('Local Jira mirror: no issue', issueKeyMatch[1]);
+      return null;
+    }
+  } else {
+    const assigneeName = extractAssigneeName(query);
+    if (assigneeName) {
+      issues = issues.filter(issue => (issue.assignee || '').includes(assigneeName));
+    }
+
+    const queryLower = query.toLowerCase();
+    if (queryLower.includes('진행중') || queryLower.includes('진행 중')) {
+      issues = issues.filter(issue => issue.status === 'In Progress');
+    } else if (queryLower.includes('완료')) {
+      issues = issues.filter(issue => issue.status === 'Done');
+    } else if (queryLower.includes('대기') || queryLower.includes('할일') || queryLower.includes('할 일')) {
+      issues = issues.filter(issue => issue.status === 'To Do');
+    }
+
+    if (queryLower.includes('버그') || queryLower.includes('bug')) {
+      issues = issues.filter(issue => issue.issue_type === 'Bug');
+    } else if (queryLower.includes('태스크') || queryLower.includes('task') || queryLower.includes('작업')) {
+      issues = issues.filter(issue => issue.issue_type === 'Task');
+    } else if (queryLower.includes('스토리') || queryLower.includes('story')) {
+      issues = issues.filter(issue => issue.issue_type === 'Story');
+    }
+  }
+
+  debugLog('Local Jira mirror:', issues.length, 'of', mirrored.length, 'issues matched');
+
+  return issues
+    .sort((a, b) => (b.updated_date || '').localeCompare(a.updated_date || ''))
+    .slice(0, maxResults)
+    .map(issue => {
+      const content = contents.get(issue.id) || '';
+      const separator = content.indexOf('\n---\n');
+      const key = issue.id;
+      return {
+        id: key,
+        key,
+        summary: issue.title.startsWith(`${key}: `) ? issue.title.substring(key.length + 2) : issue.title,
+        status: issue.status || 'Unknown',
+        type: issue.issue_type || 'Unknown',
+        priority: issue.priority || 'None',
+        assignee: issue.assignee || null,
+        description: separator === -1 ? '' : content.substring(separator + 5).trim().substring(0, 500),
+        created: issue.created_date || '',
+        updated: issue.updated_date || '',
+        url: issue.url || '',
+      };
+    });
+}
+
 // Search Jira issues
 async function searchJiraIssues(query: string): Promise<JiraIssue[]> {
   const email = process.env.JIRA_EMAIL;
@@ -567,7 +742,9 @@ export async function processQuery(query: string): Promise<ChatResponse> {
   let relevantPages: { id: string; title: string; url: string; snippet: string; score: number }[] = [];
   
   if (!isJiraOnly) {
-    relevantPages = searchRelevantPages(query, index, contents);
+    relevantPages = cachedSearchRelevantPages(query, index, contents);
+    logQuery(query, relevantPages.map(p => p.id));
+    debugLog('Search cache:', getSearchCacheStats());
   }
 
   // Build context
@@ -577,7 +754,7 @@ export async function processQuery(query: string): Promise<ChatResponse> {
   let jiraIssues: JiraIssue[] = [];
   if (isJiraRelatedQuery(query)) {
     debugLog('Searching Jira...');
-    jiraIssues = await searchJiraIssues(query);
+    jiraIssues = searchLocalJiraIssues(query, index, contents) ?? await searchJiraIssues(query);
     debugLog('Found', jiraIssues.length, 'Jira issues');
   }
 
@@ -0,0 +1,35 @@
+import { NextRequest, NextResponse } from 'next/server';
+
+// integrations/confluence/query_server.py (로컬 캐시 조회 서비스)
+const QUERY_SERVICE_URL = process.env.CONFLUENCE_QUERY_URL || 'http://127.0.0.1:8765';
+
+export interface ConfluenceTitle {
+  id: string;
+  title: string;
+  url: string;
+}
+
+export async function GET(request: NextRequest) {
+  const query = request.nextUrl.searchParams.get('q')?.trim() || '';
+  const limit = request.nextUrl.searchParams.get('limit') || '8';
+
+  if (!query) {
+    return NextResponse.json({ results: [] });
+  }
+
+  try {
+    const params = new URLSearchParams({ q: query, limit });
+    const response = await fetch(`${QUERY_SERVICE_URL}/titles?${params}`, {
+      cache: 'no-store',
+      signal: AbortSignal.timeout(2000),
+    });
+    if (!response.ok) {
+      return NextResponse.json({ results: [], available: false });
+    }
+    const data: { results: ConfluenceTitle[] } = await response.json();
+    return NextResponse.json({ results: data.results, available: true });
+  } catch {
+    // 조회 서비스가 꺼져 있으면 URL 직접 입력만 사용
+    return NextResponse.json({ results: [], available: false });
+  }
+}
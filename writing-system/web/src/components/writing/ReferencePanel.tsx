@@ -1,6 +1,6 @@
 'use client';
 
-import { useState, useRef } from 'react';
+import { useState, useRef, useEffect } from 'react';
 import { Card, CardHeader, CardTitle, CardContent, CardDescription } from '@/components/ui/Card';
 import { Button } from '@/components/ui/Button';
 import { Input, Textarea } from '@/components/ui/Input';
@@ -44,6 +44,7 @@ export function ReferencePanel({
   const [activeTab, setActiveTab] = useState<'confluence' | 'file' | 'url' | 'text'>('confluence');
   const [confluenceUrl, setConfluenceUrl] = useState('');
   const [confluenceSearch, setConfluenceSearch] = useState('');
+  const [titleSuggestions, setTitleSuggestions] = useState<{ id: string; title: string; url: string }[]>([]);
   const [urlInput, setUrlInput] = useState('');
   const [textInput, setTextInput] = useState('');
   const [textName, setTextName] = useState('');
@@ -51,6 +52,45 @@ export function ReferencePanel({
   const [error, setError] = useState<string | null>(null);
   const fileInputRef = useRef<HTMLInputElement>(null);
 
+  // 문서 제목 자동완성 (로컬 캐시 조회 서비스, 입력이 멈추면 조회)
+  useEffect(() => {
+    const query = confluenceSearch.trim();
+    if (!query) {
+      setTitleSuggestions([]);
+      return;
+    }
+
+    const controller = new AbortController();
+    const timer = setTimeout(async () => {
+      try {
+        const response = await fetch(`/api/confluence/titles?q=${encodeURIComponent(query)}`, {
+          signal: controller.signal,
+        });
+        const data = await response.json();
+        setTitleSuggestions(data.results || []);
+      } catch {
+        // 입력이 바뀌어 취소된 요청은 무시
+      }
+    }, 120);
+
+    return () => {
+      clearTimeout(timer);
+      controller.abort();
+    };
+  }, [confluenceSearch]);
+
+  // 자동완성 목록에서 문서 추가
+  const handleSelectTitle = (page: { id: string; title: string; url: string }) => {
+    onAddReference({
+      type: 'confluence',
+      name: page.title,
+      content: `[Confluence 문서 링크]\nURL: ${page.url}\n\n이 문서의 내용을 참고하여 글을 작성해주세요.`,
+      url: page.url,
+    });
+    setConfluenceSearch('');
+    setTitleSuggestions([]);
+  };
+
   // Confluence URL에서 문서 추가
   const handleAddConfluenceUrl = async () => {
     if (!confluenceUrl.trim()) return;
@@ -302,6 +342,35 @@ export function ReferencePanel({
               {/* Confluence 탭 */}
               {activeTab === 'confluence' && (
                 <div className="space-y-3">
+                  <div>
+                    <label className="text-xs text-[var(--text-muted)] mb-1.5 block">
+                      문서 제목 검색
+                    </label>
+                    <div className="relative">
+                      <Search className="w-4 h-4 absolute left-3 top-1/2 -translate-y-1/2 text-[var(--text-muted)]" />
+                      <Input
+                        value={confluenceSearch}
+                        onChange={(e) => setConfluenceSearch(e.target.value)}
+                        placeholder="예: 전투 기획, ㄹㄹㅈ"
+                        className="pl-9"
+                      />
+                    </div>
+                    {titleSuggestions.length > 0 && (
+                      <div className="mt-1.5 border border-[var(--border-primary)] rounded-lg overflow-hidden">
+                        {titleSuggestions.map((page) => (
+                          <button
+                            key={page.id}
+                            onClick={() => handleSelectTitle(page)}
+                            disabled={disabled}
+                            className="w-full flex items-center gap-2 px-3 py-2 text-left text-sm text-[var(--text-secondary)] hover:bg-[var(--bg-hover)] transition-colors"
+                          >
+                            <BookOpen className="w-4 h-4 flex-shrink-0 text-[var(--accent-primary)]" />
+                            <span className="truncate">{page.title}</span>
+                          </button>
+                        ))}
+                      </div>
+                    )}
+                  </div>
                   <div>
                     <label className="text-xs text-[var(--text-muted)] mb-1.5 block">
                       Confluence 문서 URL
@@ -324,7 +393,7 @@ export function ReferencePanel({
                     </div>
                   </div>
                   <p className="text-xs text-[var(--text-muted)]">
-                    💡 Confluence 문서 URL을 입력하면 해당 문서를 참고하여 글을 작성합니다.
+                    💡 제목 일부(초성 가능)를 입력해 문서를 고르거나, Confluence 문서 URL을 입력하면 해당 문서를 참고하여 글을 작성합니다.
                   </p>
                 </div>
               )}